@@ -105,13 +105,50 @@ else:
     # Local development
     DB_PATH = BASE_DIR / 'db.sqlite3'
 
+# SQLite tuning for several gunicorn workers sharing one file:
+#   * WAL lets readers run alongside the (single) writer; synchronous=NORMAL
+#     is durable across app crashes in WAL mode and skips an fsync per commit.
+#   * Transactions BEGIN IMMEDIATE, so a writer queues for the lock up front
+#     (waiting up to SQLITE_BUSY_TIMEOUT seconds) instead of failing with
+#     "database is locked" when a read transaction tries to upgrade.
+#   * Bigger page cache (negative = KiB), memory-mapped reads, in-memory temp
+#     tables for sorts.
+# Connections are kept for CONN_MAX_AGE seconds rather than reopened (and the
+# pragmas re-run) on every request.
+SQLITE_BUSY_TIMEOUT = float(os.getenv('SQLITE_BUSY_TIMEOUT', 20))
+SQLITE_INIT_COMMAND = ';'.join([
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    f'PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT * 1000)}',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA mmap_size=134217728',
+    'PRAGMA temp_store=MEMORY',
+])
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': DB_PATH,
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': SQLITE_INIT_COMMAND,
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': SQLITE_BUSY_TIMEOUT,
+        },
     }
 }
 
+# Writes that still hit "database is locked" (a lock held past the busy
+# timeout) are retried this many times with exponential backoff; see
+# shop.services.db.
+SQLITE_LOCKED_RETRIES = int(os.getenv('SQLITE_LOCKED_RETRIES', 3))
+
+# Large admin changelists page by cursor and show a row count that is cached
+# for this many seconds rather than counted on every request; see
+# shop.admin.KeysetPaginationMixin.
+ADMIN_COUNT_CACHE_SECONDS = int(os.getenv('ADMIN_COUNT_CACHE_SECONDS', 300))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -242,8 +279,10 @@ SLACK_WEBHOOK_URL = os.getenv('SLACK_WEBHOOK_URL', '')
 # Two-way Slack (reactions update order/request status). When the bot token +
 # channel are set, notifications post via chat.postMessage (capturing the
 # message ts) instead of the outbound-only webhook.
-#   SLACK_BOT_TOKEN      — bot user OAuth token (xoxb-…), scopes: chat:write, reactions:read
+#   SLACK_BOT_TOKEN      — bot user OAuth token (xoxb-…), scopes: chat:write, reactions:read,
+#                          channels:history
 #   SLACK_SIGNING_SECRET — verifies inbound Events API requests at /slack/events/
+#                          (and button clicks at /slack/interactions/)
 #   SLACK_CHANNEL        — channel id/name the bot posts notifications to
 #   SLACK_ALLOWED_REACTORS — optional comma-separated Slack user IDs allowed to
 #                            drive status changes (empty = anyone in the channel)
@@ -256,6 +295,35 @@ SLACK_ALLOWED_REACTORS = [
 # Bot's own Slack user ID (from auth.test). Inbound reaction events authored by
 # the bot — its status cue — are ignored so admin-driven changes don't echo back.
 SLACK_BOT_USER_ID = os.getenv('SLACK_BOT_USER_ID', '')
+# Attach Block Kit status buttons to notifications (needs Interactivity enabled
+# in the Slack app, with its Request URL pointed at /slack/interactions/). A
+# click applies the status directly; reactions keep working alongside.
+SLACK_STATUS_BUTTONS = os.getenv('SLACK_STATUS_BUTTONS', 'False').lower() == 'true'
+# Outbound Web API client: one keep-alive connection pool per process, shared by
+# every Slack helper. Pool size caps concurrent sockets to slack.com per worker.
+SLACK_HTTP_POOL_SIZE = int(os.getenv('SLACK_HTTP_POOL_SIZE', 4))
+SLACK_HTTP_TIMEOUT = float(os.getenv('SLACK_HTTP_TIMEOUT', 5))
+# Outbound status sync runs a message's independent Slack calls (stamp, cue,
+# thread reply, other linked messages) on this many threads; 1 runs them inline.
+SLACK_SYNC_CONCURRENCY = int(os.getenv('SLACK_SYNC_CONCURRENCY', 4))
+# Longest we'll block a request waiting out Slack's per-method rate limits
+# (local token bucket or a 429's Retry-After) before handing a write to the
+# outbox relay instead.
+SLACK_RATE_LIMIT_MAX_WAIT = float(os.getenv('SLACK_RATE_LIMIT_MAX_WAIT', 3))
+# Circuit breakers around Slack and SMTP: after this many consecutive failures
+# (timeouts, connection errors, 5xx) calls fail fast, and a single probe is let
+# through every CIRCUIT_RESET_TIMEOUT seconds until the service recovers.
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))
+# How long (seconds) processed Slack events are kept to reject redeliveries of
+# the same event_id. Slack gives up retrying well within an hour.
+SLACK_EVENT_RETENTION = int(os.getenv('SLACK_EVENT_RETENTION', 60 * 60 * 24))
+# Reaction events update a local projection of each message's reactions; one
+# older than this (seconds) is re-read from Slack before resolving status.
+SLACK_REACTION_RECONCILE_SECONDS = int(os.getenv('SLACK_REACTION_RECONCILE_SECONDS', 60 * 60))
+# The event worker waits until a message's reactions have been quiet this long
+# (seconds) and resolves a burst (❌ then ✅, several emoji at once) as one change.
+SLACK_EVENT_DEBOUNCE_SECONDS = float(os.getenv('SLACK_EVENT_DEBOUNCE_SECONDS', 2))
 
 # =============================================================================
 # Google Maps (Places Autocomplete on address fields)
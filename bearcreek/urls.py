@@ -20,6 +20,7 @@ from django.contrib import admin
 from django.contrib.sitemaps.views import sitemap
 from django.urls import include, path
 
+from shop.admin import customer_search
 from shop.sitemaps import ProductSitemap, StaticViewSitemap
 
 SITEMAPS = {
@@ -28,6 +29,7 @@ SITEMAPS = {
 }
 
 urlpatterns = [
+    path('admin/search/', admin.site.admin_view(customer_search), name='customer_search'),
     path('admin/', admin.site.urls),
     path('', include('shop.urls')),
     path('sitemap.xml', sitemap, {'sitemaps': SITEMAPS}, name='sitemap'),
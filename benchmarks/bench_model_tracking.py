@@ -0,0 +1,89 @@
+"""Instantiation cost of status change tracking on ``Order``.
+
+Builds N orders (default 100k) the two ways Django does — ``from_db`` (what a
+queryset does per row) and ``Order(...)`` in code — under three setups:
+
+  * no tracking at all (baseline),
+  * the old ``post_init`` signal snapshotting ``status`` on every instance,
+  * ``TrackedFieldsMixin`` (``from_db`` only; code-built instances pay nothing).
+
+    python benchmarks/bench_model_tracking.py [--rows 100000]
+
+No database is touched; rows are fed to ``from_db`` as a queryset would.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+
+def _remember_status(sender, instance, **kwargs):
+    instance._original_status = instance.status
+
+
+def _time(fn, rows):
+    start = time.perf_counter()
+    fn(rows)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bearcreek.settings")
+    import django
+    django.setup()
+    from django.db import models
+    from django.db.models.signals import post_init
+
+    from shop.models import Order
+
+    field_names = [f.attname for f in Order._meta.concrete_fields]
+    now = datetime.now(timezone.utc)
+    sample = {
+        "id": 1, "first_name": "Jane", "last_name": "Doe", "email": "jane@example.com",
+        "phone": "(850) 555-1234", "address": "1 Honey Ln", "city": "Tallahassee", "state": "FL",
+        "zip_code": "32301", "product_id": 1, "quantity": 2, "status": "pending",
+        "created_at": now, "updated_at": now,
+    }
+    values = tuple(sample.get(name, Decimal("0") if "price" in name else None) for name in field_names)
+    untracked_from_db = models.Model.from_db.__func__
+
+    def load_untracked(rows):
+        for _ in range(rows):
+            untracked_from_db(Order, "default", field_names, values)
+
+    def load_tracked(rows):
+        for _ in range(rows):
+            Order.from_db("default", field_names, values)
+
+    def build(rows):
+        for _ in range(rows):
+            Order(first_name="Jane", status="pending")
+
+    results = [("from_db, no tracking", _time(load_untracked, args.rows))]
+    post_init.connect(_remember_status, sender=Order, dispatch_uid="bench_remember_status")
+    results += [
+        ("from_db, post_init signal", _time(load_untracked, args.rows)),
+        ("Order(...), post_init signal", _time(build, args.rows)),
+    ]
+    post_init.disconnect(sender=Order, dispatch_uid="bench_remember_status")
+    results += [
+        ("from_db, TrackedFieldsMixin", _time(load_tracked, args.rows)),
+        ("Order(...), TrackedFieldsMixin", _time(build, args.rows)),
+    ]
+
+    print(f"{args.rows:,} Order instances")
+    for label, seconds in results:
+        print(f"  {label:32s} {seconds:6.3f} s   {seconds / args.rows * 1e6:6.2f} µs/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Per-call latency: one-off ``requests.post`` vs the pooled ``SlackClient``.
+
+Starts a local fake Slack Web API (HTTP/1.1 keep-alive, replies ``{"ok": true}``)
+and times N ``chat.update``-shaped calls each way:
+
+    python benchmarks/bench_slack_client.py [--calls 500]
+
+The fake server is plain HTTP on loopback, so this only measures the TCP
+connect + connection setup the pool saves. Against slack.com each avoided
+connection is also a TLS handshake over the internet, so the real gap is far
+larger than what this prints.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class FakeSlack(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers + body without waiting on delayed ACKs (as a real server would).
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"ok": True, "ts": "1.1"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST
+
+    def log_message(self, *args):
+        pass
+
+
+def _time_calls(fn, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bearcreek.settings")
+    import django
+    django.setup()
+    import requests
+
+    from shop.services.slack_client import SlackClient
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSlack)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/api/"
+    payload = {"channel": "C123", "ts": "1.1", "text": "x"}
+
+    def one_off():
+        requests.post(f"{base_url}chat.update", headers={"Authorization": "Bearer xoxb-bench"},
+                      json=payload, timeout=5).json()
+
+    client = SlackClient(token="xoxb-bench", base_url=base_url)
+
+    def pooled():
+        client.call("chat.update", payload)
+
+    # Warm both paths (imports, first connection) before timing.
+    one_off()
+    pooled()
+    results = {
+        "requests.post (new connection per call)": _time_calls(one_off, args.calls),
+        "SlackClient (pooled keep-alive session)": _time_calls(pooled, args.calls),
+    }
+    server.shutdown()
+
+    print(f"{args.calls} calls against a local fake Slack API")
+    for label, samples in results.items():
+        samples.sort()
+        print(
+            f"  {label:42s} mean {statistics.mean(samples):6.3f} ms   "
+            f"p50 {samples[len(samples) // 2]:6.3f} ms   p95 {samples[int(len(samples) * 0.95)]:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
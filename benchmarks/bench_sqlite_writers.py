@@ -0,0 +1,129 @@
+"""Concurrent writers against one SQLite file: stock settings vs the tuned ones.
+
+Starts W worker processes (default 8, like gunicorn workers) that each run N
+form-submit-shaped transactions — read a product, insert an order, insert its
+outbox row — while the same number of reader processes page through orders.
+Runs once with SQLite/Django defaults (rollback journal, deferred BEGIN, 5 s
+timeout) and once with the ``SQLITE_INIT_COMMAND`` / IMMEDIATE / busy timeout
+from ``bearcreek.settings``:
+
+    python benchmarks/bench_sqlite_writers.py [--writers 8] [--writes 200]
+
+Reports throughput, commit latency, and how many transactions failed with
+"database is locked" (each of those is a 500 for a customer).
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE product (id INTEGER PRIMARY KEY, name TEXT, price TEXT);
+CREATE TABLE orders (id INTEGER PRIMARY KEY, product_id INTEGER, name TEXT, status TEXT);
+CREATE TABLE outbox (id INTEGER PRIMARY KEY, kind TEXT, payload TEXT);
+INSERT INTO product (name, price) VALUES ('Wildflower Honey', '17.00');
+"""
+
+
+def _connect(path, tuned):
+    """A connection set up like Django would: ``tuned`` is None for stock
+    settings, else ``(init_command, timeout)`` from the project settings."""
+    if tuned is None:
+        return sqlite3.connect(path, timeout=5, isolation_level=None), "BEGIN"
+    init_command, timeout = tuned
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    for pragma in init_command.split(";"):
+        conn.execute(pragma)
+    return conn, "BEGIN IMMEDIATE"
+
+
+def _writer(path, tuned, writes):
+    conn, begin = _connect(path, tuned)
+    latencies, locked = [], 0
+    for i in range(writes):
+        start = time.perf_counter()
+        try:
+            conn.execute(begin)
+            conn.execute("SELECT id, price FROM product WHERE id = 1").fetchone()
+            cur = conn.execute(
+                "INSERT INTO orders (product_id, name, status) VALUES (1, ?, 'pending')", (f"order {i}",),
+            )
+            conn.execute("INSERT INTO outbox (kind, payload) VALUES ('slack', ?)", (str(cur.lastrowid),))
+            conn.execute("COMMIT")
+            latencies.append(time.perf_counter() - start)
+        except sqlite3.OperationalError:
+            locked += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+    conn.close()
+    return latencies, locked
+
+
+def _reader(path, tuned, deadline):
+    conn, _begin = _connect(path, tuned)
+    reads = 0
+    while time.time() < deadline:
+        try:
+            conn.execute("SELECT * FROM orders ORDER BY id DESC LIMIT 25").fetchall()
+            reads += 1
+        except sqlite3.OperationalError:
+            pass
+    conn.close()
+    return reads
+
+
+def run(tuned, writers, writes):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.sqlite3")
+        setup = sqlite3.connect(path)
+        setup.executescript(SCHEMA)
+        setup.close()
+        with ProcessPoolExecutor(max_workers=writers * 2) as pool:
+            start = time.perf_counter()
+            write_jobs = [pool.submit(_writer, path, tuned, writes) for _ in range(writers)]
+            read_jobs = [pool.submit(_reader, path, tuned, time.time() + 2) for _ in range(writers)]
+            outcomes = [job.result() for job in write_jobs]
+            elapsed = time.perf_counter() - start
+            reads = sum(job.result() for job in read_jobs)
+    latencies = sorted(lat for lats, _locked in outcomes for lat in lats)
+    locked = sum(n for _lats, n in outcomes)
+    return {
+        "committed": len(latencies),
+        "locked": locked,
+        "elapsed": elapsed,
+        "median_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else float("nan"),
+        "reads": reads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bearcreek.settings")
+    from django.conf import settings
+    tuned = (settings.SQLITE_INIT_COMMAND, settings.SQLITE_BUSY_TIMEOUT)
+
+    total = args.writers * args.writes
+    print(f"{args.writers} writer + {args.writers} reader processes, {total:,} write transactions")
+    for label, options in (("defaults", None), ("tuned", tuned)):
+        r = run(options, args.writers, args.writes)
+        print(
+            f"  {label:9s} committed {r['committed']:5d}  locked {r['locked']:5d}  "
+            f"{r['committed'] / r['elapsed']:7.0f} tx/s  "
+            f"median {r['median_ms']:6.2f} ms  p95 {r['p95_ms']:7.2f} ms  reads {r['reads']:,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,16 @@
-from datetime import timedelta
+import hashlib
+from collections import defaultdict
+from datetime import datetime
 from urllib.parse import quote
 
+from django.conf import settings
 from django.contrib import admin, messages
-from django.shortcuts import redirect
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ALL_VAR, ORDER_VAR, PAGE_VAR, SEARCH_VAR, ChangeList
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.shortcuts import redirect, render
 from django.urls import path
 from django.utils import timezone
 from django.utils.html import format_html
@@ -12,13 +20,229 @@ from .models import (
     CallbackRequest,
     NukeRequest,
     Order,
+    OutboxMessage,
     PollinationRequest,
     Product,
     SlackMessage,
 )
+from .services import search, slack_sync
+from .services.slack_events import allowed_statuses
+
+
+class ListColumnsChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        if self.model_admin.list_only:
+            queryset = queryset.only(*self.model_admin.list_only)
+        return queryset
+
+
+class ListColumnsMixin:
+    """Loads only ``list_only`` on the changelist, leaving long text and JSON
+    columns (addresses, notes, payloads) for the change form. It must cover
+    every column ``list_display`` reads, or each row pays a query for the
+    missing one (``test_admin_changelists`` holds the budget)."""
+    list_only = ()
+
+    def get_changelist(self, request, **kwargs):
+        return ListColumnsChangeList if self.list_only else super().get_changelist(request, **kwargs)
+
+
+CURSOR_VAR = 'after'
+
+
+class KeysetChangeList(ListColumnsChangeList):
+    """Pages by ``WHERE (key, pk) < cursor LIMIT n`` instead of OFFSET, so page
+    500 reads the same index range as page one. Falls back to Django's offset
+    paginator when the user sorts by a column, asks for a numbered page, or
+    searches (search results are ranked, not dated; see FullTextSearchMixin)."""
+
+    def __init__(self, request, *args, **kwargs):
+        # get_results() runs inside ChangeList.__init__, so these come first.
+        self.keyset = not ({ORDER_VAR, PAGE_VAR, ALL_VAR} & set(request.GET)) and not request.GET.get(SEARCH_VAR)
+        self.cursor = request.GET.get(CURSOR_VAR) if self.keyset else None
+        super().__init__(request, *args, **kwargs)
+
+    @property
+    def keyset_field(self):
+        return self.model_admin.keyset_field
+
+    @property
+    def key_name(self):
+        return self.keyset_field.lstrip('-')
+
+    @property
+    def descending(self):
+        return self.keyset_field.startswith('-')
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Filter, search and sort links start again from the first page.
+        return super().get_query_string(new_params, [CURSOR_VAR, *(remove or [])])
+
+    def get_ordering(self, request, queryset):
+        if not self.keyset:
+            return super().get_ordering(request, queryset)
+        return [self.keyset_field, '-pk' if self.descending else 'pk']
+
+    def encode_cursor(self, obj):
+        return f"{getattr(obj, self.key_name).isoformat()},{obj.pk}"
+
+    def after_cursor(self, queryset):
+        if not self.cursor:
+            return queryset
+        try:
+            value, pk = self.cursor.rsplit(',', 1)
+            value, pk = datetime.fromisoformat(value), int(pk)
+        except ValueError as e:
+            raise IncorrectLookupParameters(e) from e
+        # (key < value) OR (key = value AND pk < pk), with the range written out
+        # on its own so SQLite walks the index from the cursor and stops at the
+        # LIMIT rather than sorting every remaining row.
+        op = 'lt' if self.descending else 'gt'
+        return queryset.filter(**{f'{self.key_name}__{op}e': value}).filter(
+            Q(**{f'{self.key_name}__{op}': value}) | Q(**{f'pk__{op}': pk})
+        )
+
+    def cached_count(self):
+        """The filtered row count, cached for ``ADMIN_COUNT_CACHE_SECONDS`` per
+        model and filter/search combination; an estimate that lags new rows by
+        at most that long, instead of a COUNT(*) on every page."""
+        query = self.get_query_string(remove=[ORDER_VAR])
+        key = 'admin-count:%s:%s' % (self.opts.label_lower, hashlib.sha1(query.encode()).hexdigest())
+        count = cache.get(key)
+        if count is None:
+            count = self.queryset.count()
+            cache.set(key, count, settings.ADMIN_COUNT_CACHE_SECONDS)
+        return count
+
+    def get_results(self, request):
+        if not self.keyset:
+            return super().get_results(request)
+        self.result_list = self.after_cursor(self.queryset)[:self.list_per_page]
+        self.result_count = self.cached_count()
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        # Numbered links would need the exact count; pagination.html renders
+        # first/next links from the cursor instead.
+        self.multi_page = False
+        self.paginator = None
+
+    @property
+    def next_url(self):
+        """Link to the rows after this page, or None on the last page. A full
+        page always links on, so the last page may turn out empty."""
+        rows = list(self.result_list)
+        if len(rows) < self.list_per_page:
+            return None
+        return self.get_query_string({CURSOR_VAR: self.encode_cursor(rows[-1])})
+
+    @property
+    def first_url(self):
+        return self.get_query_string() if self.cursor else None
+
+
+class KeysetPaginationMixin(ListColumnsMixin):
+    """Keyset pagination on ``(keyset_field, pk)`` with a cached row count and
+    no unfiltered total, for changelists that grow without bound. Every page
+    costs one indexed range read; the count is refreshed at most every
+    ``ADMIN_COUNT_CACHE_SECONDS``."""
+    keyset_field = '-created_at'
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+class BulkStatusMixin:
+    """Routes status changes made from the changelist through
+    ``slack_sync.bulk_set_status``: one UPDATE and one batched Slack sync per
+    status, instead of a save and an inline sync per row.
+
+    Covers ``list_editable`` status edits (collected while the formset saves,
+    then applied together) and adds a "Mark selected as …" action per status
+    the model's Slack flow allows."""
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method == 'POST' and '_save' in request.POST:
+            request._status_batch = defaultdict(list)
+        response = super().changelist_view(request, extra_context)
+        batch = getattr(request, '_status_batch', None)
+        if batch:
+            with transaction.atomic():
+                for status, pks in batch.items():
+                    slack_sync.bulk_set_status(self.model.objects.filter(pk__in=pks), status)
+        return response
+
+    def save_model(self, request, obj, form, change):
+        batch = getattr(request, '_status_batch', None)
+        if batch is not None and change and form.changed_data == ['status']:
+            batch[obj.status].append(obj.pk)
+            return
+        super().save_model(request, obj, form, change)
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if not self.has_change_permission(request):
+            return actions
+        labels = dict(self.model._meta.get_field('status').choices)
+        for status in allowed_statuses(self.model):
+            name = f'mark_{status}'
+            actions[name] = (_mark_as(status), name, f"Mark selected as {labels.get(status, status)}")
+        return actions
+
+
+class FullTextSearchMixin:
+    """Answers the changelist search box from the ``shop_search`` FTS5 index
+    (``services.search``) rather than an ``icontains`` OR-chain over
+    ``search_fields``, which scans the table: matches come back best first,
+    then in the list's usual order. ``search_fields`` remains the fallback
+    where the index can't answer (not SQLite, no words in the term)."""
+
+    def get_search_results(self, request, queryset, search_term):
+        ids = search.ranked_ids(self.model, search_term)
+        if ids is None:
+            return super().get_search_results(request, queryset, search_term)
+        if not ids:
+            return queryset.none(), False
+        return queryset.filter(pk__in=ids).order_by(search.rank_order(ids), *queryset.query.order_by), False
+
+
+def customer_search(request):
+    """Every order and request for a phone number, email or name, across all
+    five models, best match first (``admin/search/``)."""
+    term = request.GET.get(SEARCH_VAR, '').strip()
+    results = []
+    for obj in search.search(term):
+        model_admin = admin.site._registry.get(type(obj))
+        if model_admin and model_admin.has_view_permission(request, obj):
+            results.append((obj, model_admin.opts))
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Customer search',
+        'term': term,
+        'results': results,
+        'search_var': SEARCH_VAR,
+    }
+    return render(request, 'admin/shop/customer_search.html', context)
+
+
+def _mark_as(status):
+    def action(modeladmin, request, queryset):
+        changed = slack_sync.bulk_set_status(queryset, status)
+        modeladmin.message_user(request, f"Updated {changed} record(s).", level=messages.SUCCESS)
+    return action
 
 
 class OrderArchiveFilter(admin.SimpleListFilter):
+    """Shows the unarchived orders unless asked otherwise; ``archived_at`` is
+    set by ``manage.py archive_orders``."""
     title = "Order age"
     parameter_name = "archive"
 
@@ -26,29 +250,41 @@ class OrderArchiveFilter(admin.SimpleListFilter):
         return [
             ("active", "Active (last 30 days or not completed)"),
             ("archived", "Archived (completed 30+ days ago)"),
+            ("all", "All orders"),
         ]
 
+    def value(self):
+        return super().value() or "active"
+
+    def choices(self, changelist):
+        # No Django "All" entry: an unfiltered list means "active" here.
+        for lookup, title in self.lookup_choices:
+            yield {
+                "selected": self.value() == lookup,
+                "query_string": changelist.get_query_string({self.parameter_name: lookup}),
+                "display": title,
+            }
+
     def queryset(self, request, queryset):
-        cutoff = timezone.now() - timedelta(days=30)
-        archived = queryset.filter(status="completed", updated_at__lte=cutoff)
         value = self.value()
         if value == "archived":
-            return archived
+            return queryset.filter(archived_at__isnull=False)
         if value == "active":
-            return queryset.exclude(pk__in=archived.values("pk"))
+            return queryset.filter(archived_at__isnull=True)
         return queryset
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(ListColumnsMixin, admin.ModelAdmin):
     list_display = ['name', 'category', 'size', 'price', 'in_stock', 'created_at']
+    list_only = ['name', 'category', 'size', 'price', 'in_stock', 'created_at']
     list_filter = ['category', 'in_stock', 'created_at']
     search_fields = ['name', 'description']
     list_editable = ['price', 'in_stock']
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(FullTextSearchMixin, KeysetPaginationMixin, BulkStatusMixin, admin.ModelAdmin):
     list_display = [
         'id',
         'first_name',
@@ -64,6 +300,11 @@ class OrderAdmin(admin.ModelAdmin):
         'status',
         'created_at',
     ]
+    list_select_related = ['product']
+    list_only = [
+        'first_name', 'last_name', 'email', 'phone', 'prefer_callback', 'product__name', 'product__size',
+        'quantity', 'total_price', 'invoice_sent_at', 'status', 'created_at',
+    ]
     list_filter = [OrderArchiveFilter, 'status', 'created_at']
     search_fields = ['first_name', 'last_name', 'email', 'phone']
     list_editable = ['status']
@@ -72,11 +313,13 @@ class OrderAdmin(admin.ModelAdmin):
         'invoice_details',
         'email_customer_link',
         'invoice_sent_at',
+        'unit_price',
         'total_price',
         'created_at',
         'updated_at',
         'acknowledged_at',
         'reminder_sent_at',
+        'archived_at',
     ]
     fieldsets = (
         ('Invoice Info', {
@@ -87,10 +330,10 @@ class OrderAdmin(admin.ModelAdmin):
             'fields': ('first_name', 'last_name', 'email', 'phone', 'prefer_callback', 'address', 'city', 'state', 'zip_code')
         }),
         ('Order Details', {
-            'fields': ('product', 'quantity', 'total_price', 'status', 'notes')
+            'fields': ('product', 'quantity', 'unit_price', 'total_price', 'status', 'notes')
         }),
         ('Order Tracking', {
-            'fields': ('acknowledged_at', 'reminder_sent_at'),
+            'fields': ('acknowledged_at', 'reminder_sent_at', 'archived_at'),
             'classes': ('collapse',),
         }),
         ('Timestamps', {
@@ -99,14 +342,6 @@ class OrderAdmin(admin.ModelAdmin):
         }),
     )
 
-    def get_queryset(self, request):
-        queryset = super().get_queryset(request)
-        cutoff = timezone.now() - timedelta(days=30)
-        archived = queryset.filter(status="completed", updated_at__lte=cutoff)
-        if request.GET.get("archive") == "archived":
-            return archived
-        return queryset.exclude(pk__in=archived.values("pk"))
-
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
@@ -130,7 +365,7 @@ class OrderAdmin(admin.ModelAdmin):
             f"Address:  {obj.full_address}",
             "",
             f"ITEM:     {obj.product.name} ({obj.product.size})",
-            f"Qty:      {obj.quantity}  ×  ${obj.product.price:.2f} each",
+            f"Qty:      {obj.quantity}  ×  ${obj.unit_price:.2f} each",
             f"TOTAL:    ${obj.total_price:.2f}",
             "",
             f"Order Date: {obj.created_at.strftime('%B %d, %Y')}",
@@ -232,12 +467,7 @@ class OrderAdmin(admin.ModelAdmin):
     @admin.action(description="Mark invoice as sent")
     def mark_invoice_sent(self, request, queryset):
         now = timezone.now()
-        updated = 0
-        for order in queryset:
-            if not order.invoice_sent_at:
-                order.invoice_sent_at = now
-                order.save(update_fields=["invoice_sent_at", "updated_at"])
-                updated += 1
+        updated = queryset.filter(invoice_sent_at__isnull=True).update(invoice_sent_at=now, updated_at=now)
         if updated:
             self.message_user(request, f"Marked {updated} order(s) as invoiced.", level=messages.SUCCESS)
         else:
@@ -246,15 +476,8 @@ class OrderAdmin(admin.ModelAdmin):
     @admin.action(description="Acknowledge selected orders")
     def acknowledge_selected_orders(self, request, queryset):
         now = timezone.now()
-        acknowledged = 0
-        skipped = 0
-        for order in queryset:
-            if order.status == "pending":
-                skipped += 1
-                continue
-            order.acknowledged_at = now
-            order.save(update_fields=["acknowledged_at", "updated_at"])
-            acknowledged += 1
+        skipped = queryset.filter(status="pending").count()
+        acknowledged = queryset.exclude(status="pending").update(acknowledged_at=now, updated_at=now)
 
         if acknowledged:
             self.message_user(request, f"Acknowledged {acknowledged} order(s).", level=messages.SUCCESS)
@@ -266,28 +489,25 @@ class OrderAdmin(admin.ModelAdmin):
             )
 
     def acknowledge_order(self, request, order_id):
-        order = self.get_object(request, order_id)
-        if not order:
-            self.message_user(request, "Order not found.", level=messages.ERROR)
-            return redirect("..")
-
-        if order.status == "pending":
+        now = timezone.now()
+        order = self.get_queryset(request).filter(pk=order_id)
+        if order.exclude(status="pending").update(acknowledged_at=now, updated_at=now):
+            self.message_user(request, "Order acknowledged.", level=messages.SUCCESS)
+        elif order.exists():
             self.message_user(
                 request,
                 "Please update the order status before acknowledging.",
                 level=messages.WARNING,
             )
-            return redirect("..")
-
-        order.acknowledged_at = timezone.now()
-        order.save(update_fields=["acknowledged_at", "updated_at"])
-        self.message_user(request, "Order acknowledged.", level=messages.SUCCESS)
+        else:
+            self.message_user(request, "Order not found.", level=messages.ERROR)
         return redirect("..")
 
 
 @admin.register(NukeRequest)
-class NukeRequestAdmin(admin.ModelAdmin):
+class NukeRequestAdmin(FullTextSearchMixin, KeysetPaginationMixin, BulkStatusMixin, admin.ModelAdmin):
     list_display = ['id', 'first_name', 'last_name', 'email', 'phone', 'quantity', 'experience_level', 'status', 'created_at']
+    list_only = ['first_name', 'last_name', 'email', 'phone', 'quantity', 'experience_level', 'status', 'created_at']
     list_filter = ['status', 'experience_level', 'created_at']
     search_fields = ['first_name', 'last_name', 'email']
     list_editable = ['status']
@@ -310,21 +530,57 @@ class NukeRequestAdmin(admin.ModelAdmin):
 
 
 @admin.register(SlackMessage)
-class SlackMessageAdmin(admin.ModelAdmin):
+class SlackMessageAdmin(KeysetPaginationMixin, admin.ModelAdmin):
     """Read-only view of the Slack message → record mapping (for debugging
     reaction-driven status updates)."""
     list_display = ['ts', 'channel', 'content_type', 'object_id', 'target', 'created_at']
+    list_only = ['ts', 'channel', 'content_type', 'object_id', 'created_at']
     list_filter = ['content_type', 'created_at']
     search_fields = ['ts', 'channel']
     readonly_fields = ['channel', 'ts', 'content_type', 'object_id', 'created_at']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_targets()
+
     def has_add_permission(self, request):
         return False
 
 
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(KeysetPaginationMixin, admin.ModelAdmin):
+    """Read-only view of queued/delivered notifications (for spotting Slack or
+    SMTP outages). Failed rows can be re-queued with the action."""
+    list_display = ['id', 'kind', 'status', 'attempts', 'target', 'next_attempt_at', 'last_error', 'created_at']
+    keyset_field = 'created_at'
+    list_only = ['kind', 'status', 'attempts', 'content_type', 'object_id', 'next_attempt_at', 'last_error', 'created_at']
+    list_filter = ['kind', 'status', 'created_at']
+    readonly_fields = [
+        'kind', 'payload', 'content_type', 'object_id', 'status', 'attempts',
+        'next_attempt_at', 'last_error', 'created_at', 'sent_at',
+    ]
+    actions = ['retry_now']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('target')
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Retry selected notifications now")
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(
+            status='pending', attempts=0, next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f"Re-queued {updated} notification(s).", level=messages.SUCCESS)
+
+
 @admin.register(PollinationRequest)
-class PollinationRequestAdmin(admin.ModelAdmin):
+class PollinationRequestAdmin(FullTextSearchMixin, KeysetPaginationMixin, BulkStatusMixin, admin.ModelAdmin):
     list_display = ['id', 'first_name', 'last_name', 'email', 'phone', 'crop_type', 'acreage', 'preferred_start_date', 'status', 'created_at']
+    list_only = [
+        'first_name', 'last_name', 'email', 'phone', 'crop_type', 'acreage', 'preferred_start_date', 'status',
+        'created_at',
+    ]
     list_filter = ['status', 'crop_type', 'created_at']
     search_fields = ['first_name', 'last_name', 'email', 'city']
     list_editable = ['status']
@@ -350,8 +606,11 @@ class PollinationRequestAdmin(admin.ModelAdmin):
 
 
 @admin.register(BeeRemovalRequest)
-class BeeRemovalRequestAdmin(admin.ModelAdmin):
+class BeeRemovalRequestAdmin(FullTextSearchMixin, KeysetPaginationMixin, BulkStatusMixin, admin.ModelAdmin):
     list_display = ['id', 'first_name', 'last_name', 'email', 'phone', 'city', 'bee_location', 'urgency', 'status', 'created_at']
+    list_only = [
+        'first_name', 'last_name', 'email', 'phone', 'city', 'bee_location', 'urgency', 'status', 'created_at',
+    ]
     list_filter = ['status', 'urgency', 'bee_location', 'property_type', 'created_at']
     search_fields = ['first_name', 'last_name', 'email', 'city', 'property_address']
     list_editable = ['status']
@@ -380,8 +639,9 @@ class BeeRemovalRequestAdmin(admin.ModelAdmin):
 
 
 @admin.register(CallbackRequest)
-class CallbackRequestAdmin(admin.ModelAdmin):
+class CallbackRequestAdmin(FullTextSearchMixin, KeysetPaginationMixin, BulkStatusMixin, admin.ModelAdmin):
     list_display = ['id', 'name', 'phone', 'email', 'interest', 'best_time', 'status', 'created_at']
+    list_only = ['name', 'phone', 'email', 'interest', 'best_time', 'status', 'created_at']
     list_filter = ['status', 'interest', 'created_at']
     search_fields = ['name', 'phone', 'email', 'message']
     list_editable = ['status']
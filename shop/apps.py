@@ -6,4 +6,4 @@ class ShopConfig(AppConfig):
 
     def ready(self):
         from shop import signals
-        signals.connect()
+        signals.connect(self)
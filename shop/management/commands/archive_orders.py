@@ -0,0 +1,52 @@
+"""Move completed orders out of the admin's default order list.
+
+Flags orders completed more than ``--days`` ago (by last update) with
+``archived_at``; the Orders changelist shows only unarchived orders unless the
+"Order age" filter asks for archived ones, so its cost tracks the working set
+rather than the whole order history. Incremental and idempotent: each run only
+touches orders not yet archived, and un-archives any whose status has since
+moved off "completed" without going through ``Order.save`` or
+``bulk_set_status`` (which clear ``archived_at`` themselves). The outbox relay
+(``relay_notifications --loop``) runs it daily; to run it by hand:
+
+    python manage.py archive_orders
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from shop.models import Order
+
+ARCHIVE_AFTER_DAYS = 30
+
+
+def archive_orders(days=ARCHIVE_AFTER_DAYS, now=None):
+    """Archive orders completed ``days`` or more ago. Returns ``(archived,
+    restored)`` counts."""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=days)
+    archived = Order.objects.filter(
+        status="completed", updated_at__lte=cutoff, archived_at__isnull=True,
+    ).update(archived_at=now)
+    restored = Order.objects.filter(
+        archived_at__isnull=False,
+    ).exclude(status="completed").update(archived_at=None)
+    return archived, restored
+
+
+class Command(BaseCommand):
+    help = "Archive orders completed more than 30 days ago."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=ARCHIVE_AFTER_DAYS,
+            help=f"Archive orders completed at least N days ago. Default: {ARCHIVE_AFTER_DAYS}.",
+        )
+
+    def handle(self, *args, **options):
+        archived, restored = archive_orders(days=options["days"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} order(s); restored {restored} no longer completed."
+        ))
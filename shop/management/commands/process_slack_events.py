@@ -0,0 +1,67 @@
+"""Apply stored Slack events (reaction-driven status changes).
+
+The /slack/events/ endpoint only stores and acks deliveries; this command does
+the actual work. Run it once or keep it running next to the web server:
+
+    python manage.py process_slack_events --loop
+
+With ``--loop`` a failing pass (a lock held past the busy timeout, a purge
+that trips over a schema change) is logged and retried after ``--interval``
+rather than stopping reaction-driven status changes until someone notices.
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from shop.services import circuit, slack_events
+
+PURGE_EVERY = 10 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Process stored Slack events in arrival order per message."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling for new events instead of exiting after one pass.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=1.0,
+            help="Seconds to sleep between polls when idle (with --loop). Default: 1.",
+        )
+        parser.add_argument(
+            "--batch", type=int, default=100,
+            help="Maximum events to process per pass. Default: 100.",
+        )
+
+    def handle(self, *args, **options):
+        last_purge = 0.0
+        while True:
+            try:
+                # Settled events only guard against redeliveries for a while.
+                if time.monotonic() - last_purge > PURGE_EVERY:
+                    purged = slack_events.purge_old_events()
+                    if purged:
+                        self.stdout.write(f"Purged {purged} old Slack event(s).")
+                    last_purge = time.monotonic()
+                processed, failed = slack_events.process_pending_events(limit=options["batch"])
+                circuit.publish("slack_events")
+            except Exception:
+                if not options["loop"]:
+                    raise
+                logger.exception("Slack event pass failed; retrying in %ss", options["interval"])
+                close_old_connections()
+                time.sleep(options["interval"])
+                continue
+            if processed or failed or not options["loop"]:
+                self.stdout.write(f"Processed {processed} Slack event(s), {failed} failed.")
+            if not options["loop"]:
+                return
+            if processed + failed < options["batch"]:
+                time.sleep(options["interval"])
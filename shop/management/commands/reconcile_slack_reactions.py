@@ -0,0 +1,41 @@
+"""Heal Slack reaction state against what's actually on the messages.
+
+Status resolution runs against each ``SlackMessage``'s local reaction
+projection, kept current from reaction events. If events were missed (the
+endpoint was down for an hour, a delivery failed for good), this resyncs every
+open record posted in the window and re-resolves its status. Reactions are read
+from the channel history in pages of a few hundred messages, so even thousands
+of records take a handful of API calls. Safe to run any time, e.g. hourly from
+cron:
+
+    python manage.py reconcile_slack_reactions --days 30
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from shop.services import slack_events
+
+
+class Command(BaseCommand):
+    help = "Resync recent Slack-linked records from the channel history and fix any drifted statuses."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=30,
+            help="Only reconcile messages posted in the last N days. Default: 30.",
+        )
+        parser.add_argument(
+            "--include-closed", action="store_true",
+            help="Also recheck records already completed, cancelled or declined.",
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options["days"])
+        result = slack_events.reconcile_recent(since, include_closed=options["include_closed"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled {result['checked']} message(s) in {result['pages']} API call(s); "
+            f"{result['changed']} status change(s)."
+        ))
@@ -0,0 +1,71 @@
+"""Deliver queued Slack/email notifications from the outbox.
+
+Form submits only write ``OutboxMessage`` rows; this command is what actually
+talks to Slack and SMTP. Run it once (e.g. from cron) or keep it running next
+to the web server:
+
+    python manage.py relay_notifications --loop
+
+With ``--loop`` a failing pass (a lock held past the busy timeout, an outage
+the per-message handling didn't expect) is logged and retried after
+``--interval``; the relay runs unsupervised, so it must not die. The loop is
+also the site's only long-running job, so it archives old completed orders
+(see ``archive_orders``) when it starts and once a day after that.
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from shop.management.commands.archive_orders import archive_orders
+from shop.services import circuit, outbox
+
+ARCHIVE_EVERY = 24 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deliver pending notifications from the outbox, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling for new messages instead of exiting after one pass.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=2.0,
+            help="Seconds to sleep between polls when idle (with --loop). Default: 2.",
+        )
+        parser.add_argument(
+            "--batch", type=int, default=50,
+            help="Maximum messages to deliver per pass. Default: 50.",
+        )
+
+    def handle(self, *args, **options):
+        last_archive = None
+        while True:
+            try:
+                if options["loop"] and (last_archive is None or time.monotonic() - last_archive > ARCHIVE_EVERY):
+                    archived, restored = archive_orders()
+                    if archived or restored:
+                        self.stdout.write(f"Archived {archived} order(s); restored {restored}.")
+                    last_archive = time.monotonic()
+                sent, failed = outbox.deliver_pending(limit=options["batch"])
+                circuit.publish("relay")
+            except Exception:
+                if not options["loop"]:
+                    raise
+                logger.exception("Outbox relay pass failed; retrying in %ss", options["interval"])
+                close_old_connections()
+                time.sleep(options["interval"])
+                continue
+            if sent or failed or not options["loop"]:
+                self.stdout.write(f"Delivered {sent} notification(s), {failed} failed.")
+            if not options["loop"]:
+                return
+            # Drain a backlog without pausing; only sleep once caught up.
+            if sent + failed < options["batch"]:
+                time.sleep(options["interval"])
@@ -8,24 +8,33 @@ from shop.models import Order
 from shop.services.notifications import notify_order_reminder
 
 
+def due_reminders(cutoff):
+    """Pending orders owed a reminder: never acknowledged and older than
+    ``cutoff``, or acknowledged before ``cutoff`` and not reminded since. The
+    product comes along, as every reminder names it."""
+    orders = Order.objects.select_related("product")
+    overdue_orders = orders.filter(
+        status="pending",
+        acknowledged_at__isnull=True,
+        reminder_sent_at__isnull=True,
+        created_at__lte=cutoff,
+    )
+    acknowledged_overdue_orders = orders.filter(
+        status="pending",
+        acknowledged_at__isnull=False,
+        acknowledged_at__lte=cutoff,
+    ).filter(
+        Q(reminder_sent_at__isnull=True) | Q(reminder_sent_at__lt=F("acknowledged_at"))
+    )
+    return overdue_orders, acknowledged_overdue_orders
+
+
 class Command(BaseCommand):
     help = "Send SMS reminders for orders still pending after 24 hours."
 
     def handle(self, *args, **options):
         cutoff = timezone.now() - timedelta(hours=24)
-        overdue_orders = Order.objects.filter(
-            status="pending",
-            acknowledged_at__isnull=True,
-            reminder_sent_at__isnull=True,
-            created_at__lte=cutoff,
-        )
-        acknowledged_overdue_orders = Order.objects.filter(
-            status="pending",
-            acknowledged_at__isnull=False,
-            acknowledged_at__lte=cutoff,
-        ).filter(
-            Q(reminder_sent_at__isnull=True) | Q(reminder_sent_at__lt=F("acknowledged_at"))
-        )
+        overdue_orders, acknowledged_overdue_orders = due_reminders(cutoff)
 
         sent_count = 0
         for order in list(overdue_orders) + list(acknowledged_overdue_orders):
@@ -96,9 +96,7 @@ class Command(BaseCommand):
                 "(test data, will self-clean)",
                 link_to=order,
             )
-            link = SlackMessage.objects.filter(
-                content_type__model="order", object_id=order.pk
-            ).first()
+            link = SlackMessage.objects.for_object(order).first()
             if not link:
                 raise CommandError(
                     "No SlackMessage was recorded — chat.postMessage likely failed. "
@@ -139,9 +137,7 @@ class Command(BaseCommand):
                 ))
             # Never leave smoke-test rows in the business database.
             if order is not None:
-                SlackMessage.objects.filter(
-                    content_type__model="order", object_id=order.pk
-                ).delete()
+                SlackMessage.objects.for_object(order).delete()
                 order.delete()
             if product is not None:
                 product.delete()
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0017_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxmessage',
+            name='kind',
+            field=models.CharField(choices=[('slack', 'Slack message'), ('slack_api', 'Deferred Slack API call'), ('email', 'Admin email')], max_length=20),
+        ),
+    ]
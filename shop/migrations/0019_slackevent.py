@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-17 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0018_outboxmessage_slack_api_kind'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlackEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(blank=True, default='', max_length=50)),
+                ('event_type', models.CharField(blank=True, default='', max_length=50)),
+                ('channel', models.CharField(blank=True, default='', max_length=50)),
+                ('ts', models.CharField(blank=True, default='', max_length=50)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='slackevent_status_idx')],
+            },
+        ),
+    ]
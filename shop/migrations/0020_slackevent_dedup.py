@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-17 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0019_slackevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slackevent',
+            name='retry_num',
+            field=models.PositiveIntegerField(default=0, help_text='X-Slack-Retry-Num of the accepted delivery'),
+        ),
+        migrations.AddIndex(
+            model_name='slackevent',
+            index=models.Index(fields=['received_at'], name='slackevent_received_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='slackevent',
+            constraint=models.UniqueConstraint(condition=models.Q(('event_id', ''), _negated=True), fields=('event_id',), name='slackevent_unique_event_id'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-17 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0020_slackevent_dedup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slackmessage',
+            name='reactions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='slackmessage',
+            name='reactions_synced_at',
+            field=models.DateTimeField(blank=True, help_text='When the reaction projection was last rebased from Slack', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0021_slackmessage_reactions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slackmessage',
+            name='rendered_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
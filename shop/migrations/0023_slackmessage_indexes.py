@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-17 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('shop', '0022_slackmessage_rendered_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='slackmessage',
+            index=models.Index(fields=['ts'], name='slackmessage_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slackmessage',
+            index=models.Index(fields=['content_type', 'object_id'], name='slackmessage_target_idx'),
+        ),
+    ]
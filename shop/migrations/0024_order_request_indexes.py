@@ -0,0 +1,57 @@
+# Generated by Django 6.0 on 2026-10-17 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0023_slackmessage_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='beeremovalrequest',
+            index=models.Index(fields=['-created_at'], name='beeremoval_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='beeremovalrequest',
+            index=models.Index(fields=['status', '-created_at'], name='beeremoval_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='callbackrequest',
+            index=models.Index(fields=['-created_at'], name='callback_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='callbackrequest',
+            index=models.Index(fields=['status', '-created_at'], name='callback_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='nukerequest',
+            index=models.Index(fields=['-created_at'], name='nuc_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='nukerequest',
+            index=models.Index(fields=['status', '-created_at'], name='nuc_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['-created_at'], name='order_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['status', 'acknowledged_at', 'created_at'], name='order_pending_reminder_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pollinationrequest',
+            index=models.Index(fields=['-created_at'], name='pollination_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pollinationrequest',
+            index=models.Index(fields=['status', '-created_at'], name='pollination_status_idx'),
+        ),
+    ]
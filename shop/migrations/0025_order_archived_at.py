@@ -0,0 +1,40 @@
+# Generated by Django 6.0 on 2026-10-17 12:40
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def archive_existing(apps, schema_editor):
+    # Same rule as manage.py archive_orders, so the admin's default list
+    # doesn't fill with old completed orders until the first run.
+    Order = apps.get_model("shop", "Order")
+    now = timezone.now()
+    Order.objects.filter(
+        status="completed", updated_at__lte=now - timedelta(days=30),
+    ).update(archived_at=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0024_order_request_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='order',
+            name='order_created_idx',
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['archived_at', '-created_at'], name='order_hot_idx'),
+        ),
+        migrations.RunPython(archive_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def snapshot_unit_prices(apps, schema_editor):
+    # Existing orders were priced at product.price * quantity when last saved;
+    # recover that price from the stored total rather than today's price.
+    Order = apps.get_model("shop", "Order")
+    orders = list(Order.objects.only("pk", "quantity", "total_price"))
+    for order in orders:
+        order.unit_price = (order.total_price / (order.quantity or 1)).quantize(Decimal("0.01"))
+    Order.objects.bulk_update(orders, ["unit_price"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0025_order_archived_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, max_digits=8, null=True, help_text='Product price when the order was placed'),
+        ),
+        migrations.RunPython(snapshot_unit_prices, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='order',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, max_digits=8, help_text='Product price when the order was placed'),
+        ),
+    ]
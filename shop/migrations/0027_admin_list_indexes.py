@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-17 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('shop', '0026_order_unit_price'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='outboxmessage',
+            index=models.Index(fields=['created_at'], name='outbox_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slackmessage',
+            index=models.Index(fields=['-created_at'], name='slackmessage_created_idx'),
+        ),
+    ]
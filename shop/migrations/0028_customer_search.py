@@ -0,0 +1,84 @@
+"""FTS5 index over the customer fields of orders and the four request types.
+
+One ``shop_search`` row per record, keyed ``rowid = id * 8 + kind`` (kinds as in
+``shop.services.search.KINDS``) and kept current by triggers, so bulk updates,
+fixtures and raw SQL can't leave it stale. The update trigger fires only when an
+indexed column changes; status updates never touch the index. SQLite only.
+A later migration that rebuilds a source table drops its triggers;
+``shop.services.search.ensure_triggers`` puts them back after ``migrate``.
+"""
+
+from django.db import migrations
+
+STRIDE = 8
+
+# table, kind, indexed columns. Frozen here; later changes need a migration.
+SOURCES = [
+    ('shop_order', 1, ['first_name', 'last_name', 'email', 'phone', 'address', 'city', 'zip_code', 'notes']),
+    ('shop_nukerequest', 2, ['first_name', 'last_name', 'email', 'phone', 'address', 'city', 'zip_code', 'notes']),
+    ('shop_pollinationrequest', 3, [
+        'first_name', 'last_name', 'email', 'phone', 'property_address', 'city', 'zip_code', 'notes',
+    ]),
+    ('shop_beeremovalrequest', 4, [
+        'first_name', 'last_name', 'email', 'phone', 'property_address', 'city', 'zip_code', 'notes',
+    ]),
+    ('shop_callbackrequest', 5, ['name', 'phone', 'email', 'message']),
+]
+
+
+def _digits(ref):
+    expr = ref
+    for char in '()-. +':
+        expr = f"replace({expr}, '{char}', '')"
+    return expr
+
+
+def _body(row, columns):
+    # Phones are also indexed as bare digits and their last seven digits, so
+    # "8505551234" and "5551234" find "(850) 555-1234".
+    digits = _digits(f'{row}.phone')
+    parts = [f"ifnull({row}.{column}, '')" for column in columns] + [digits, f'substr({digits}, -7)']
+    return " || ' ' || ".join(parts)
+
+
+def _statements(table, kind, columns):
+    key = f'{{row}}.id * {STRIDE} + {kind}'
+    insert = 'INSERT INTO shop_search (rowid, body) VALUES ({key}, {body});'
+    delete = 'DELETE FROM shop_search WHERE rowid = {key};'
+    new = insert.format(key=key.format(row='new'), body=_body('new', columns))
+    old = delete.format(key=key.format(row='old'))
+    return [
+        f"INSERT INTO shop_search (rowid, body) SELECT {key.format(row=table)}, {_body(table, columns)} FROM {table}",
+        f'CREATE TRIGGER {table}_search_ai AFTER INSERT ON {table} BEGIN {new} END',
+        f'CREATE TRIGGER {table}_search_au AFTER UPDATE OF {", ".join(columns)} ON {table} BEGIN {old} {new} END',
+        f'CREATE TRIGGER {table}_search_ad AFTER DELETE ON {table} BEGIN {old} END',
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("CREATE VIRTUAL TABLE shop_search USING fts5(body, tokenize='unicode61 remove_diacritics 2')")
+    for table, kind, columns in SOURCES:
+        for statement in _statements(table, kind, columns):
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, _kind, _columns in SOURCES:
+        for suffix in ('ai', 'au', 'ad'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_search_{suffix}')
+    schema_editor.execute('DROP TABLE IF EXISTS shop_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0027_admin_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
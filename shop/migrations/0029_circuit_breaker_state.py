@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-17 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0028_customer_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CircuitBreakerState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('process', models.CharField(help_text='e.g. relay, slack_events', max_length=50)),
+                ('name', models.CharField(help_text='Breaker name: slack, smtp', max_length=20)),
+                ('state', models.CharField(max_length=20)),
+                ('snapshot', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('process', 'name'), name='circuitbreakerstate_unique')],
+            },
+        ),
+    ]
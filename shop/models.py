@@ -3,6 +3,53 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
+
+
+class TrackedFieldsMixin:
+    """Remembers the values ``tracked_fields`` had when the instance was loaded
+    (or last saved), so a save can tell which of them changed.
+
+    Values are captured in ``from_db`` and ``refresh_from_db`` rather than a
+    ``post_init`` signal, so building instances in code costs nothing and a
+    queryset only pays for the fields it actually loaded. A field left out by
+    ``.only()``/``.defer()`` is remembered when it's first read (Django loads
+    it through ``refresh_from_db``) and is unchanged until then; if it's
+    assigned without ever being read, its loaded value is unknown and it counts
+    as changed. Instances built in code have no loaded values: they count as
+    changed only while ``_state.adding``.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self.remember_loaded(fields)
+
+    def remember_loaded(self, fields=None):
+        """Record the current values of the tracked ``fields`` (default: all
+        tracked fields that are loaded) as the database's."""
+        loaded = self.__dict__.setdefault('_loaded_values', {})
+        for name in self.tracked_fields:
+            if (fields is None or name in fields) and name in self.__dict__:
+                loaded[name] = self.__dict__[name]
+
+    def loaded_value(self, name, default=None):
+        return self.__dict__.get('_loaded_values', {}).get(name, default)
+
+    def field_changed(self, name):
+        if name not in self.__dict__:
+            return False  # deferred, and neither read nor assigned since
+        loaded = self.__dict__.get('_loaded_values')
+        if loaded is None:
+            return self._state.adding
+        return name not in loaded or loaded[name] != self.__dict__[name]
 
 
 class Product(models.Model):
@@ -37,8 +84,12 @@ class Product(models.Model):
         return reverse('product_detail', args=[self.pk])
 
 
-class Order(models.Model):
+class Order(TrackedFieldsMixin, models.Model):
     """Model for honey orders"""
+    # Status changes are mirrored to Slack (see shop.signals); product and
+    # quantity changes reprice the order (see save).
+    tracked_fields = ('status', 'product_id', 'quantity')
+
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('processing', 'Processing'),
@@ -63,6 +114,9 @@ class Order(models.Model):
     # Order Information
     product = models.ForeignKey(Product, on_delete=models.PROTECT)
     quantity = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    unit_price = models.DecimalField(
+        max_digits=8, decimal_places=2, help_text="Product price when the order was placed",
+    )
     total_price = models.DecimalField(max_digits=8, decimal_places=2)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     notes = models.TextField(blank=True)
@@ -75,9 +129,26 @@ class Order(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     acknowledged_at = models.DateTimeField(blank=True, null=True)
     reminder_sent_at = models.DateTimeField(blank=True, null=True)
+    # Set by ``archive_orders`` (daily, from the relay loop) once a completed
+    # order is 30+ days old and cleared when its status leaves "completed";
+    # the admin's default list shows only unarchived orders.
+    archived_at = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Changelist: the unarchived (hot) set, newest first.
+            models.Index(fields=['archived_at', '-created_at'], name='order_hot_idx'),
+            # Admin status filter and finding orders due for archiving.
+            models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+            # send_order_reminders: pending orders only, by acknowledgement then
+            # age. status leads even though it's constant so SQLite's planner
+            # credits the index with the status=? term and prefers it.
+            models.Index(
+                fields=['status', 'acknowledged_at', 'created_at'], condition=models.Q(status='pending'),
+                name='order_pending_reminder_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} - {self.first_name} {self.last_name}"
@@ -91,14 +162,33 @@ class Order(models.Model):
         return f"{self.address}, {self.city}, {self.state} {self.zip_code}"
 
     def save(self, *args, **kwargs):
-        # Calculate total price
-        if self.product and self.quantity:
-            self.total_price = self.product.price * self.quantity
+        # The unit price is snapshotted when the order is placed (or its
+        # product changes); the total is recomputed only when product or
+        # quantity change. Other saves (status, reminders) neither load the
+        # product nor reprice the order.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'product', 'product_id', 'quantity'} & set(update_fields):
+            new_product = self._state.adding or self.field_changed('product_id')
+            if self.product_id and self.quantity and (new_product or self.field_changed('quantity')):
+                if new_product or self.unit_price is None:
+                    self.unit_price = self.product.price
+                self.total_price = self.unit_price * self.quantity
+                if update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, 'unit_price', 'total_price'}
+        # A reopened order goes straight back on the admin's default list.
+        if (update_fields is None or 'status' in update_fields) and self.field_changed('status') \
+                and self.status != 'completed' and self.archived_at is not None:
+            self.archived_at = None
+            if update_fields is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'archived_at'}
         super().save(*args, **kwargs)
+        self.remember_loaded(['product_id', 'quantity'])
 
 
-class NukeRequest(models.Model):
+class NukeRequest(TrackedFieldsMixin, models.Model):
     """Model for bee starter kit (nuke) purchase requests"""
+    tracked_fields = ('status',)
+
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('contacted', 'Contacted'),
@@ -152,13 +242,19 @@ class NukeRequest(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Nuc Request'
         verbose_name_plural = 'Nuc Requests'
+        indexes = [
+            models.Index(fields=['-created_at'], name='nuc_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='nuc_status_idx'),
+        ]
 
     def __str__(self):
         return f"Nuc Request #{self.id} - {self.first_name} {self.last_name}"
 
 
-class PollinationRequest(models.Model):
+class PollinationRequest(TrackedFieldsMixin, models.Model):
     """Model for pollination service requests"""
+    tracked_fields = ('status',)
+
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('contacted', 'Contacted'),
@@ -225,13 +321,19 @@ class PollinationRequest(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Pollination Request'
         verbose_name_plural = 'Pollination Requests'
+        indexes = [
+            models.Index(fields=['-created_at'], name='pollination_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='pollination_status_idx'),
+        ]
 
     def __str__(self):
         return f"Pollination Request #{self.id} - {self.first_name} {self.last_name} ({self.crop_type})"
 
 
-class BeeRemovalRequest(models.Model):
+class BeeRemovalRequest(TrackedFieldsMixin, models.Model):
     """Model for bee removal/relocation service requests"""
+    tracked_fields = ('status',)
+
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('contacted', 'Contacted'),
@@ -325,13 +427,19 @@ class BeeRemovalRequest(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Bee Removal Request'
         verbose_name_plural = 'Bee Removal Requests'
+        indexes = [
+            models.Index(fields=['-created_at'], name='beeremoval_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='beeremoval_status_idx'),
+        ]
 
     def __str__(self):
         return f"Bee Removal #{self.id} - {self.first_name} {self.last_name} ({self.urgency})"
 
 
-class CallbackRequest(models.Model):
+class CallbackRequest(TrackedFieldsMixin, models.Model):
     """Model for simple callback requests from the footer"""
+    tracked_fields = ('status',)
+
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('contacted', 'Contacted'),
@@ -383,11 +491,30 @@ class CallbackRequest(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Callback Request'
         verbose_name_plural = 'Callback Requests'
+        indexes = [
+            models.Index(fields=['-created_at'], name='callback_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='callback_status_idx'),
+        ]
 
     def __str__(self):
         return f"Callback #{self.id} - {self.name} ({self.get_interest_display()})"
 
 
+class SlackMessageQuerySet(models.QuerySet):
+    def with_targets(self):
+        """Resolve each row's ``target`` up front: rows are grouped by content
+        type and each target model is fetched with one ``pk__in`` query,
+        instead of one query per row when ``link.target`` is first read."""
+        return self.select_related('content_type').prefetch_related('target')
+
+    def for_object(self, obj):
+        """Links to ``obj``. Filters on the (cached) content type id so the
+        lookup is served by the (content_type, object_id) index without a join
+        to ``django_content_type``."""
+        ct = ContentType.objects.get_for_model(obj.__class__)
+        return self.filter(content_type=ct, object_id=obj.pk)
+
+
 class SlackMessage(models.Model):
     """Links a posted Slack notification to the DB record it represents.
 
@@ -407,21 +534,183 @@ class SlackMessage(models.Model):
     # The single reaction the bot itself currently has on the message (its
     # status "cue"), tracked so we can move it precisely as status changes.
     bot_reaction = models.CharField(max_length=50, blank=True, default='')
+    # sha256 of the text + blocks last stamped via chat.update, so a sync that
+    # would render the same thing is skipped.
+    rendered_hash = models.CharField(max_length=64, blank=True, default='')
+    # Local projection of the reactions on the message: {reaction name: [user
+    # ids]}. Kept current from reaction event deltas so status resolution
+    # doesn't need a reactions.get round trip per event; rebased from Slack
+    # when stale or by ``reconcile_slack_reactions`` to heal missed events.
+    reactions = models.JSONField(default=dict, blank=True)
+    reactions_synced_at = models.DateTimeField(
+        blank=True, null=True, help_text="When the reaction projection was last rebased from Slack",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = SlackMessageQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         unique_together = ('channel', 'ts')
+        indexes = [
+            # Reaction events and interactions look messages up by ts alone.
+            models.Index(fields=['ts'], name='slackmessage_ts_idx'),
+            models.Index(fields=['content_type', 'object_id'], name='slackmessage_target_idx'),
+            # Admin list ordering/date filter and reconcile_recent's window.
+            models.Index(fields=['-created_at'], name='slackmessage_created_idx'),
+        ]
 
     def __str__(self):
         return f"SlackMessage({self.channel}/{self.ts} → {self.target})"
 
     @classmethod
-    def record(cls, channel, ts, obj, text=''):
-        """Create/refresh the mapping for a posted message."""
+    def record(cls, channel, ts, obj, text='', fresh=False):
+        """Create/refresh the mapping for a posted message. ``fresh`` marks a
+        just-posted message, whose (empty) reaction set is known exactly."""
         ct = ContentType.objects.get_for_model(obj.__class__)
-        return cls.objects.update_or_create(
-            channel=channel,
-            ts=ts,
-            defaults={'content_type': ct, 'object_id': obj.pk, 'text': text},
-        )[0]
+        defaults = {'content_type': ct, 'object_id': obj.pk, 'text': text}
+        if fresh:
+            defaults.update(reactions={}, reactions_synced_at=timezone.now())
+        return cls.objects.update_or_create(channel=channel, ts=ts, defaults=defaults)[0]
+
+    def reaction_names(self):
+        """Names of the reactions currently on the message."""
+        return {name for name, users in self.reactions.items() if users}
+
+    def apply_reaction(self, name, user, added):
+        """Apply one reaction_added/reaction_removed delta to the projection.
+        Idempotent, so a redelivered or already-reconciled event is harmless."""
+        users = set(self.reactions.get(name, ()))
+        if added:
+            users.add(user)
+        else:
+            users.discard(user)
+        if users:
+            self.reactions[name] = sorted(users)
+        else:
+            self.reactions.pop(name, None)
+
+
+class OutboxMessage(models.Model):
+    """A notification queued for delivery by the relay.
+
+    Public form submits write one of these in the same transaction as the
+    order/request instead of calling Slack or SMTP inline, so the customer's
+    redirect never waits on a third party. ``manage.py relay_notifications``
+    delivers pending rows and retries failures with backoff.
+    """
+    KIND_CHOICES = [
+        ('slack', 'Slack message'),
+        ('slack_api', 'Deferred Slack API call'),
+        ('email', 'Admin email'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict)
+    # The order/request a Slack message should be linked to once posted (see
+    # ``SlackMessage``), so reaction-driven status updates still work.
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    target = GenericForeignKey('content_type', 'object_id')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+            models.Index(fields=['created_at'], name='outbox_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Outbox #{self.id} ({self.kind}, {self.status})"
+
+
+class SlackEvent(models.Model):
+    """A raw Slack Events API delivery, stored for background processing.
+
+    The events endpoint only verifies, persists and acks (Slack retries
+    anything not acknowledged within 3 s); ``manage.py process_slack_events``
+    works through the stored events in arrival order per message ``ts``.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+
+    # Slack's unique id for the event; redeliveries reuse it, so it doubles as
+    # the idempotency key (see ``slack_events.accept_event``).
+    event_id = models.CharField(max_length=50, blank=True, default='')
+    retry_num = models.PositiveIntegerField(default=0, help_text="X-Slack-Retry-Num of the accepted delivery")
+    event_type = models.CharField(max_length=50, blank=True, default='')
+    # The reacted-to message, for per-message ordering.
+    channel = models.CharField(max_length=50, blank=True, default='')
+    ts = models.CharField(max_length=50, blank=True, default='')
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='slackevent_status_idx'),
+            models.Index(fields=['received_at'], name='slackevent_received_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event_id'], condition=~models.Q(event_id=''), name='slackevent_unique_event_id',
+            ),
+        ]
+
+    def __str__(self):
+        return f"SlackEvent({self.event_type} {self.channel}/{self.ts}, {self.status})"
+
+    @classmethod
+    def from_payload(cls, payload, retry_num=0):
+        """Persist an ``event_callback`` payload as received. Raises
+        ``IntegrityError`` if its ``event_id`` was already stored."""
+        event = payload.get('event') or {}
+        item = event.get('item') or {}
+        return cls.objects.create(
+            event_id=payload.get('event_id') or '',
+            retry_num=retry_num,
+            event_type=event.get('type') or '',
+            channel=item.get('channel') or '',
+            ts=item.get('ts') or '',
+            payload=payload,
+        )
+
+
+class CircuitBreakerState(models.Model):
+    """The last published state of a background process's circuit breaker.
+
+    Breakers live in process memory (see ``shop.services.circuit``), and the
+    relay makes most of the Slack and SMTP calls, so it writes its breakers
+    here for ``/health/`` to read; web workers report their own directly.
+    """
+    process = models.CharField(max_length=50, help_text="e.g. relay, slack_events")
+    name = models.CharField(max_length=20, help_text="Breaker name: slack, smtp")
+    state = models.CharField(max_length=20)
+    snapshot = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['process', 'name'], name='circuitbreakerstate_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.process}/{self.name}: {self.state}"
@@ -0,0 +1,172 @@
+"""
+Circuit breakers for outbound Slack and SMTP calls.
+
+When slack.com is degraded every call used to sit out its full timeout, and a
+single admin save makes up to four of them, so gunicorn workers starved. A
+breaker counts consecutive failures (timeouts, connection errors, 5xx) per
+service and, past ``failure_threshold``, *opens*: calls fail fast with
+``CircuitOpen`` instead of touching the network. Slack writes are then diverted
+to the outbox by the dispatcher, and queued notifications simply wait for the
+relay's next retry.
+
+After ``reset_timeout`` seconds the breaker goes *half-open* and lets a single
+probe call through; success closes it, failure re-opens it for another
+``reset_timeout``.
+
+State is per process. The background commands (the outbox relay makes most
+of the Slack and SMTP calls) ``publish`` theirs to the database; ``/health/``
+reports the serving worker's breakers and every published one.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# A background process rewrites its rows at least this often while running,
+# so a row older than STALE_AFTER means the process has stopped publishing.
+PUBLISH_EVERY = 60.0
+STALE_AFTER = 5 * 60
+
+
+class CircuitOpen(Exception):
+    """Raised instead of making a call while a service's breaker is open."""
+
+    def __init__(self, name):
+        super().__init__(f"{name} circuit is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.probe_in_flight = False
+            self.times_opened = 0
+            self.rejected = 0
+
+    def allow(self):
+        """Whether a call may go out now. In half-open, only one probe at a time."""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self.lock:
+            if self.state != CLOSED:
+                logger.info("%s circuit closed (service recovered)", self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probe_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                    logger.error("%s circuit opened after %s consecutive failure(s)", self.name, self.failures)
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+    def snapshot(self):
+        with self.lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, round(self.reset_timeout - (self.clock() - self.opened_at), 1))
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'times_opened': self.times_opened,
+                'rejected_calls': self.rejected,
+                'retry_in_seconds': retry_in,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """The process-wide breaker for ``name`` ('slack', 'smtp')."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=getattr(settings, 'CIRCUIT_FAILURE_THRESHOLD', DEFAULT_FAILURE_THRESHOLD),
+                reset_timeout=getattr(settings, 'CIRCUIT_RESET_TIMEOUT', DEFAULT_RESET_TIMEOUT),
+            )
+        return _breakers[name]
+
+
+def all_breakers():
+    with _breakers_lock:
+        return dict(_breakers)
+
+
+_published = {}
+
+
+def publish(process):
+    """Store this process's breaker snapshots under ``process`` for
+    ``/health/``. Writes a row only when its state changed or
+    ``PUBLISH_EVERY`` seconds have passed, so calling it every pass is cheap."""
+    from shop.models import CircuitBreakerState
+    now = time.monotonic()
+    for name, breaker in all_breakers().items():
+        snapshot = breaker.snapshot()
+        last = _published.get((process, name))
+        if last and last[0] == snapshot['state'] and now - last[1] < PUBLISH_EVERY:
+            continue
+        CircuitBreakerState.objects.update_or_create(
+            process=process, name=name, defaults={'state': snapshot['state'], 'snapshot': snapshot},
+        )
+        _published[(process, name)] = (snapshot['state'], now)
+
+
+def published():
+    """Breaker snapshots published by background processes, as
+    ``{process: {name: snapshot}}``; each snapshot adds ``updated_at`` and
+    ``stale`` (not republished within ``STALE_AFTER``)."""
+    from django.utils import timezone
+
+    from shop.models import CircuitBreakerState
+    now = timezone.now()
+    states = {}
+    for row in CircuitBreakerState.objects.order_by('process', 'name'):
+        states.setdefault(row.process, {})[row.name] = {
+            **row.snapshot,
+            'updated_at': row.updated_at.isoformat(),
+            'stale': (now - row.updated_at).total_seconds() > STALE_AFTER,
+        }
+    return states
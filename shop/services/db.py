@@ -0,0 +1,53 @@
+"""
+Retrying writes that lose the race for SQLite's write lock.
+
+SQLite allows one writer at a time. Connections begin transactions IMMEDIATE
+and wait up to ``SQLITE_BUSY_TIMEOUT`` for the lock (see settings), which covers
+ordinary contention; ``retry_on_locked`` is the backstop for a lock held longer
+than that (a long admin bulk edit, a checkpoint): the whole transaction is
+rerun a few times with jittered exponential backoff before the error surfaces.
+"""
+
+import functools
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRIES = 3
+BASE_BACKOFF = 0.05  # seconds; doubles per attempt
+
+
+def is_locked_error(exc):
+    """Whether ``exc`` is SQLite's SQLITE_BUSY ("database is locked")."""
+    return isinstance(exc, OperationalError) and 'database is locked' in str(exc)
+
+
+def retry_on_locked(func):
+    """Rerun ``func`` when it fails with "database is locked".
+
+    ``func`` must own its transaction (open its own ``transaction.atomic()``):
+    inside an outer atomic block the failed transaction can't be rerun, so the
+    error propagates straight away."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        retries = getattr(settings, 'SQLITE_LOCKED_RETRIES', DEFAULT_RETRIES)
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                if not is_locked_error(exc) or connection.in_atomic_block or attempt >= retries:
+                    raise
+                delay = BASE_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5)
+                attempt += 1
+                logger.warning(
+                    "%s hit a locked database; retry %s/%s in %.2fs",
+                    func.__qualname__, attempt, retries, delay,
+                )
+                time.sleep(delay)
+    return wrapper
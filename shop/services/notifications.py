@@ -3,16 +3,25 @@ Notification Service
 
 Sends Slack messages when orders and service requests come in.
 Admin email is kept as an optional silent fallback.
+
+The ``notify_*`` functions don't talk to Slack or SMTP themselves: they queue
+``OutboxMessage`` rows (in the caller's transaction) that the relay delivers
+out of band — see ``shop.services.outbox``.
 """
 
 import logging
 
-import requests
 from django.conf import settings
 from django.core.mail import send_mail
 
+from shop.services.circuit import get_breaker
+from shop.services.slack_client import get_client
+from shop.services.slack_dispatch import get_dispatcher
+
 logger = logging.getLogger(__name__)
 
+HISTORY_PAGE_SIZE = 200
+
 
 def send_slack(message):
     """
@@ -24,14 +33,10 @@ def send_slack(message):
         logger.warning("SLACK_WEBHOOK_URL not configured — skipping Slack notification")
         return False
 
-    try:
-        response = requests.post(webhook_url, json={"text": message}, timeout=5)
-        response.raise_for_status()
+    if get_client().post_webhook(webhook_url, {"text": message}):
         logger.info("Slack notification sent")
         return True
-    except Exception as e:
-        logger.error(f"Failed to send Slack notification: {e}")
-        return False
+    return False
 
 
 def post_message(text, link_to=None):
@@ -50,21 +55,16 @@ def post_message(text, link_to=None):
     if not (token and channel):
         return send_slack(text)
 
-    try:
-        response = requests.post(
-            "https://slack.com/api/chat.postMessage",
-            headers={"Authorization": f"Bearer {token}"},
-            json={"channel": channel, "text": text},
-            timeout=5,
-        )
-        response.raise_for_status()
-        data = response.json()
-    except Exception as e:
-        logger.error(f"Failed to post Slack message: {e}")
-        return None
-
-    if not data.get("ok"):
-        logger.error("Slack chat.postMessage error: %s", data.get("error"))
+    payload = {"channel": channel, "text": text}
+    if link_to is not None:
+        from shop.services.slack_sync import status_blocks
+        blocks = status_blocks(text, link_to)
+        if blocks:
+            payload["blocks"] = blocks
+    # Not deferred on rate limiting: the outbox row that drives this call
+    # already retries, and must be the one to record the ts mapping.
+    data = get_dispatcher().call("chat.postMessage", payload, defer=False)
+    if data is None:
         return None
 
     if link_to is not None:
@@ -72,32 +72,25 @@ def post_message(text, link_to=None):
             from shop.models import SlackMessage
             SlackMessage.record(
                 channel=data.get("channel", channel), ts=data["ts"], obj=link_to,
-                text=text,
+                text=text, fresh=True,
             )
         except Exception:
             logger.exception("Failed to record Slack message mapping")
     return data.get("ts")
 
 
-def update_message(channel, ts, text):
+def update_message(channel, ts, text, blocks=None):
     """Edit a previously-posted notification (chat.update). Used to stamp the
-    authoritative status onto the message when it changes outside Slack. No-op
-    without a bot token."""
+    authoritative status onto the message when it changes outside Slack. Pass
+    ``blocks`` to keep a message's status buttons (chat.update drops blocks it
+    isn't given). No-op without a bot token."""
     token = getattr(settings, 'SLACK_BOT_TOKEN', '')
     if not (token and channel and ts):
         return False
-    try:
-        response = requests.post(
-            "https://slack.com/api/chat.update",
-            headers={"Authorization": f"Bearer {token}"},
-            json={"channel": channel, "ts": ts, "text": text},
-            timeout=5,
-        )
-        response.raise_for_status()
-        return response.json().get("ok", False)
-    except Exception as e:
-        logger.error(f"Failed to update Slack message: {e}")
-        return False
+    payload = {"channel": channel, "ts": ts, "text": text}
+    if blocks:
+        payload["blocks"] = blocks
+    return get_dispatcher().call("chat.update", payload) is not None
 
 
 def add_reaction(channel, ts, name):
@@ -116,90 +109,130 @@ def _reaction_op(method, channel, ts, name, ok_errors=frozenset()):
     token = getattr(settings, 'SLACK_BOT_TOKEN', '')
     if not (token and channel and ts and name):
         return False
-    try:
-        response = requests.post(
-            f"https://slack.com/api/{method}",
-            headers={"Authorization": f"Bearer {token}"},
-            json={"channel": channel, "timestamp": ts, "name": name},
-            timeout=5,
-        )
-        response.raise_for_status()
-        data = response.json()
-    except Exception as e:
-        logger.error(f"Failed Slack {method}: {e}")
-        return False
-    if data.get("ok") or data.get("error") in ok_errors:
-        return True
-    logger.error("Slack %s error: %s", method, data.get("error"))
-    return False
+    data = get_dispatcher().call(
+        method, {"channel": channel, "timestamp": ts, "name": name}, ok_errors=ok_errors,
+    )
+    return data is not None
 
 
 def get_message_reactions(channel, ts):
     """Return the list of reaction names currently on a message via
-    ``reactions.get``. Reading live state (rather than tracking add/remove
-    deltas) keeps status resolution self-healing if an event is missed or
-    retried out of order. Empty list if unconfigured or on error."""
+    ``reactions.get``. Empty list if unconfigured or on error."""
     token = getattr(settings, 'SLACK_BOT_TOKEN', '')
     if not (token and channel and ts):
         return []
-    try:
-        response = requests.get(
-            "https://slack.com/api/reactions.get",
-            headers={"Authorization": f"Bearer {token}"},
-            params={"channel": channel, "timestamp": ts},
-            timeout=5,
-        )
-        response.raise_for_status()
-        data = response.json()
-    except Exception as e:
-        logger.error(f"Failed to fetch Slack reactions: {e}")
-        return []
-    if not data.get("ok"):
-        logger.error("Slack reactions.get error: %s", data.get("error"))
+    data = get_dispatcher().call(
+        "reactions.get", {"channel": channel, "timestamp": ts}, http_method="GET",
+    )
+    if data is None:
         return []
     message = data.get("message") or {}
     return [r.get("name") for r in message.get("reactions", []) if r.get("name")]
 
 
+def get_message_reaction_users(channel, ts):
+    """Live reactions on a message as ``{name: [user ids]}`` (``reactions.get``
+    with ``full``), used to rebase ``SlackMessage.reactions``. None if
+    unconfigured or on error, so callers can tell "no reactions" from "unknown"."""
+    token = getattr(settings, 'SLACK_BOT_TOKEN', '')
+    if not (token and channel and ts):
+        return None
+    data = get_dispatcher().call(
+        "reactions.get", {"channel": channel, "timestamp": ts, "full": "true"}, http_method="GET",
+    )
+    if data is None:
+        return None
+    return _reaction_users(data.get("message") or {})
+
+
+def get_channel_history(channel, oldest, cursor=None):
+    """One page of ``conversations.history`` from ``oldest`` (a message ts,
+    inclusive) onwards, which carries each message's reactions inline. Returns
+    ``({ts: {name: [user ids]}}, next_cursor)``, or None if unconfigured or
+    on error."""
+    token = getattr(settings, 'SLACK_BOT_TOKEN', '')
+    if not (token and channel):
+        return None
+    params = {"channel": channel, "oldest": oldest, "inclusive": "true", "limit": HISTORY_PAGE_SIZE}
+    if cursor:
+        params["cursor"] = cursor
+    data = get_dispatcher().call("conversations.history", params, http_method="GET")
+    if data is None:
+        return None
+    reactions = {m["ts"]: _reaction_users(m) for m in data.get("messages", []) if m.get("ts")}
+    return reactions, (data.get("response_metadata") or {}).get("next_cursor") or None
+
+
+def _reaction_users(message):
+    # Slack may truncate ``users`` on busy reactions; the names are always complete.
+    return {
+        r["name"]: sorted(r.get("users") or [])
+        for r in message.get("reactions", []) if r.get("name")
+    }
+
+
 def post_thread_reply(channel, thread_ts, text):
     """Reply in-thread to a posted notification (visible confirmation of a
     reaction-driven status change). No-op without a bot token."""
     token = getattr(settings, 'SLACK_BOT_TOKEN', '')
     if not (token and channel):
         return False
-    try:
-        response = requests.post(
-            "https://slack.com/api/chat.postMessage",
-            headers={"Authorization": f"Bearer {token}"},
-            json={"channel": channel, "thread_ts": thread_ts, "text": text},
-            timeout=5,
-        )
-        response.raise_for_status()
-        return response.json().get("ok", False)
-    except Exception as e:
-        logger.error(f"Failed to post Slack thread reply: {e}")
-        return False
+    data = get_dispatcher().call(
+        "chat.postMessage", {"channel": channel, "thread_ts": thread_ts, "text": text},
+    )
+    return data is not None
 
 
 def send_admin_email(subject, message):
     """
-    Send email notification to admin. Silent fallback — won't raise if unconfigured.
+    Send email notification to admin. Silent fallback — won't raise if
+    unconfigured or on SMTP errors, but returns False so the relay can retry.
     """
     admin_email = getattr(settings, 'ADMIN_NOTIFICATION_EMAIL', None)
     if not admin_email:
         return False
+    breaker = get_breaker('smtp')
+    if not breaker.allow():
+        logger.warning("SMTP circuit open — deferring admin email")
+        return False
     try:
         send_mail(
             subject=subject,
             message=message,
             from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[admin_email],
-            fail_silently=True,
+            fail_silently=False,
         )
-        return True
     except Exception as e:
+        breaker.record_failure()
         logger.error(f"Failed to send admin email: {e}")
         return False
+    breaker.record_success()
+    return True
+
+
+def queue_slack_message(text, link_to=None):
+    """Queue a Slack notification for the relay (see ``post_message``). No-op
+    when neither the bot nor the webhook is configured."""
+    token = getattr(settings, 'SLACK_BOT_TOKEN', '')
+    channel = getattr(settings, 'SLACK_CHANNEL', '')
+    if not (token and channel) and not getattr(settings, 'SLACK_WEBHOOK_URL', None):
+        logger.warning("Slack not configured — skipping Slack notification")
+        return None
+    from shop.models import OutboxMessage
+    return OutboxMessage.objects.create(
+        kind='slack', payload={'text': text}, target=link_to,
+    )
+
+
+def queue_admin_email(subject, message):
+    """Queue an admin email for the relay. No-op if unconfigured."""
+    if not getattr(settings, 'ADMIN_NOTIFICATION_EMAIL', None):
+        return None
+    from shop.models import OutboxMessage
+    return OutboxMessage.objects.create(
+        kind='email', payload={'subject': subject, 'message': message},
+    )
 
 
 # =============================================================================
@@ -208,7 +241,7 @@ def send_admin_email(subject, message):
 
 def notify_new_order(order):
     callback_flag = "📞 *CALL BACK REQUESTED*\n" if order.prefer_callback else ""
-    post_message(
+    queue_slack_message(
         f"🍯 *New Honey Order #{order.id}*\n"
         f"{callback_flag}"
         f"*Customer:* {order.first_name} {order.last_name}\n"
@@ -218,11 +251,11 @@ def notify_new_order(order):
         f"➡️ Send QuickBooks invoice to {order.email}",
         link_to=order,
     )
-    send_admin_email(f"New Honey Order #{order.id}", _order_email_body(order))
+    queue_admin_email(f"New Honey Order #{order.id}", _order_email_body(order))
 
 
 def notify_order_reminder(order):
-    post_message(
+    queue_slack_message(
         f"⏰ *Reminder — Order #{order.id} still pending*\n"
         f"{order.first_name} {order.last_name} — "
         f"{order.quantity}× {order.product.name} (${order.total_price})\n"
@@ -233,7 +266,7 @@ def notify_order_reminder(order):
 
 def notify_new_nuc_request(nuc_request):
     callback_flag = "📞 *CALL BACK REQUESTED*\n" if nuc_request.prefer_callback else ""
-    post_message(
+    queue_slack_message(
         f"🐝 *New Nuc Request #{nuc_request.id}*\n"
         f"{callback_flag}"
         f"*Customer:* {nuc_request.first_name} {nuc_request.last_name}\n"
@@ -243,7 +276,7 @@ def notify_new_nuc_request(nuc_request):
         f"*Location:* {nuc_request.city}, {nuc_request.state}",
         link_to=nuc_request,
     )
-    send_admin_email(
+    queue_admin_email(
         f"New Nuc Request #{nuc_request.id}",
         f"Customer: {nuc_request.first_name} {nuc_request.last_name}\n"
         f"Email: {nuc_request.email}  Phone: {nuc_request.phone}\n"
@@ -255,7 +288,7 @@ def notify_new_nuc_request(nuc_request):
 
 def notify_new_pollination_request(pollination_request):
     callback_flag = "📞 *CALL BACK REQUESTED*\n" if pollination_request.prefer_callback else ""
-    post_message(
+    queue_slack_message(
         f"🌸 *New Pollination Request #{pollination_request.id}*\n"
         f"{callback_flag}"
         f"*Customer:* {pollination_request.first_name} {pollination_request.last_name}\n"
@@ -265,7 +298,7 @@ def notify_new_pollination_request(pollination_request):
         f"*Location:* {pollination_request.city}, {pollination_request.state}",
         link_to=pollination_request,
     )
-    send_admin_email(
+    queue_admin_email(
         f"New Pollination Request #{pollination_request.id}",
         f"Customer: {pollination_request.first_name} {pollination_request.last_name}\n"
         f"Email: {pollination_request.email}  Phone: {pollination_request.phone}\n"
@@ -279,7 +312,7 @@ def notify_new_bee_removal(removal_request):
     urgency_emoji = {'low': '🟢', 'medium': '🟡', 'high': '🟠', 'emergency': '🔴'}
     emoji = urgency_emoji.get(removal_request.urgency, '⚪')
     callback_flag = "📞 *CALL BACK REQUESTED*\n" if removal_request.prefer_callback else ""
-    post_message(
+    queue_slack_message(
         f"{emoji} *Bee Removal Request #{removal_request.id} — {removal_request.urgency.upper()}*\n"
         f"{callback_flag}"
         f"*Customer:* {removal_request.first_name} {removal_request.last_name}\n"
@@ -289,7 +322,7 @@ def notify_new_bee_removal(removal_request):
         f"*Sprayed:* {'Yes ⚠️' if removal_request.has_been_sprayed else 'No'}",
         link_to=removal_request,
     )
-    send_admin_email(
+    queue_admin_email(
         f"{'🚨 URGENT: ' if removal_request.urgency in ['high', 'emergency'] else ''}Bee Removal #{removal_request.id}",
         f"URGENCY: {removal_request.urgency.upper()}\n"
         f"Customer: {removal_request.first_name} {removal_request.last_name}\n"
@@ -301,7 +334,7 @@ def notify_new_bee_removal(removal_request):
 
 
 def notify_new_callback_request(callback):
-    post_message(
+    queue_slack_message(
         f"📞 *Callback Request #{callback.id}*\n"
         f"*Name:* {callback.name}   *Phone:* {callback.phone}\n"
         f"*About:* {callback.get_interest_display()}\n"
@@ -309,7 +342,7 @@ def notify_new_callback_request(callback):
         f"*Message:* {callback.message or 'None'}",
         link_to=callback,
     )
-    send_admin_email(
+    queue_admin_email(
         f"Callback Request #{callback.id} — {callback.get_interest_display()}",
         f"Name: {callback.name}\nPhone: {callback.phone}\nEmail: {callback.email or 'Not provided'}\n"
         f"About: {callback.get_interest_display()}\nBest time: {callback.best_time or 'Not specified'}\n"
@@ -0,0 +1,128 @@
+"""
+Notification outbox relay.
+
+Form submits queue ``OutboxMessage`` rows (see ``notifications.queue_*``) in
+the same transaction as the order/request they describe; nothing talks to
+Slack or SMTP on the request path. This module delivers those rows: run it via
+``manage.py relay_notifications`` (``--loop`` keeps it running alongside
+gunicorn, see ``start.sh``). Slack API writes the rate-limit dispatcher couldn't
+send in time land here too (``kind='slack_api'``) and are replayed in order per
+message: while an earlier write to the same ``(channel, ts)`` is waiting out
+its backoff, later ones wait behind it, so a retried stale ``chat.update`` can
+never land on top of a newer one.
+
+Delivery is at-least-once. A failed send is rescheduled with exponential
+backoff and given up on (status ``failed``) after ``MAX_ATTEMPTS``, leaving
+the row and its last error visible in the admin.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+
+from shop.models import OutboxMessage
+from shop.services import notifications, slack_sync
+from shop.services.slack_dispatch import get_dispatcher
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 8
+BASE_BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 60 * 60
+
+
+def backoff(attempts):
+    """Delay before the next try after ``attempts`` failures (30s, 60s, …, 1h cap)."""
+    return timedelta(seconds=min(BASE_BACKOFF_SECONDS * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS))
+
+
+def deliver(message):
+    """Send a single outbox row. Returns True on success."""
+    payload = message.payload or {}
+    if message.kind == 'slack':
+        return bool(notifications.post_message(payload.get('text', ''), link_to=message.target))
+    if message.kind == 'slack_api':
+        # A Web API write the dispatcher couldn't send because of rate limits,
+        # or one a bulk status change queued.
+        ok = get_dispatcher().call(
+            payload['method'], payload.get('args'), ok_errors=set(payload.get('ok_errors', ())), defer=False,
+        ) is not None
+        if ok:
+            slack_sync.record_delivered(payload['method'], payload.get('args') or {})
+        return ok
+    if message.kind == 'email':
+        return notifications.send_admin_email(payload.get('subject', ''), payload.get('message', ''))
+    logger.error("Unknown outbox message kind %r (#%s)", message.kind, message.pk)
+    return False
+
+
+def message_key(message):
+    """The Slack message a ``slack_api`` row writes to, as ``(channel, ts)``;
+    None for other rows (which need no ordering)."""
+    if message.kind != 'slack_api':
+        return None
+    args = (message.payload or {}).get('args') or {}
+    ts = args.get('ts') or args.get('timestamp')
+    return (args['channel'], ts) if args.get('channel') and ts else None
+
+
+def _waiting_writes(now):
+    """The earliest pending-but-not-due ``slack_api`` row per message: the
+    writes that later ones to the same message must wait for."""
+    waiting = {}
+    backing_off = OutboxMessage.objects.filter(
+        kind='slack_api', status='pending', next_attempt_at__gt=now,
+    ).only('kind', 'payload', 'next_attempt_at').order_by('-id')
+    for message in backing_off:
+        key = message_key(message)
+        if key:
+            waiting[key] = message
+    return waiting
+
+
+def deliver_pending(limit=50):
+    """Deliver up to ``limit`` due rows, oldest first. Returns ``(sent, failed)``
+    counts for this pass. A Slack write queued behind an earlier, still
+    pending write to the same message is pushed back to that write's next
+    attempt instead (it isn't counted)."""
+    now = timezone.now()
+    due = list(
+        OutboxMessage.objects.filter(status='pending', next_attempt_at__lte=now)
+        .select_related('content_type')
+        .order_by('id')[:limit]
+    )
+    waiting = _waiting_writes(now)
+    sent = failed = 0
+    for message in due:
+        key = message_key(message)
+        blocker = waiting.get(key)
+        if blocker is not None and blocker.pk < message.pk:
+            message.next_attempt_at = blocker.next_attempt_at
+            message.save(update_fields=['next_attempt_at'])
+            continue
+        try:
+            ok = deliver(message)
+            error = '' if ok else 'delivery returned failure'
+        except Exception as e:
+            logger.exception("Outbox delivery raised for #%s", message.pk)
+            ok, error = False, str(e)
+
+        message.attempts += 1
+        if ok:
+            message.status = 'sent'
+            message.sent_at = timezone.now()
+            message.last_error = ''
+            sent += 1
+        else:
+            failed += 1
+            message.last_error = error
+            if message.attempts >= MAX_ATTEMPTS:
+                message.status = 'failed'
+                logger.error("Giving up on outbox #%s after %s attempts", message.pk, message.attempts)
+            else:
+                message.next_attempt_at = timezone.now() + backoff(message.attempts)
+                if key and key not in waiting:
+                    waiting[key] = message
+        message.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+    return sent, failed
@@ -0,0 +1,179 @@
+"""
+Full-text search over customer records.
+
+Orders and the four request types are indexed in the ``shop_search`` FTS5
+table (names, email, phone, address, notes/message), kept in sync by triggers
+from migration 0028. Each row's rowid is ``pk * STRIDE + kind``, so one MATCH
+finds a customer across every model and a hit maps back to its record without
+a join. Results come back best match first (FTS5's bm25 ``rank``).
+
+SQLite drops a table's triggers when a migration rebuilds the table (most
+``AlterField``s do), so ``ensure_triggers`` puts back any that are missing,
+and reindexes that table, after every ``migrate``.
+
+Search terms are split into words and each word is matched as a prefix, all
+words required: "jane tall" finds Jane Doe in Tallahassee. Phones are indexed
+as typed, as bare digits and as their last seven digits, so "555-1234",
+"5551234" and "8505551234" all find "(850) 555-1234" and "850.555.1234". On
+databases other than SQLite there is no index and callers fall back to the
+admin's ``icontains`` search.
+"""
+
+import re
+
+from django.db import connection, connections
+from django.db.models import Case, IntegerField, When
+
+from shop.models import BeeRemovalRequest, CallbackRequest, NukeRequest, Order, PollinationRequest
+
+STRIDE = 8
+KINDS = {
+    1: Order,
+    2: NukeRequest,
+    3: PollinationRequest,
+    4: BeeRemovalRequest,
+    5: CallbackRequest,
+}
+KIND_OF = {model: kind for kind, model in KINDS.items()}
+
+# Indexed fields per model, as in migration 0028. ``ensure_triggers`` only adds
+# missing triggers, so changing these needs a migration that drops the old ones.
+INDEXED_FIELDS = {
+    Order: ['first_name', 'last_name', 'email', 'phone', 'address', 'city', 'zip_code', 'notes'],
+    NukeRequest: ['first_name', 'last_name', 'email', 'phone', 'address', 'city', 'zip_code', 'notes'],
+    PollinationRequest: [
+        'first_name', 'last_name', 'email', 'phone', 'property_address', 'city', 'zip_code', 'notes',
+    ],
+    BeeRemovalRequest: [
+        'first_name', 'last_name', 'email', 'phone', 'property_address', 'city', 'zip_code', 'notes',
+    ],
+    CallbackRequest: ['name', 'phone', 'email', 'message'],
+}
+TRIGGER_SUFFIXES = ('ai', 'au', 'ad')
+
+# Admin searches keep this many best matches; more than a few pages of hits
+# means the term needs narrowing, not scrolling.
+MAX_RESULTS = 500
+
+WORD = re.compile(r'[^\W_]+')
+PHONE = re.compile(r'[\d\s().+-]+')
+
+
+def available():
+    return connection.vendor == 'sqlite'
+
+
+def match_expression(text):
+    """FTS5 query for ``text``: every word as a quoted prefix term, or '' when
+    there are no words. Quoting keeps user input out of FTS5's query syntax.
+    A phone-shaped term of seven or more digits ("555-1234") is matched as one
+    run of digits against the digits-only copies of each phone, which also
+    finds phones typed without separators and skips ranking every record
+    with a "555" in it."""
+    words = WORD.findall(text)
+    digits = ''.join(words)
+    if len(digits) >= 7 and PHONE.fullmatch(text):
+        return f'"{digits}"*'
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _ranked_rowids(text, kind=None, limit=MAX_RESULTS):
+    sql = 'SELECT rowid FROM shop_search WHERE shop_search MATCH %s'
+    params = [match_expression(text)]
+    if kind is not None:
+        sql += ' AND rowid %% %s = %s'
+        params += [STRIDE, kind]
+    sql += ' ORDER BY rank LIMIT %s'
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [rowid for (rowid,) in cursor.fetchall()]
+
+
+def ranked_ids(model, text, limit=MAX_RESULTS):
+    """Primary keys of ``model`` matching ``text``, best first; None when the
+    index can't answer (not SQLite, model not indexed, no words in ``text``)."""
+    if not available() or model not in KIND_OF or not match_expression(text):
+        return None
+    return [rowid // STRIDE for rowid in _ranked_rowids(text, KIND_OF[model], limit)]
+
+
+def rank_order(ids):
+    """An ``order_by`` expression putting ``ids`` in the given order."""
+    return Case(*(When(pk=pk, then=position) for position, pk in enumerate(ids)), output_field=IntegerField())
+
+
+def search(text, limit=50):
+    """Every order and request matching ``text`` (a phone number, email,
+    name…), best match first: one FTS query plus one query per model hit."""
+    if not available() or not match_expression(text):
+        return []
+    hits = []
+    for rowid in _ranked_rowids(text, limit=limit):
+        pk, kind = divmod(rowid, STRIDE)
+        hits.append((kind, pk))
+    by_kind = {}
+    for kind, pk in hits:
+        by_kind.setdefault(kind, []).append(pk)
+    found = {
+        (kind, obj.pk): obj
+        for kind, pks in by_kind.items()
+        for obj in KINDS[kind].objects.filter(pk__in=pks)
+    }
+    return [found[hit] for hit in hits if hit in found]
+
+
+def _digits(ref):
+    expr = ref
+    for char in '()-. +':
+        expr = f"replace({expr}, '{char}', '')"
+    return expr
+
+
+def _body(row, columns):
+    digits = _digits(f'{row}.phone')
+    parts = [f"ifnull({row}.{column}, '')" for column in columns] + [digits, f'substr({digits}, -7)']
+    return " || ' ' || ".join(parts)
+
+
+def index_statements(model):
+    """``(backfill, triggers)`` SQL indexing ``model``'s table: an INSERT of
+    every row, and the insert/update/delete triggers (``IF NOT EXISTS``)."""
+    table = model._meta.db_table
+    columns = [model._meta.get_field(name).column for name in INDEXED_FIELDS[model]]
+    key = f'{{row}}.id * {STRIDE} + {KIND_OF[model]}'
+    new = f'INSERT INTO shop_search (rowid, body) VALUES ({key.format(row="new")}, {_body("new", columns)});'
+    old = f'DELETE FROM shop_search WHERE rowid = {key.format(row="old")};'
+    backfill = (
+        f'INSERT INTO shop_search (rowid, body) SELECT {key.format(row=table)}, {_body(table, columns)} FROM {table}'
+    )
+    return backfill, [
+        f'CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN {new} END',
+        f'CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {", ".join(columns)} ON {table} '
+        f'BEGIN {old} {new} END',
+        f'CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN {old} END',
+    ]
+
+
+def ensure_triggers(using='default'):
+    """Recreate the index triggers a table rebuild dropped. Rows written while a
+    table had no triggers were missed, so its part of the index is rebuilt
+    too. Returns the models reindexed; a no-op before migration 0028."""
+    db = connections[using]
+    if db.vendor != 'sqlite' or 'shop_search' not in db.introspection.table_names():
+        return []
+    reindexed = []
+    with db.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {name for (name,) in cursor.fetchall()}
+        for kind, model in KINDS.items():
+            table = model._meta.db_table
+            if all(f'{table}_search_{suffix}' in existing for suffix in TRIGGER_SUFFIXES):
+                continue
+            backfill, triggers = index_statements(model)
+            cursor.execute('DELETE FROM shop_search WHERE rowid %% %s = %s', [STRIDE, kind])
+            cursor.execute(backfill)
+            for statement in triggers:
+                cursor.execute(statement)
+            reindexed.append(model)
+    return reindexed
@@ -0,0 +1,156 @@
+"""
+Pooled Slack Web API client.
+
+Every Slack helper in ``notifications`` goes through one ``SlackClient`` per
+process, which owns a keep-alive ``requests.Session``. Reusing the session's
+connection pool means only the first call pays the TCP + TLS handshake to
+slack.com; a status change that makes several calls in a row reuses the same
+socket.
+
+The client also centralises what every helper used to repeat: the bot-token
+auth header, the timeout, and turning transport errors and ``ok: false``
+replies into a logged ``None``. The shared client reports transport failures to
+the ``slack`` circuit breaker (see ``circuit``) and fails fast while it's open.
+"""
+
+import logging
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from shop.services.circuit import CircuitOpen, get_breaker
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://slack.com/api/"
+DEFAULT_TIMEOUT = 5
+DEFAULT_POOL_SIZE = 4
+
+
+class SlackRateLimited(Exception):
+    """Slack answered HTTP 429. ``retry_after`` is its Retry-After, in seconds."""
+
+    def __init__(self, method, retry_after):
+        super().__init__(f"Slack {method} rate limited (retry after {retry_after}s)")
+        self.method = method
+        self.retry_after = retry_after
+
+
+class SlackClient:
+    """Thin wrapper over a pooled ``requests.Session`` for the Slack Web API."""
+
+    def __init__(self, token=None, base_url=API_URL, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                 breaker=None):
+        self._token = token
+        self.breaker = breaker
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @property
+    def token(self):
+        # Read lazily so settings overrides (and tests) are honoured.
+        return self._token if self._token is not None else getattr(settings, 'SLACK_BOT_TOKEN', '')
+
+    def _headers(self):
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def call(self, method, payload=None, http_method="POST", ok_errors=frozenset()):
+        """Call a Web API method. Returns the decoded response on ``ok`` (or an
+        error listed in ``ok_errors``), otherwise logs and returns None.
+
+        Raises ``SlackRateLimited`` on HTTP 429 so the dispatcher (see
+        ``slack_dispatch``) can back off and retry rather than lose the call,
+        and ``CircuitOpen`` without calling out while Slack is known to be down."""
+        url = f"{self.base_url}{method}"
+        self._check_breaker()
+        response = None
+        try:
+            if http_method == "GET":
+                response = self.session.get(url, headers=self._headers(), params=payload, timeout=self.timeout)
+            else:
+                response = self.session.post(url, headers=self._headers(), json=payload, timeout=self.timeout)
+            self._record(response)
+            if response.status_code == 429:
+                raise SlackRateLimited(method, _retry_after(response))
+            response.raise_for_status()
+            data = response.json()
+        except SlackRateLimited:
+            raise
+        except Exception as e:
+            if response is None:
+                self._record(None)
+            logger.error(f"Failed Slack {method}: {e}")
+            return None
+        if data.get("ok") or data.get("error") in ok_errors:
+            return data
+        logger.error("Slack %s error: %s", method, data.get("error"))
+        return None
+
+    def post_webhook(self, url, payload):
+        """POST to an incoming webhook (no bot token). Returns True on 2xx."""
+        try:
+            self._check_breaker()
+        except CircuitOpen as e:
+            logger.error(f"Failed to send Slack notification: {e}")
+            return False
+        response = None
+        try:
+            response = self.session.post(url, json=payload, timeout=self.timeout)
+            self._record(response)
+            response.raise_for_status()
+        except Exception as e:
+            if response is None:
+                self._record(None)
+            logger.error(f"Failed to send Slack notification: {e}")
+            return False
+        return True
+
+    def _check_breaker(self):
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpen(self.breaker.name)
+
+    def _record(self, response):
+        """Report the outcome to the breaker: no response (timeout, connection
+        error) or a 5xx counts against Slack; anything else means it's up."""
+        if self.breaker is None:
+            return
+        status = getattr(response, 'status_code', None)
+        if response is None or (isinstance(status, int) and status >= 500):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def close(self):
+        self.session.close()
+
+
+def _retry_after(response):
+    try:
+        return max(float(response.headers.get("Retry-After", 1)), 0.0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, created on first use (after gunicorn forks, so
+    workers never share sockets)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SlackClient(
+                    pool_size=getattr(settings, 'SLACK_HTTP_POOL_SIZE', DEFAULT_POOL_SIZE),
+                    timeout=getattr(settings, 'SLACK_HTTP_TIMEOUT', DEFAULT_TIMEOUT),
+                    breaker=get_breaker('slack'),
+                )
+    return _client
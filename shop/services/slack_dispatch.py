@@ -0,0 +1,253 @@
+"""
+Rate-limit-aware Slack dispatcher.
+
+Slack rate-limits each Web API method by tier (``chat.update`` and
+``reactions.add`` are Tier 3, ``reactions.remove`` Tier 2, ``chat.postMessage``
+roughly one per second per channel). A busy admin session of ``list_editable``
+status edits can exceed that, and a 429 used to be logged and the update lost.
+
+Every helper in ``notifications`` now calls through ``get_dispatcher()``:
+
+  * Each method gets its own token bucket sized to its tier, so we pace
+    ourselves instead of waiting for Slack to push back.
+  * A 429's ``Retry-After`` pauses that method's bucket and the call is retried
+    in-process if the wait is short enough.
+  * A write that still can't go out is queued on the notification outbox
+    (``kind='slack_api'``) for the relay to replay later; only reads, which are
+    useless once stale, are dropped.
+
+The same give-up path handles the ``slack`` circuit breaker being open (see
+``circuit``): writes are queued rather than waiting on a dead connection.
+
+Bulk status changes skip the inline attempt altogether: inside
+``queue_writes`` every write goes straight to the outbox in one insert.
+
+``stats`` counts throttled, retried, short-circuited, queued and dropped calls.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from shop.services.circuit import CircuitOpen
+from shop.services.slack_client import SlackRateLimited, get_client
+
+logger = logging.getLogger(__name__)
+
+# (calls per minute, burst) per method. Tiers from api.slack.com/docs/rate-limits;
+# chat.postMessage is the "special" ~1/sec/channel limit.
+TIER_2 = (20, 3)
+TIER_3 = (50, 5)
+METHOD_LIMITS = {
+    'chat.postMessage': (60, 5),
+    'chat.update': TIER_3,
+    'reactions.add': TIER_3,
+    'reactions.remove': TIER_2,
+    'reactions.get': TIER_3,
+    'conversations.history': TIER_3,
+}
+DEFAULT_LIMIT = TIER_3
+
+# Writes worth replaying later; reads are dropped when they can't be served.
+DEFERRABLE_METHODS = {'chat.postMessage', 'chat.update', 'reactions.add', 'reactions.remove'}
+
+# What a write handed to the outbox by ``queue_writes`` returns: accepted for
+# delivery, so callers treat it as sent.
+QUEUED = {'ok': True, 'queued': True}
+
+DEFAULT_MAX_WAIT = 3.0
+DEFAULT_MAX_RETRIES = 2
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens/second refill, up to ``capacity``."""
+
+    def __init__(self, per_minute, capacity, clock=time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated = clock()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, returning how many seconds the caller must wait before
+        using it (0 when one is available now)."""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.paused_until - now)
+
+    def refund(self):
+        """Give back a reserved token that wasn't used."""
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def pause(self, seconds):
+        """Hold the bucket for ``seconds`` (Slack's Retry-After)."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class DispatchStats:
+    FIELDS = ('calls', 'throttled', 'rate_limited', 'retried', 'short_circuited', 'queued', 'dropped')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counts = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, field):
+        with self.lock:
+            self.counts[field] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counts)
+
+
+class SlackDispatcher:
+    def __init__(self, client=None, max_wait=None, max_retries=None, sleep=time.sleep, clock=time.monotonic):
+        self._client = client
+        self.max_wait = max_wait if max_wait is not None else getattr(
+            settings, 'SLACK_RATE_LIMIT_MAX_WAIT', DEFAULT_MAX_WAIT)
+        self.max_retries = max_retries if max_retries is not None else DEFAULT_MAX_RETRIES
+        self.sleep = sleep
+        self.clock = clock
+        self.buckets = {}
+        self.buckets_lock = threading.Lock()
+        self.stats = DispatchStats()
+
+    @property
+    def client(self):
+        return self._client or get_client()
+
+    def bucket(self, method):
+        with self.buckets_lock:
+            if method not in self.buckets:
+                per_minute, burst = METHOD_LIMITS.get(method, DEFAULT_LIMIT)
+                self.buckets[method] = TokenBucket(per_minute, burst, clock=self.clock)
+            return self.buckets[method]
+
+    def call(self, method, payload=None, http_method="POST", ok_errors=frozenset(), defer=True):
+        """Rate-limited ``SlackClient.call``. Returns the response data, or None
+        if the call failed, was queued for later or was dropped.
+
+        ``defer=False`` opts out of queuing (for callers like the outbox relay
+        that already retry on their own). Inside ``queue_writes`` deferrable
+        writes skip Slack entirely and return ``QUEUED``."""
+        self.stats.incr('calls')
+        batch = getattr(_local, 'batch', None)
+        if batch is not None and defer and http_method == "POST" and method in DEFERRABLE_METHODS:
+            batch.append({'method': method, 'args': payload, 'ok_errors': sorted(ok_errors)})
+            self.stats.incr('queued')
+            return QUEUED
+        bucket = self.bucket(method)
+        for attempt in range(self.max_retries + 1):
+            wait = bucket.reserve()
+            if wait > self.max_wait:
+                bucket.refund()
+                break
+            if wait > 0:
+                self.stats.incr('throttled')
+                self.sleep(wait)
+            try:
+                return self.client.call(method, payload, http_method=http_method, ok_errors=ok_errors)
+            except SlackRateLimited as e:
+                self.stats.incr('rate_limited')
+                bucket.pause(e.retry_after)
+                logger.warning("Slack %s rate limited; Retry-After %ss", method, e.retry_after)
+                if attempt < self.max_retries and e.retry_after <= self.max_wait:
+                    self.stats.incr('retried')
+                    continue
+                break
+            except CircuitOpen:
+                bucket.refund()
+                self.stats.incr('short_circuited')
+                break
+        return self._give_up(method, payload, http_method, ok_errors, defer)
+
+    def _give_up(self, method, payload, http_method, ok_errors, defer):
+        if defer and http_method == "POST" and method in DEFERRABLE_METHODS:
+            deferred = {'method': method, 'args': payload, 'ok_errors': sorted(ok_errors)}
+            sink = getattr(_local, 'deferred', None)
+            if sink is not None:
+                sink.append(deferred)
+            else:
+                queue_deferred([deferred])
+            self.stats.incr('queued')
+            logger.info("Queued Slack %s for the relay", method)
+        else:
+            self.stats.incr('dropped')
+            logger.error("Dropped Slack %s (rate limited or circuit open)", method)
+        return None
+
+
+_local = threading.local()
+
+
+@contextmanager
+def capture_deferred():
+    """Collect the writes the dispatcher would queue on the outbox in this
+    thread instead of writing them, and yield them as a list for the caller to
+    pass to ``queue_deferred``. Used by worker threads, which must not touch the
+    database while the thread that started them may hold SQLite's write lock."""
+    sink = []
+    previous = getattr(_local, 'deferred', None)
+    _local.deferred = sink
+    try:
+        yield sink
+    finally:
+        _local.deferred = previous
+
+
+def queue_deferred(calls):
+    """Queue Slack API writes on the outbox for the relay to replay, in order."""
+    from shop.models import OutboxMessage
+    OutboxMessage.objects.bulk_create([OutboxMessage(kind='slack_api', payload=payload) for payload in calls])
+
+
+@contextmanager
+def queue_writes():
+    """Hand every deferrable Slack write made in this thread to the outbox
+    relay instead of sending it, with one bulk insert on exit. For bulk status
+    changes, where hundreds of calls would otherwise be made (and rate limited)
+    inline; the relay sends them oldest first, in order per message. Reads
+    still go out."""
+    batch = []
+    previous = getattr(_local, 'batch', None)
+    _local.batch = batch
+    try:
+        yield batch
+    finally:
+        _local.batch = previous
+    queue_deferred(batch)
+
+
+def is_queueing():
+    """Whether this thread is inside ``queue_writes``."""
+    return getattr(_local, 'batch', None) is not None
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """The process-wide dispatcher (one set of buckets per process)."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = SlackDispatcher()
+    return _dispatcher
@@ -18,14 +18,33 @@ Resolution rule (per model), given the reactions currently on the message:
 Slack's reaction events only carry the channel + message ts, so we resolve the
 target through the ``SlackMessage`` mapping written when the notification was
 posted (see ``notifications.post_message``).
+
+Rather than a ``reactions.get`` round trip per event, each ``SlackMessage``
+keeps a local projection of its reactions, updated from the add/remove deltas,
+and the resolver runs against that. The projection is rebased from
+``reactions.get`` when it's stale, and in bulk from the channel history by
+``manage.py reconcile_slack_reactions``, which keeps resolution self-healing if
+an event is missed or arrives out of order.
+
+The events endpoint doesn't run any of this inline: it stores the delivery as a
+``SlackEvent`` and acks, and ``process_pending_events`` (run by
+``manage.py process_slack_events``) applies them in order per message,
+coalescing a burst of reactions on one message into a single resolution. Slack
+redelivers events it thinks we missed (same ``event_id``, with an
+``X-Slack-Retry-Num`` header); ``accept_event`` drops those before any work.
 """
 
 import hashlib
 import hmac
 import logging
+import threading
 import time
+from collections import OrderedDict, defaultdict
+from datetime import timedelta
 
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 
 from shop.models import (
     BeeRemovalRequest,
@@ -33,12 +52,20 @@ from shop.models import (
     NukeRequest,
     Order,
     PollinationRequest,
+    SlackEvent,
     SlackMessage,
 )
-from shop.services.notifications import get_message_reactions, post_thread_reply
+from shop.services.db import retry_on_locked
+from shop.services.notifications import (
+    get_channel_history,
+    get_message_reaction_users,
+    post_thread_reply,
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_EVENT_RETENTION = 60 * 60 * 24
+
 # Per model: an ordered progression of (reaction name, status) from least to
 # most advanced, plus terminal off-ramp reactions that override the progression
 # whenever present. Reaction names are Slack's, without the surrounding colons.
@@ -93,6 +120,14 @@ def known_reactions(flow):
     return {name for name, _ in flow['progression']} | set(flow['terminal'])
 
 
+def allowed_statuses(model):
+    """Every status ``model`` can be put in from Slack, default first."""
+    flow = STATUS_FLOW.get(model)
+    if not flow:
+        return []
+    return [flow['default']] + [status for _, status in flow['progression']] + list(flow['terminal'].values())
+
+
 def status_to_reaction(model):
     """Reverse of the flow: status value -> the reaction name that represents
     it (for the bot's status cue). The default status (pending) maps to nothing."""
@@ -146,64 +181,384 @@ def verify_signature(request):
 
 def handle_event(payload):
     """Process an ``event_callback`` payload. Returns the target object when a
-    reaction event was for one of our messages, else None. Never raises — the
-    event endpoint must always return 200 so Slack stops retrying."""
+    reaction event was for one of our messages, else None. Never raises; use
+    ``apply_event`` where a failure should be retried."""
     try:
-        event = payload.get('event') or {}
-        if event.get('type') not in ('reaction_added', 'reaction_removed'):
-            return None
-
-        # Ignore the bot's own reactions (its status cue) so admin-driven
-        # changes don't echo back through the resolver and fight themselves.
-        bot_user = getattr(settings, 'SLACK_BOT_USER_ID', '')
-        if bot_user and event.get('user') == bot_user:
-            return None
-
-        allowed = getattr(settings, 'SLACK_ALLOWED_REACTORS', [])
-        if allowed and event.get('user') not in allowed:
-            logger.info("Ignoring Slack reaction from unlisted user %s", event.get('user'))
-            return None
-
-        item = event.get('item') or {}
-        if item.get('type') != 'message':
-            return None
-        ts = item.get('ts')
-        channel = item.get('channel')
-        if not ts:
-            return None
-
-        # The mapping only exists for messages we posted, which inherently
-        # scopes this to our own notification channel.
-        link = SlackMessage.objects.filter(ts=ts).select_related('content_type').first()
-        if link is None:
-            return None
-        target = link.target
-        if target is None:
-            return None
-        flow = STATUS_FLOW.get(type(target))
-        if not flow:
-            return None
-
-        # Skip the API round-trip for emojis outside this model's vocabulary —
-        # they can't change the resolved status.
-        if event.get('reaction') not in known_reactions(flow):
-            return target
-
-        channel = channel or link.channel
-        present = get_message_reactions(channel, ts)
-        new_status = resolve_status(flow, present)
-
-        # Idempotent: only persist + confirm when the resolved status changed.
-        if target.status != new_status:
-            target.status = new_status
-            # Tell the post_save sync this change came from Slack, so it stamps
-            # the message but doesn't redundantly re-drive the bot's cue.
-            target._status_change_source = 'slack'
-            target.save(update_fields=['status', 'updated_at'])
-            post_thread_reply(
-                channel, ts, f"{target} → *{target.get_status_display()}*"
-            )
-        return target
+        return apply_event(payload)
     except Exception:
         logger.exception("Failed to handle Slack event")
         return None
+
+
+def apply_event(payload):
+    """``handle_event`` without the safety net: exceptions propagate so the
+    background worker can record them and retry the event."""
+    event = _reaction_event(payload)
+    if event is None:
+        return None
+    loaded = _load_link(event['ts'])
+    if loaded is None:
+        return None
+    link, target, flow = loaded
+    # Emojis outside this model's vocabulary can't change the resolved status,
+    # so they're neither tracked nor resolved.
+    if event['reaction'] not in known_reactions(flow):
+        return target
+    eligible = _apply_delta(link, event)
+    link.save(update_fields=['reactions', 'reactions_synced_at'])
+    if not eligible:
+        return None
+    apply_resolved_status(link, target, flow)
+    return target
+
+
+def _reaction_event(payload):
+    """The ``reaction_added``/``reaction_removed`` event on a message carried by
+    ``payload``, or None for anything else."""
+    event = payload.get('event') or {}
+    if event.get('type') not in ('reaction_added', 'reaction_removed'):
+        return None
+    item = event.get('item') or {}
+    if item.get('type') != 'message' or not item.get('ts'):
+        return None
+    return {
+        'ts': item['ts'],
+        'channel': item.get('channel') or '',
+        'reaction': event.get('reaction'),
+        'user': event.get('user') or '',
+        'added': event['type'] == 'reaction_added',
+    }
+
+
+def _load_link(ts):
+    """``(link, target, flow)`` for the notification posted at ``ts``, or None.
+    The mapping only exists for messages we posted, which inherently scopes this
+    to our own notification channel."""
+    return _load_links([ts]).get(ts)
+
+
+def _load_links(ts_values):
+    """``{ts: (link, target, flow)}`` for the notifications posted at
+    ``ts_values``, with every target fetched in one query per content type."""
+    links = SlackMessage.objects.filter(ts__in=set(ts_values)).with_targets()
+    return {link.ts: (link, target, flow) for link, target, flow in _with_targets(links)}
+
+
+def _apply_delta(link, event):
+    """Apply one reaction event to ``link``'s projection (rebasing it first if
+    stale); the caller saves. Every reaction is part of the set, as
+    reactions.get would report it; returns whether this one may drive a status
+    change."""
+    eligible = may_drive_status(event['user'])
+    if eligible and _projection_is_stale(link):
+        _rebase_reactions(link, event['channel'])
+    link.apply_reaction(event['reaction'], event['user'], added=event['added'])
+    return eligible
+
+
+def may_drive_status(user):
+    """Whether Slack user ``user`` may change statuses (``SLACK_ALLOWED_REACTORS``).
+    The bot's own reactions (its status cue) never do, so admin-driven changes
+    don't echo back through the resolver and fight themselves."""
+    bot_user = getattr(settings, 'SLACK_BOT_USER_ID', '')
+    if bot_user and user == bot_user:
+        return False
+    allowed = getattr(settings, 'SLACK_ALLOWED_REACTORS', [])
+    if allowed and user not in allowed:
+        logger.info("Ignoring Slack reaction from unlisted user %s", user)
+        return False
+    return True
+
+
+def apply_resolved_status(link, target, flow):
+    """Resolve ``target``'s status from ``link``'s reaction projection and, if
+    it changed, persist it and confirm in-thread. Returns True on a change."""
+    new_status = resolve_status(flow, link.reaction_names())
+    # Idempotent: only persist + confirm when the resolved status changed.
+    if target.status == new_status:
+        return False
+    target.status = new_status
+    # Tell the post_save sync this change came from Slack, so it stamps
+    # the message but doesn't redundantly re-drive the bot's cue.
+    target._status_change_source = 'slack'
+    target.save(update_fields=['status', 'updated_at'])
+    post_thread_reply(
+        link.channel, link.ts, f"{target} → *{target.get_status_display()}*"
+    )
+    return True
+
+
+# =============================================================================
+# Reaction projection upkeep
+# =============================================================================
+
+DEFAULT_RECONCILE_SECONDS = 60 * 60
+
+
+def _projection_is_stale(link):
+    max_age = getattr(settings, 'SLACK_REACTION_RECONCILE_SECONDS', DEFAULT_RECONCILE_SECONDS)
+    return link.reactions_synced_at is None or (
+        timezone.now() - link.reactions_synced_at > timedelta(seconds=max_age)
+    )
+
+
+def _rebase_reactions(link, channel=None):
+    """Replace the projection with Slack's live state (``reactions.get``).
+    Returns False, leaving the projection as it was, if Slack couldn't be read."""
+    live = get_message_reaction_users(channel or link.channel, link.ts)
+    if live is None:
+        return False
+    link.reactions = live
+    link.reactions_synced_at = timezone.now()
+    return True
+
+
+def is_open(target, flow):
+    """Whether ``target`` hasn't reached a final status (its terminal off-ramp
+    or the last progression stage)."""
+    closed = set(flow['terminal'].values()) | {flow['progression'][-1][1]}
+    return target.status not in closed
+
+
+def _with_targets(links):
+    """Yield ``(link, target, flow)`` for the ``links`` whose target still
+    exists and has a status flow. Pass a ``with_targets()`` queryset so the
+    targets are fetched in bulk."""
+    for link in links:
+        target = link.target
+        flow = STATUS_FLOW.get(type(target))
+        if target is not None and flow:
+            yield link, target, flow
+
+
+def reconcile_recent(since, include_closed=False):
+    """Resync the reaction projections of messages posted since ``since``
+    against Slack and re-resolve their targets' statuses, healing any missed
+    reaction events.
+
+    Rather than a ``reactions.get`` per message, this pages through each
+    channel's ``conversations.history`` (reactions come inline, hundreds of
+    messages per call) from the oldest message that needs checking, and joins
+    the pages against the links in memory. Only records that are still open are
+    checked unless ``include_closed``. Returns ``{'pages', 'checked',
+    'changed'}`` counts."""
+    result = {'pages': 0, 'checked': 0, 'changed': 0}
+    links = SlackMessage.objects.filter(created_at__gte=since).with_targets()
+    by_channel = defaultdict(dict)
+    for link, target, flow in _with_targets(links):
+        if include_closed or is_open(target, flow):
+            by_channel[link.channel][link.ts] = (link, target, flow)
+
+    for channel, entries in by_channel.items():
+        synced = []
+        cursor = None
+        while True:
+            page = get_channel_history(channel, min(entries, key=float), cursor)
+            if page is None:
+                # Slack unavailable: whatever wasn't reached waits for the next run.
+                logger.warning("Stopped reconciling %s after %s page(s)", channel, result['pages'])
+                break
+            result['pages'] += 1
+            reactions, cursor = page
+            now = timezone.now()
+            for ts, live in reactions.items():
+                if ts in entries:
+                    link = entries[ts][0]
+                    link.reactions = live
+                    link.reactions_synced_at = now
+                    synced.append(entries[ts])
+            if not cursor:
+                break
+
+        SlackMessage.objects.bulk_update(
+            [link for link, _target, _flow in synced], ['reactions', 'reactions_synced_at'], batch_size=500,
+        )
+        for link, target, flow in synced:
+            result['checked'] += 1
+            if apply_resolved_status(link, target, flow):
+                result['changed'] += 1
+    return result
+
+
+# =============================================================================
+# Accepting deliveries (deduplicated)
+# =============================================================================
+
+class RecentEventIds:
+    """Bounded, thread-safe LRU of event ids this process has accepted, with
+    hit/miss counters. Sits in front of the ``SlackEvent`` unique constraint so
+    most redeliveries are rejected without touching the database."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.ids = OrderedDict()
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.ids.clear()
+            self.counts = {'lru_hits': 0, 'db_hits': 0, 'misses': 0}
+
+    def seen(self, event_id):
+        with self.lock:
+            if event_id in self.ids:
+                self.ids.move_to_end(event_id)
+                self.counts['lru_hits'] += 1
+                return True
+            return False
+
+    def add(self, event_id):
+        with self.lock:
+            self.ids[event_id] = True
+            self.ids.move_to_end(event_id)
+            while len(self.ids) > self.maxsize:
+                self.ids.popitem(last=False)
+
+    def incr(self, field):
+        with self.lock:
+            self.counts[field] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counts)
+
+
+recent_events = RecentEventIds()
+
+
+@retry_on_locked
+def accept_event(payload, retry_num=0):
+    """Store an ``event_callback`` for the worker unless it's a redelivery of an
+    event already accepted (same ``event_id``). Returns True if stored."""
+    event_id = payload.get('event_id') or ''
+    if event_id and recent_events.seen(event_id):
+        return False
+    try:
+        with transaction.atomic():
+            SlackEvent.from_payload(payload, retry_num=retry_num)
+    except IntegrityError:
+        # Accepted earlier (by another worker, or before this LRU was warm).
+        recent_events.incr('db_hits')
+        recent_events.add(event_id)
+        return False
+    recent_events.incr('misses')
+    if event_id:
+        recent_events.add(event_id)
+    return True
+
+
+def purge_old_events(max_age=None):
+    """Delete settled events older than ``SLACK_EVENT_RETENTION`` (seconds).
+    Slack stops redelivering within the hour, so past that their ids no longer
+    need guarding. Returns the number of rows deleted."""
+    if max_age is None:
+        max_age = getattr(settings, 'SLACK_EVENT_RETENTION', DEFAULT_EVENT_RETENTION)
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    deleted, _ = SlackEvent.objects.filter(
+        received_at__lt=cutoff, status__in=('processed', 'failed'),
+    ).delete()
+    return deleted
+
+
+# =============================================================================
+# Background processing of stored events
+# =============================================================================
+
+MAX_EVENT_ATTEMPTS = 5
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+# A message that keeps getting reactions is still resolved at least this often
+# (as a multiple of the debounce window), so a busy thread can't starve.
+MAX_HOLD_WINDOWS = 5
+
+
+def process_pending_events(limit=100, debounce=None):
+    """Apply stored events in arrival order. Returns ``(processed, failed)``.
+
+    Events for the same message are coalesced: a burst (❌ then ✅, several
+    emoji in a second) is held until no new event for that message has arrived
+    for ``SLACK_EVENT_DEBOUNCE_SECONDS``, then applied to the reaction
+    projection together and resolved once — one status save, one chat.update,
+    one confirmation reply. Within a burst events stay strictly ordered: if one
+    fails, later events for that ``ts`` wait for its retry rather than
+    overtaking it."""
+    if debounce is None:
+        debounce = getattr(settings, 'SLACK_EVENT_DEBOUNCE_SECONDS', DEFAULT_DEBOUNCE_SECONDS)
+    now = timezone.now()
+    settle_before = now - timedelta(seconds=debounce)
+    hold_limit = now - timedelta(seconds=debounce * MAX_HOLD_WINDOWS)
+
+    bursts = OrderedDict()
+    for stored in SlackEvent.objects.filter(status='pending').order_by('id')[:limit]:
+        key = (stored.channel, stored.ts) if stored.ts else ('', stored.pk)
+        bursts.setdefault(key, []).append(stored)
+
+    ready = [
+        events for events in bursts.values()
+        if events[-1].received_at <= settle_before or events[0].received_at <= hold_limit
+    ]
+    loaded = _load_links(stored.ts for events in ready for stored in events if stored.ts)
+
+    processed = failed = 0
+    for events in ready:
+        done, errored = _process_burst(events, loaded)
+        processed += done
+        failed += errored
+    return processed, failed
+
+
+def _process_burst(events, links):
+    """Apply one message's pending events, in order, to its reaction projection
+    and then resolve its status once. ``links`` maps ts to ``(link, target,
+    flow)`` (see ``_load_links``). Returns ``(processed, failed)``."""
+    applied = []
+    failed = 0
+    loaded = None
+    changed = resolve = False
+    for stored in events:
+        try:
+            event = _reaction_event(stored.payload)
+            if event is not None and loaded is None:
+                loaded = links.get(event['ts']) or False
+            if event is not None and loaded and event['reaction'] in known_reactions(loaded[2]):
+                resolve = _apply_delta(loaded[0], event) or resolve
+                changed = True
+        except Exception as e:
+            logger.exception("Failed to process Slack event #%s", stored.pk)
+            failed += 1
+            if _record_failure(stored, e):
+                # Later events for this message wait for this one's retry.
+                break
+            continue
+        applied.append(stored)
+
+    try:
+        if changed:
+            loaded[0].save(update_fields=['reactions', 'reactions_synced_at'])
+        if resolve:
+            apply_resolved_status(*loaded)
+    except Exception as e:
+        logger.exception("Failed to apply Slack events for message %s", events[0].ts)
+        # The deltas are idempotent, so the whole burst can be replayed.
+        for stored in applied:
+            _record_failure(stored, e)
+        return 0, failed + len(applied)
+
+    processed_at = timezone.now()
+    for stored in applied:
+        stored.attempts += 1
+        stored.status = 'processed'
+        stored.processed_at = processed_at
+        stored.save(update_fields=['status', 'attempts', 'processed_at'])
+    return len(applied), failed
+
+
+def _record_failure(stored, error):
+    """Count a failed attempt; gives up after ``MAX_EVENT_ATTEMPTS``. Returns
+    True while the event is still pending a retry."""
+    stored.attempts += 1
+    stored.last_error = str(error)
+    if stored.attempts >= MAX_EVENT_ATTEMPTS:
+        stored.status = 'failed'
+    stored.save(update_fields=['status', 'attempts', 'last_error'])
+    return stored.status == 'pending'
@@ -0,0 +1,102 @@
+"""
+Block Kit status buttons: a zero-lookup alternative to reaction-driven status.
+
+Resolving a status from reactions needs the ``SlackMessage`` mapping to find
+the target and the message's full reaction set (see ``slack_events``). With
+``SLACK_STATUS_BUTTONS`` on, ``post_message`` also attaches one button per
+status the target's ``STATUS_FLOW`` allows. Each button carries everything a
+click needs, signed so it can't be forged: ``action_id`` names the status and
+``value`` is a ``django.core.signing`` token of (model, pk, status).
+
+A click arrives at ``/slack/interactions/`` and is applied with a single
+indexed ``UPDATE`` — no mapping lookup and no outbound read. ``STATUS_FLOW``
+still decides which statuses are allowed, and ``SLACK_ALLOWED_REACTORS`` who
+may click. The re-stamped message (chat.update, keeping the buttons) is queued
+on the outbox so the interaction is acked well inside Slack's 3 seconds.
+
+The ``UPDATE`` skips ``post_save``, so a click doesn't move the bot's reaction
+cue; the stamped status line is the authoritative one, as with admin edits.
+Reactions keep working alongside buttons, and whichever happens last wins.
+"""
+
+import logging
+
+from django.apps import apps
+from django.core import signing
+from django.utils import timezone
+
+from shop.models import Order, OutboxMessage
+from shop.services.slack_events import allowed_statuses, may_drive_status
+from shop.services.slack_sync import STATUS_MARKER, status_blocks, status_line
+
+logger = logging.getLogger(__name__)
+
+ACTION_PREFIX = 'set_status:'
+SIGNING_SALT = 'shop.slack.status_button'
+
+
+def status_buttons(instance):
+    """One Block Kit button per status ``instance`` can be set to, the current
+    one highlighted. Empty for models without a ``STATUS_FLOW``."""
+    model = type(instance)
+    labels = dict(model._meta.get_field('status').choices)
+    buttons = []
+    for status in allowed_statuses(model):
+        button = {
+            "type": "button",
+            "action_id": f"{ACTION_PREFIX}{status}",
+            "text": {"type": "plain_text", "text": str(labels.get(status, status))},
+            "value": signing.dumps([model._meta.label_lower, instance.pk, status], salt=SIGNING_SALT),
+        }
+        if status == instance.status:
+            button["style"] = "primary"
+        buttons.append(button)
+    return buttons
+
+
+def apply_interaction(payload):
+    """Apply the status buttons clicked in a ``block_actions`` payload. Returns
+    how many records changed status."""
+    if payload.get('type') != 'block_actions':
+        return 0
+    user = (payload.get('user') or {}).get('id', '')
+    if not may_drive_status(user):
+        return 0
+    changed = 0
+    for action in payload.get('actions') or []:
+        action_id = action.get('action_id') or ''
+        if not action_id.startswith(ACTION_PREFIX):
+            continue
+        try:
+            label, pk, status = signing.loads(action.get('value') or '', salt=SIGNING_SALT)
+            model = apps.get_model(label)
+        except (signing.BadSignature, ValueError, TypeError, LookupError):
+            logger.warning("Ignoring Slack status button with a bad value from %s", user)
+            continue
+        if action_id != f"{ACTION_PREFIX}{status}" or status not in allowed_statuses(model):
+            logger.warning("Ignoring Slack status button for disallowed status %r", status)
+            continue
+        fields = {'status': status, 'updated_at': timezone.now()}
+        if model is Order and status != 'completed':
+            fields['archived_at'] = None  # reopened orders leave the archive, as in Order.save
+        updated = model.objects.filter(pk=pk).exclude(status=status).update(**fields)
+        if updated:
+            changed += 1
+            _queue_restamp(payload, model(pk=pk, status=status), user)
+    return changed
+
+
+def _queue_restamp(payload, instance, user):
+    """Queue a chat.update restamping the clicked message with its new status,
+    rendered from the interaction payload itself (no mapping lookup)."""
+    channel = (payload.get('channel') or {}).get('id') or (payload.get('container') or {}).get('channel_id')
+    message = payload.get('message') or {}
+    ts = message.get('ts') or (payload.get('container') or {}).get('message_ts')
+    if not (channel and ts):
+        return
+    text = (message.get('text') or '').split(STATUS_MARKER)[0] + status_line(instance, by=user)
+    args = {"channel": channel, "ts": ts, "text": text}
+    blocks = status_blocks(text, instance)
+    if blocks:
+        args["blocks"] = blocks
+    OutboxMessage.objects.create(kind='slack_api', payload={'method': 'chat.update', 'args': args, 'ok_errors': []})
@@ -14,61 +14,302 @@ into the Slack notification so the channel stays the single source of truth:
 
 Driven by a post_save signal (see ``shop.signals``). Slack-originated changes
 pass ``source='slack'`` so we stamp but skip re-driving the cue the human
-already created.
+already created. Calls that wouldn't change anything on the message are
+skipped (see ``sync_status_to_slack``).
+
+Bulk changes (admin list edits and "Mark as …" actions) go through
+``bulk_set_status`` instead, which updates and syncs a whole queryset at once.
+Their writes are queued on the outbox, and what they put on a message is only
+recorded once the relay has delivered it (``record_delivered``).
 """
 
+import hashlib
+import json
 import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
 
-from shop.models import SlackMessage
+from shop.models import Order, SlackMessage
 from shop.services.notifications import (
     add_reaction,
     post_thread_reply,
     remove_reaction,
     update_message,
 )
+from shop.services.slack_dispatch import capture_deferred, is_queueing, queue_deferred, queue_writes
 from shop.services.slack_events import status_to_reaction
 
 logger = logging.getLogger(__name__)
 
 
-def _status_line(instance):
+STATUS_MARKER = "\n\n*Status:* "
+SECTION_TEXT_LIMIT = 3000  # Block Kit section text limit
+
+
+def status_line(instance, by=None):
     name = status_to_reaction(type(instance)).get(instance.status)
     emoji = f":{name}: " if name else ""
-    return f"\n\n*Status:* {emoji}{instance.get_status_display()}"
+    line = f"{STATUS_MARKER}{emoji}{instance.get_status_display()}"
+    return f"{line} (by <@{by}>)" if by else line
+
+
+def status_blocks(text, instance):
+    """Block Kit for ``instance``'s notification: ``text`` plus one button per
+    status its ``STATUS_FLOW`` allows (see ``slack_interactions``). None unless
+    ``SLACK_STATUS_BUTTONS`` is on and the model has a flow."""
+    if not getattr(settings, 'SLACK_STATUS_BUTTONS', False) or instance.pk is None:
+        return None
+    from shop.services.slack_interactions import status_buttons
+    buttons = status_buttons(instance)
+    if not buttons:
+        return None
+    return [
+        {"type": "section", "text": {"type": "mrkdwn", "text": text[:SECTION_TEXT_LIMIT]}},
+        {"type": "actions", "elements": buttons},
+    ]
+
+
+def render_hash(text, blocks=None):
+    """Fingerprint of what a chat.update would put on the message."""
+    rendered = json.dumps([text, blocks], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(rendered.encode()).hexdigest()
 
 
 def sync_status_to_slack(instance, source=None):
-    """Reflect ``instance``'s current status onto its Slack notification(s)."""
-    links = list(
-        SlackMessage.objects.filter(
-            content_type__model=instance._meta.model_name,
-            object_id=instance.pk,
-        )
-    )
+    """Reflect ``instance``'s current status onto its Slack notification(s).
+
+    Works as a desired-state reconciler: each ``SlackMessage`` remembers a hash
+    of the text last stamped on it and the bot's current cue, and only the
+    calls needed to move from that to the desired state are made. Re-stamping
+    identical text, re-driving a cue that's already right, or re-announcing a
+    status the message already shows is skipped. The calls that remain run
+    concurrently (see ``run_concurrently``). Returns ``{'calls', 'skipped'}``
+    counts for this sync."""
+    links = list(SlackMessage.objects.for_object(instance))
+    result, dirty = _sync(instance, links, source)
+    for link, update_fields in dirty:
+        link.save(update_fields=update_fields)
+    return result
+
+
+def _sync(instance, links, source):
+    """Make the Slack calls for one record's ``links``. Returns the counts and
+    ``(link, update_fields)`` for the links the caller must save."""
+    result = {'calls': 0, 'skipped': 0}
+    dirty = []
     if not links:
-        return
+        return result, dirty
 
-    status_line = _status_line(instance)
-    target_reaction = status_to_reaction(type(instance)).get(instance.status)
+    # Writes queued for the relay haven't happened yet; record_delivered notes
+    # them once they have, so one that never lands isn't taken as done.
+    queued = is_queueing()
+    stamp = status_line(instance)
+    target_reaction = status_to_reaction(type(instance)).get(instance.status) or ''
+    bot_user = getattr(settings, 'SLACK_BOT_USER_ID', '')
 
+    # Plan every link's calls up front (main thread, reads only)…
+    plans = []
     for link in links:
-        update_message(link.channel, link.ts, f"{link.text}{status_line}")
-
+        text = f"{link.text}{stamp}"
+        blocks = status_blocks(text, instance)
+        fingerprint = render_hash(text, blocks)
+        update = link.rendered_hash != fingerprint
         # Cue is only driven for out-of-band changes; a Slack reaction already
         # placed the human's emoji.
-        if source != 'slack' and link.bot_reaction != target_reaction:
-            if link.bot_reaction:
-                remove_reaction(link.channel, link.ts, link.bot_reaction)
-            if target_reaction:
-                add_reaction(link.channel, link.ts, target_reaction)
-            link.bot_reaction = target_reaction or ''
-            link.save(update_fields=['bot_reaction'])
-
-    # A quiet heads-up in-thread when the change came from outside Slack.
+        move_cue = source != 'slack' and link.bot_reaction != target_reaction
+        remove = link.bot_reaction if move_cue else ''
+        add = target_reaction if move_cue else ''
+        result['calls'] += update + bool(remove) + bool(add)
+        result['skipped'] += not update
+        plans.append({
+            'link': link, 'text': text, 'blocks': blocks, 'fingerprint': fingerprint,
+            'update': update, 'move_cue': move_cue, 'remove': remove, 'add': add,
+        })
+
+    # A quiet heads-up in-thread when the change came from outside Slack, unless
+    # every message already showed this status (nothing new to announce).
+    announce = source != 'slack' and any(plan['update'] for plan in plans)
     if source != 'slack':
+        result['calls'] += announce
+        result['skipped'] += not announce
+
+    # …run them, one chain per link plus the reply, concurrently…
+    chains = [
+        partial(_sync_link, p['link'], p['text'], p['blocks'], p['update'], p['remove'], p['add'])
+        for p in plans
+    ]
+    if announce:
         primary = links[0]
-        post_thread_reply(
-            primary.channel,
-            primary.ts,
+        chains.append(partial(
+            post_thread_reply, primary.channel, primary.ts,
             f"{instance} → *{instance.get_status_display()}* (updated outside Slack)",
-        )
+        ))
+    outcomes = run_concurrently(chains)
+
+    # …and note what happened, back on the main thread.
+    for plan, updated in zip(plans, outcomes[:len(plans)], strict=True):
+        if queued:
+            break
+        link = plan['link']
+        update_fields = []
+        if updated:
+            link.rendered_hash = plan['fingerprint']
+            update_fields.append('rendered_hash')
+        if plan['move_cue']:
+            if bot_user and plan['remove']:
+                link.apply_reaction(plan['remove'], bot_user, added=False)
+            if bot_user and plan['add']:
+                link.apply_reaction(plan['add'], bot_user, added=True)
+            link.bot_reaction = target_reaction
+            update_fields += ['bot_reaction', 'reactions']
+        if update_fields:
+            dirty.append((link, update_fields))
+
+    logger.info(
+        "Slack sync for %s: %s call(s) made, %s skipped as no-ops",
+        instance, result['calls'], result['skipped'],
+    )
+    return result, dirty
+
+
+def bulk_set_status(queryset, status, source=None):
+    """Set ``status`` on every record in ``queryset`` and reflect the changes
+    into Slack in one batch. Returns how many records changed.
+
+    ``QuerySet.update()`` skips the ``post_save`` sync, and saving records one
+    by one (an admin list edit of 100 orders) syncs each inline. Instead this
+    makes one SELECT of the records that will change, one UPDATE, and one
+    ``SlackMessage`` fetch for all of them; the Slack calls are planned as for
+    a single sync and handed to the outbox relay in one insert (see
+    ``queue_writes``). The relay sends them oldest first, keeping each
+    message's writes in order, and only what it delivers is recorded on the
+    ``SlackMessage`` (see ``record_delivered``)."""
+    model = queryset.model
+    changed = list(queryset.exclude(status=status))
+    if not changed:
+        return 0
+    pks = [obj.pk for obj in changed]
+    fields = {'status': status, 'updated_at': timezone.now()}
+    if model is Order and status != 'completed':
+        fields['archived_at'] = None  # reopened orders leave the archive, as in Order.save
+    model.objects.filter(pk__in=pks).update(**fields)
+
+    links = defaultdict(list)
+    content_type = ContentType.objects.get_for_model(model)
+    for link in SlackMessage.objects.filter(content_type=content_type, object_id__in=pks):
+        links[link.object_id].append(link)
+
+    with queue_writes():
+        for obj in changed:
+            obj.status = status
+            obj.remember_loaded(['status'])
+            _sync(obj, links[obj.pk], source)
+    return len(changed)
+
+
+RECORDED_METHODS = {'chat.update', 'reactions.add', 'reactions.remove'}
+
+
+def record_delivered(method, args):
+    """Note a Slack write the outbox relay just delivered on the messages it
+    targets: the stamp's hash after ``chat.update``, the bot's cue after
+    ``reactions.add``/``reactions.remove``. Called from the relay's success
+    path, as queued writes aren't recorded when they're planned."""
+    channel, ts = args.get('channel'), args.get('ts') or args.get('timestamp')
+    if method not in RECORDED_METHODS or not (channel and ts):
+        return
+    bot_user = getattr(settings, 'SLACK_BOT_USER_ID', '')
+    for link in SlackMessage.objects.filter(channel=channel, ts=ts):
+        if method == 'chat.update':
+            link.rendered_hash = render_hash(args.get('text', ''), args.get('blocks'))
+            link.save(update_fields=['rendered_hash'])
+            continue
+        name = args.get('name', '')
+        if method == 'reactions.add':
+            # A second bulk change queued before the first was delivered
+            # couldn't plan removing the first's cue; do it now.
+            previous = link.bot_reaction
+            if previous and previous != name:
+                remove_reaction(channel, ts, previous)
+                if bot_user:
+                    link.apply_reaction(previous, bot_user, added=False)
+            link.bot_reaction = name
+        elif link.bot_reaction == name:
+            link.bot_reaction = ''
+        if bot_user:
+            link.apply_reaction(name, bot_user, added=method == 'reactions.add')
+        link.save(update_fields=['bot_reaction', 'reactions'])
+
+
+def _sync_link(link, text, blocks, update, remove, add):
+    """One message's calls. The stamp and the cue are independent, but the cue
+    is moved remove-then-add so the message never shows two bot cues. Returns
+    whether the stamp was applied."""
+    updated = bool(update and update_message(link.channel, link.ts, text, blocks=blocks))
+    if remove:
+        remove_reaction(link.channel, link.ts, remove)
+    if add:
+        add_reaction(link.channel, link.ts, add)
+    return updated
+
+
+# =============================================================================
+# Concurrent fan-out
+# =============================================================================
+
+DEFAULT_CONCURRENCY = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'SLACK_SYNC_CONCURRENCY', DEFAULT_CONCURRENCY),
+                    thread_name_prefix='slack-sync',
+                )
+    return _executor
+
+
+def _call_logged(chain):
+    try:
+        return chain()
+    except Exception:
+        logger.exception("Slack sync call failed")
+        return None
+
+
+def _captured(chain):
+    with capture_deferred() as deferred:
+        return _call_logged(chain), deferred
+
+
+def run_concurrently(chains):
+    """Run independent call chains (zero-argument callables) on a bounded thread
+    pool, so a sync with several linked messages costs roughly one round trip
+    instead of one per call. Returns their results in order (None for a chain
+    that raised).
+
+    Chains only talk to Slack: any write the dispatcher would queue on the
+    outbox is handed back and queued here, in the caller's thread and
+    transaction. ``SLACK_SYNC_CONCURRENCY=1`` runs everything inline."""
+    if (len(chains) <= 1 or is_queueing()
+            or getattr(settings, 'SLACK_SYNC_CONCURRENCY', DEFAULT_CONCURRENCY) <= 1):
+        return [_call_logged(chain) for chain in chains]
+    futures = [_get_executor().submit(_captured, chain) for chain in chains]
+    results = []
+    for future in futures:
+        value, deferred = future.result()
+        queue_deferred(deferred)
+        results.append(value)
+    return results
@@ -1,15 +1,25 @@
 """
-Signal wiring for outbound status sync (Django -> Slack).
+Signal wiring for outbound status sync (Django -> Slack), and for keeping the
+customer search index's triggers in place after migrations (see ``search``).
 
-We snapshot ``status`` when an instance loads (post_init) and, on save
-(post_save), fire the Slack sync only when the status actually changed. This
+Tracked models remember the ``status`` they were loaded with (see
+``TrackedFieldsMixin``) and, on save (post_save), we fire the Slack sync only
+when it actually changed. This
 catches status edits from anywhere — admin list/inline edits, the change form,
 actions, or code — not just one code path.
+
+Syncs wait for the transaction to commit (``transaction.on_commit``), so Slack
+never shows a status from a save that was rolled back, and are coalesced per
+object so several saves in one transaction send only the final status.
 """
 
 import logging
+import threading
+import weakref
+from collections import defaultdict
 
-from django.db.models.signals import post_init, post_save
+from django.db import transaction
+from django.db.models.signals import post_migrate, post_save
 
 from shop.models import (
     BeeRemovalRequest,
@@ -18,34 +28,90 @@ from shop.models import (
     Order,
     PollinationRequest,
 )
-from shop.services import slack_sync
+from shop.services import search, slack_sync
 
 logger = logging.getLogger(__name__)
 
 TRACKED_MODELS = (Order, NukeRequest, PollinationRequest, BeeRemovalRequest, CallbackRequest)
 
 
-def _remember_status(sender, instance, **kwargs):
-    instance._original_status = instance.status
-
-
 def _sync_on_status_change(sender, instance, created, **kwargs):
     source = getattr(instance, '_status_change_source', None)
-    if created:
-        instance._original_status = instance.status
-        return
-    old = getattr(instance, '_original_status', None)
-    new = instance.status
-    if old == new:
-        return
-    instance._original_status = new
-    try:
-        slack_sync.sync_status_to_slack(instance, source=source)
-    except Exception:
-        logger.exception("Failed to sync status change to Slack")
-
-
-def connect():
+    if not created and instance.field_changed('status'):
+        _schedule_sync(instance, source, instance.loaded_value('status'))
+    instance.remember_loaded(['status'])
+
+
+# =============================================================================
+# Buffering syncs until commit
+# =============================================================================
+
+_state = threading.local()
+
+
+class _PendingSyncs:
+    """Status syncs waiting for commit: one entry per object, holding its
+    latest instance, the status it had before the transaction and whether the
+    committed status must be re-read."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def add(self, instance, source, old, recheck):
+        key = (type(instance), instance.pk)
+        if key in self.entries:
+            _instance, _source, old, rechecked = self.entries[key]
+            recheck = recheck or rechecked
+        self.entries[key] = (instance, source, old, recheck)
+
+    def flush(self):
+        entries, self.entries = self.entries, {}
+        by_model = defaultdict(dict)
+        for (model, pk), entry in entries.items():
+            by_model[model][pk] = entry
+        for model, entries in by_model.items():
+            recheck = [pk for pk, entry in entries.items() if entry[3]]
+            committed = dict(model.objects.filter(pk__in=recheck).values_list('pk', 'status')) if recheck else {}
+            for pk, (instance, source, before, rechecked) in entries.items():
+                status = committed.get(pk) if rechecked else instance.status
+                # Deleted, or back where it started (e.g. pending → processing →
+                # pending): nothing for Slack to show.
+                if status is None or status == before:
+                    continue
+                instance.status = status
+                try:
+                    slack_sync.sync_status_to_slack(instance, source=source)
+                except Exception:
+                    logger.exception("Failed to sync status change to Slack")
+
+
+def _schedule_sync(instance, source, old):
+    """Buffer a status sync until the surrounding transaction commits (right
+    away under autocommit). A rolled-back save never reaches Slack, and an
+    object saved several times in one transaction is synced once, with its
+    final status."""
+    # Only the registered flush callbacks hold the buffer; once they've all run
+    # or been dropped by a rollback it's gone and the next save starts afresh.
+    pending = _state.pending() if hasattr(_state, 'pending') else None
+    if pending is None:
+        pending = _PendingSyncs()
+        _state.pending = weakref.ref(pending)
+    # Inside an atomic block a savepoint may roll back the save, so the
+    # committed status is re-read before syncing.
+    pending.add(instance, source, old, recheck=transaction.get_connection().in_atomic_block)
+    # Every save registers the flush: a savepoint rollback drops the callbacks
+    # registered under it, and any that survive must still flush. The first to
+    # run after commit empties the buffer, so the rest are no-ops.
+    transaction.on_commit(pending.flush)
+
+
+def _ensure_search_triggers(sender, using, **kwargs):
+    reindexed = search.ensure_triggers(using)
+    if reindexed:
+        logger.warning("Recreated search triggers and reindexed %s", ", ".join(m.__name__ for m in reindexed))
+
+
+def connect(app_config):
     for model in TRACKED_MODELS:
-        post_init.connect(_remember_status, sender=model, dispatch_uid='slack_remember_status')
         post_save.connect(_sync_on_status_change, sender=model, dispatch_uid='slack_sync_status')
+    post_migrate.connect(_ensure_search_triggers, sender=app_config, dispatch_uid='search_triggers')
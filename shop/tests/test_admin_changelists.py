@@ -0,0 +1,200 @@
+"""Query budgets for every admin changelist.
+
+Each changelist is rendered over 500 rows and must stay within a fixed number
+of queries: related objects come from joins or one batched prefetch, never a
+lookup per row. The keyset-paged ones cost the same on page five as on page
+one, and count their rows once per ``ADMIN_COUNT_CACHE_SECONDS``.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from shop.models import (
+    BeeRemovalRequest,
+    CallbackRequest,
+    NukeRequest,
+    Order,
+    OutboxMessage,
+    PollinationRequest,
+    Product,
+    SlackMessage,
+)
+
+ROWS = 500
+PERSON = dict(first_name="Jane", last_name="Doe", email="jane@example.com", phone="(850) 555-1234")
+
+
+class ChangelistFixtures:
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "a@example.com", "pw")
+        products = Product.objects.bulk_create([
+            Product(name=f"Honey {i}", description="d", price=Decimal("17.00"), size="Pint") for i in range(5)
+        ])
+        orders = Order.objects.bulk_create([
+            Order(
+                **PERSON, address="1 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+                product=products[i % 5], quantity=1, unit_price=Decimal("17.00"), total_price=Decimal("17.00"),
+            ) for i in range(ROWS)
+        ])
+        NukeRequest.objects.bulk_create([
+            NukeRequest(**PERSON, address="2 Hive Rd", city="Quincy", state="FL", zip_code="32351", quantity=1)
+            for _ in range(ROWS)
+        ])
+        PollinationRequest.objects.bulk_create([
+            PollinationRequest(
+                **PERSON, property_address="3 Grove Rd", city="Monticello", zip_code="32344",
+                crop_type="blueberry", acreage=Decimal("5"), preferred_start_date=date(2026, 3, 1),
+            ) for _ in range(ROWS)
+        ])
+        BeeRemovalRequest.objects.bulk_create([
+            BeeRemovalRequest(
+                **PERSON, property_address="4 Oak St", city="Tallahassee", zip_code="32301", bee_location="tree",
+            ) for _ in range(ROWS)
+        ])
+        callbacks = CallbackRequest.objects.bulk_create([
+            CallbackRequest(name=f"Pat {i}", phone="(850) 555-2222") for i in range(ROWS)
+        ])
+        order_type = ContentType.objects.get_for_model(Order)
+        callback_type = ContentType.objects.get_for_model(CallbackRequest)
+        targets = [
+            (order_type, orders[i].pk) if i % 2 else (callback_type, callbacks[i].pk) for i in range(ROWS)
+        ]
+        SlackMessage.objects.bulk_create([
+            SlackMessage(channel="C123", ts=f"{i}.1", content_type=ct, object_id=pk)
+            for i, (ct, pk) in enumerate(targets)
+        ])
+        OutboxMessage.objects.bulk_create([
+            OutboxMessage(kind="slack", payload={"text": "hi"}, content_type=ct, object_id=pk)
+            for ct, pk in targets
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+
+class ChangelistQueryBudgetTests(ChangelistFixtures, TestCase):
+    # session + user, then per page: the (cached) count, page of rows, plus any
+    # filter choices and batched related lookups (see each test). Product isn't
+    # keyset-paged and also pays the full count.
+
+    def assertChangelistWithin(self, model, budget, query=""):
+        url = reverse(f"admin:shop_{model._meta.model_name}_changelist") + query
+        with self.assertNumQueries(budget):
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.context["cl"].result_list), resp.context["cl"].list_per_page)
+
+    def test_order_changelist(self):
+        self.assertChangelistWithin(Order, 4)
+
+    def test_long_columns_are_left_for_the_change_form(self):
+        resp = self.client.get(reverse("admin:shop_order_changelist"))
+        deferred = resp.context["cl"].result_list[0].get_deferred_fields()
+        self.assertTrue({"address", "notes"} <= deferred)
+        self.assertNotIn("status", deferred)
+
+    def test_request_changelists(self):
+        for model in (NukeRequest, PollinationRequest, BeeRemovalRequest, CallbackRequest):
+            with self.subTest(model=model.__name__):
+                self.assertChangelistWithin(model, 4)
+
+    def test_slack_message_changelist(self):
+        # + content type filter choices, + one target query per content type
+        self.assertChangelistWithin(SlackMessage, 7)
+
+    def test_outbox_changelist(self):
+        # + one target query per content type
+        self.assertChangelistWithin(OutboxMessage, 6)
+
+    def test_product_changelist(self):
+        Product.objects.bulk_create([
+            Product(name=f"Gift {i}", description="d", price=Decimal("5.00"), size="Jar") for i in range(ROWS)
+        ])
+        self.assertChangelistWithin(Product, 5)
+
+
+class KeysetPaginationTests(ChangelistFixtures, TestCase):
+    url = reverse("admin:shop_callbackrequest_changelist")
+
+    def _walk(self, url):
+        """Follows next links from ``url``; returns each page's response."""
+        pages = []
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            pages.append(resp)
+            url = resp.context["cl"].next_url
+            url = url and self.url + url
+        return pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        pages = self._walk(self.url)
+        rows = [obj for resp in pages for obj in resp.context["cl"].result_list]
+        self.assertEqual(len(pages), 6)  # five full pages, then an empty one
+        self.assertEqual([obj.pk for obj in rows], list(
+            CallbackRequest.objects.order_by("-created_at", "-pk").values_list("pk", flat=True)
+        ))
+        self.assertContains(pages[1], "First page")
+        self.assertNotContains(pages[0], "First page")
+
+    def test_equal_timestamps_break_ties_on_id(self):
+        CallbackRequest.objects.update(created_at=timezone.now())
+        rows = [obj.pk for resp in self._walk(self.url) for obj in resp.context["cl"].result_list]
+        self.assertEqual(rows, sorted(rows, reverse=True))
+        self.assertEqual(len(rows), ROWS)
+
+    def test_deep_page_costs_the_same_as_page_one(self):
+        self.client.get(self.url)  # count now cached
+        with self.assertNumQueries(3) as first:
+            resp = self.client.get(self.url)
+        for _ in range(3):
+            resp = self.client.get(self.url + resp.context["cl"].next_url)
+        with self.assertNumQueries(3) as deep:
+            self.client.get(self.url + resp.context["cl"].next_url)
+        self.assertIn("LIMIT 100", deep.captured_queries[-1]["sql"])
+        self.assertNotIn("OFFSET", deep.captured_queries[-1]["sql"])
+        self.assertEqual(len(first), len(deep))
+
+    def test_count_is_cached_per_filter(self):
+        with self.assertNumQueries(4):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.context["cl"].result_count, ROWS)
+        CallbackRequest.objects.filter(pk__in=CallbackRequest.objects.all()[:10].values("pk")).delete()
+        with self.assertNumQueries(3):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.context["cl"].result_count, ROWS)  # until the cache expires
+        resp = self.client.get(self.url + "?status__exact=pending")
+        self.assertEqual(resp.context["cl"].result_count, ROWS - 10)
+
+    def test_filter_links_start_from_the_first_page(self):
+        resp = self.client.get(self.url)
+        cl = self.client.get(self.url + resp.context["cl"].next_url).context["cl"]
+        self.assertNotIn("after", cl.get_query_string({"status__exact": "done"}))
+        self.assertIn("after", cl.next_url)
+
+    def test_sorting_by_a_column_falls_back_to_numbered_pages(self):
+        resp = self.client.get(self.url + "?o=2&p=3")
+        cl = resp.context["cl"]
+        self.assertFalse(cl.keyset)
+        self.assertEqual(cl.page_num, 3)
+        self.assertEqual(len(cl.result_list), cl.list_per_page)
+
+    def test_bad_cursor_redirects_like_a_bad_filter(self):
+        resp = self.client.get(self.url + "?after=yesterday")
+        self.assertRedirects(resp, self.url + "?e=1", fetch_redirect_response=False)
+
+    def test_outbox_pages_oldest_first(self):
+        url = reverse("admin:shop_outboxmessage_changelist")
+        resp = self.client.get(url)
+        first = list(resp.context["cl"].result_list)
+        second = list(self.client.get(url + resp.context["cl"].next_url).context["cl"].result_list)
+        self.assertLess(first[-1].pk, second[0].pk)
@@ -0,0 +1,219 @@
+"""Tests for bulk status changes (slack_sync.bulk_set_status) and the admin
+paths that use it: list_editable status edits and the "Mark selected as …"
+actions. Also the SlackMessage changelist's bulk target lookup."""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from shop.models import CallbackRequest, Order, OutboxMessage, Product, SlackMessage
+from shop.services import outbox, slack_sync
+
+BOT_SETTINGS = dict(
+    SLACK_BOT_TOKEN="xoxb-test",
+    SLACK_CHANNEL="C123",
+    SLACK_BOT_USER_ID="UBOT",
+)
+
+
+@override_settings(**BOT_SETTINGS)
+class BulkSetStatusTests(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(
+            name="Wildflower Honey", description="d", price=Decimal("17.00"), size="Pint",
+        )
+
+    def _orders(self, count, linked=True):
+        orders = []
+        for i in range(count):
+            order = Order.objects.create(
+                first_name="Jane", last_name=str(i), email="jane@example.com", phone="(850) 555-1234",
+                address="1 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+                product=self.product, quantity=1,
+            )
+            if linked:
+                SlackMessage.record(channel="C123", ts=f"{i + 1}.1", obj=order, text=f"order {i}")
+            orders.append(order)
+        return orders
+
+    def _queued(self):
+        return [(m.payload["method"], m.payload["args"]) for m in OutboxMessage.objects.order_by("id")]
+
+    def test_one_update_one_link_fetch_whatever_the_size(self):
+        self._orders(3)
+        with self.assertNumQueries(4) as small:
+            slack_sync.bulk_set_status(Order.objects.all(), "processing")
+        self._orders(12)
+        with self.assertNumQueries(4):
+            # select changed, UPDATE, fetch links, queue calls
+            self.assertEqual(slack_sync.bulk_set_status(Order.objects.all(), "completed"), 15)
+        self.assertIn("UPDATE", small.captured_queries[1]["sql"])
+
+    def test_slack_work_is_queued_not_sent(self):
+        order, = self._orders(1)
+        with patch("shop.services.slack_client.requests.Session.post") as post, \
+             patch("shop.services.slack_sync.sync_status_to_slack") as per_row_sync:
+            slack_sync.bulk_set_status(Order.objects.all(), "processing")
+        post.assert_not_called()
+        per_row_sync.assert_not_called()  # QuerySet.update() → no post_save
+        order.refresh_from_db()
+        self.assertEqual(order.status, "processing")
+
+        methods = [method for method, _args in self._queued()]
+        self.assertEqual(methods, ["chat.update", "reactions.add", "chat.postMessage"])
+
+    def _relay(self, reply=None):
+        """Run the outbox relay against a Slack that accepts every write
+        (``reply`` returns None for the ones that fail). Returns the calls."""
+        calls = []
+
+        def call(method, args, **kwargs):
+            calls.append((method, args))
+            return reply(method, args) if reply else {"ok": True}
+
+        with patch("shop.services.slack_dispatch.SlackDispatcher.call", side_effect=call):
+            outbox.deliver_pending()
+        return calls
+
+    def test_link_state_is_recorded_only_once_delivered(self):
+        self._orders(1)
+        slack_sync.bulk_set_status(Order.objects.all(), "processing")
+        link = SlackMessage.objects.get()
+        self.assertEqual((link.rendered_hash, link.bot_reaction, link.reactions), ("", "", {}))
+
+        update = dict(self._queued())["chat.update"]
+        self._relay(lambda method, args: None if method == "reactions.add" else {"ok": True})
+        link.refresh_from_db()
+        self.assertEqual(link.rendered_hash, slack_sync.render_hash(update["text"], update.get("blocks")))
+        self.assertEqual(link.bot_reaction, "")  # its add is still waiting out a retry
+
+        OutboxMessage.objects.update(next_attempt_at=timezone.now())
+        self._relay()
+        link.refresh_from_db()
+        self.assertEqual(link.bot_reaction, "package")
+        self.assertEqual(link.reactions, {"package": ["UBOT"]})
+
+    def test_cue_is_queued_remove_before_add(self):
+        self._orders(1)
+        slack_sync.bulk_set_status(Order.objects.all(), "processing")
+        self._relay()
+        OutboxMessage.objects.all().delete()
+        slack_sync.bulk_set_status(Order.objects.all(), "completed")
+        cue = [(method, args["name"]) for method, args in self._queued() if method.startswith("reactions.")]
+        self.assertEqual(cue, [("reactions.remove", "package"), ("reactions.add", "white_check_mark")])
+
+    def test_changes_queued_before_delivery_leave_one_cue(self):
+        self._orders(1)
+        slack_sync.bulk_set_status(Order.objects.all(), "processing")
+        slack_sync.bulk_set_status(Order.objects.all(), "completed")
+        cue = [(method, args["name"]) for method, args in self._relay() if method.startswith("reactions.")]
+        self.assertEqual(cue, [
+            ("reactions.add", "package"), ("reactions.add", "white_check_mark"), ("reactions.remove", "package"),
+        ])
+        link = SlackMessage.objects.get()
+        self.assertEqual(link.bot_reaction, "white_check_mark")
+        self.assertEqual(link.reactions, {"white_check_mark": ["UBOT"]})
+
+    def test_records_already_in_status_are_untouched(self):
+        done, todo = self._orders(2)
+        Order.objects.filter(pk=done.pk).update(status="completed")
+        self.assertEqual(slack_sync.bulk_set_status(Order.objects.all(), "completed"), 1)
+        self.assertEqual({args["ts"] for method, args in self._queued() if method == "chat.update"}, {"2.1"})
+
+    def test_unlinked_records_still_update(self):
+        self._orders(2, linked=False)
+        self.assertEqual(slack_sync.bulk_set_status(Order.objects.all(), "cancelled"), 2)
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(set(Order.objects.values_list("status", flat=True)), {"cancelled"})
+
+
+@override_settings(**BOT_SETTINGS)
+class AdminBulkStatusTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "a@example.com", "pw")
+        self.client.force_login(self.admin)
+        product = Product.objects.create(
+            name="Wildflower Honey", description="d", price=Decimal("17.00"), size="Pint",
+        )
+        self.orders = [
+            Order.objects.create(
+                first_name="Jane", last_name=str(i), email="jane@example.com", phone="(850) 555-1234",
+                address="1 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+                product=product, quantity=1,
+            ) for i in range(3)
+        ]
+
+    def test_list_editable_save_goes_through_bulk_path(self):
+        url = reverse("admin:shop_order_changelist")
+        data = {
+            "form-TOTAL_FORMS": "3", "form-INITIAL_FORMS": "3", "_save": "Save",
+        }
+        changelist = self.client.get(url).context["cl"].result_list
+        for i, order in enumerate(changelist):
+            data[f"form-{i}-id"] = str(order.pk)
+            data[f"form-{i}-status"] = "processing" if order.pk != self.orders[0].pk else "pending"
+        with patch("shop.services.slack_sync.sync_status_to_slack") as per_row_sync, \
+             patch("shop.admin.slack_sync.bulk_set_status", wraps=slack_sync.bulk_set_status) as bulk:
+            resp = self.client.post(url, data)
+        self.assertEqual(resp.status_code, 302)
+        per_row_sync.assert_not_called()
+        bulk.assert_called_once()
+        self.assertEqual(
+            dict(Order.objects.values_list("pk", "status")),
+            {self.orders[0].pk: "pending", self.orders[1].pk: "processing", self.orders[2].pk: "processing"},
+        )
+
+    def test_mark_as_action(self):
+        url = reverse("admin:shop_order_changelist")
+        resp = self.client.post(url, {
+            "action": "mark_completed",
+            "_selected_action": [str(self.orders[0].pk), str(self.orders[1].pk)],
+        })
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(Order.objects.filter(status="completed").count(), 2)
+
+    def test_actions_follow_each_models_flow(self):
+        CallbackRequest.objects.create(name="Pat", phone="(850) 555-2222")
+        resp = self.client.get(reverse("admin:shop_callbackrequest_changelist"))
+        choices = [value for value, _label in resp.context["action_form"].fields["action"].choices]
+        self.assertIn("mark_contacted", choices)
+        self.assertNotIn("mark_cancelled", choices)
+
+
+class SlackMessageAdminTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        self.product = Product.objects.create(
+            name="Wildflower Honey", description="d", price=Decimal("17.00"), size="Pint",
+        )
+
+    def _link(self, i):
+        order = Order.objects.create(
+            first_name="Jane", last_name=str(i), email="jane@example.com", phone="(850) 555-1234",
+            address="1 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+            product=self.product, quantity=1,
+        )
+        SlackMessage.record(channel="C123", ts=f"{i + 1}.1", obj=order)
+        callback = CallbackRequest.objects.create(name=f"Pat {i}", phone="(850) 555-2222")
+        SlackMessage.record(channel="C123", ts=f"{i + 1}.2", obj=callback)
+
+    def _changelist_queries(self):
+        cache.clear()  # count the rows each time, like a cold cache
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(reverse("admin:shop_slackmessage_changelist"))
+        self.assertEqual(resp.status_code, 200)
+        return len(queries)
+
+    def test_changelist_resolves_targets_in_bulk(self):
+        self._link(0)
+        few = self._changelist_queries()
+        for i in range(1, 10):
+            self._link(i)
+        self.assertEqual(self._changelist_queries(), few)
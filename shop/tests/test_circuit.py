@@ -0,0 +1,157 @@
+"""Tests for the Slack/SMTP circuit breakers and the /health/ endpoint."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from shop.models import CircuitBreakerState, OutboxMessage
+from shop.services import circuit, notifications
+from shop.services.circuit import CircuitBreaker, CircuitOpen
+from shop.services.slack_client import SlackClient
+from shop.services.slack_dispatch import SlackDispatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("slack", failure_threshold=3, reset_timeout=30, clock=self.clock)
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, circuit.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_the_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, circuit.CLOSED)
+
+    def test_half_open_allows_a_single_probe(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 31
+        self.assertTrue(self.breaker.allow())   # the probe
+        self.assertFalse(self.breaker.allow())  # everyone else still fails fast
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, circuit.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 31
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, circuit.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+
+class ClientBreakerTests(TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker("slack", failure_threshold=2, reset_timeout=30)
+        self.client = SlackClient(token="xoxb-test", breaker=self.breaker)
+
+    def test_timeouts_trip_breaker_then_fail_fast(self):
+        with patch.object(self.client.session, "post", side_effect=requests.Timeout("slow")) as post:
+            self.client.call("chat.update", {})
+            self.client.call("chat.update", {})
+            with self.assertRaises(CircuitOpen):
+                self.client.call("chat.update", {})
+        self.assertEqual(post.call_count, 2)  # third call never touched the network
+
+    def test_slack_api_errors_do_not_count(self):
+        bad = MagicMock(status_code=200, raise_for_status=lambda: None,
+                        json=lambda: {"ok": False, "error": "message_not_found"})
+        with patch.object(self.client.session, "post", return_value=bad):
+            for _ in range(3):
+                self.client.call("chat.update", {})
+        self.assertEqual(self.breaker.state, circuit.CLOSED)
+
+    def test_open_circuit_diverts_writes_to_outbox(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        dispatcher = SlackDispatcher(client=self.client)
+        self.assertIsNone(dispatcher.call("chat.update", {"channel": "C1", "ts": "1.1", "text": "x"}))
+        self.assertEqual(OutboxMessage.objects.get().payload["method"], "chat.update")
+        self.assertEqual(dispatcher.stats.snapshot()["short_circuited"], 1)
+
+
+@override_settings(ADMIN_NOTIFICATION_EMAIL="owner@example.com")
+class SmtpBreakerTests(SimpleTestCase):
+    def setUp(self):
+        circuit.get_breaker("smtp").reset()
+        self.addCleanup(circuit.get_breaker("smtp").reset)
+
+    def test_smtp_failures_open_the_circuit(self):
+        with patch("shop.services.notifications.send_mail", side_effect=OSError("smtp down")) as send:
+            for _ in range(circuit.DEFAULT_FAILURE_THRESHOLD + 2):
+                self.assertFalse(notifications.send_admin_email("s", "m"))
+        self.assertEqual(send.call_count, circuit.DEFAULT_FAILURE_THRESHOLD)
+
+
+class HealthEndpointTests(TestCase):
+    def setUp(self):
+        breaker = circuit.get_breaker("slack")
+        breaker.reset()
+        self.addCleanup(breaker.reset)
+
+    def test_reports_ok(self):
+        data = self.client.get(reverse("health")).json()
+        self.assertEqual(data["status"], "ok")
+        self.assertIn("slack_dispatch", data)
+
+    def test_open_breaker_reports_degraded(self):
+        breaker = circuit.get_breaker("slack")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        resp = self.client.get(reverse("health"))
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["status"], "degraded")
+        self.assertEqual(data["circuit_breakers"]["web"]["slack"]["state"], "open")
+
+    def test_reports_breakers_published_by_the_relay(self):
+        relay_breaker = CircuitBreaker("smtp", failure_threshold=1)
+        relay_breaker.record_failure()
+        with patch("shop.services.circuit.all_breakers", return_value={"smtp": relay_breaker}):
+            circuit.publish("relay")
+        self.addCleanup(circuit._published.clear)
+        data = self.client.get(reverse("health")).json()
+        self.assertEqual(data["status"], "degraded")
+        self.assertEqual(data["circuit_breakers"]["relay"]["smtp"]["state"], "open")
+        self.assertEqual(data["circuit_breakers"]["web"]["slack"]["state"], "closed")
+
+    def test_publish_writes_only_on_change_or_heartbeat(self):
+        breaker = CircuitBreaker("slack")
+        self.addCleanup(circuit._published.clear)
+        with patch("shop.services.circuit.all_breakers", return_value={"slack": breaker}):
+            circuit.publish("relay")
+            with self.assertNumQueries(0):
+                circuit.publish("relay")
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+            circuit.publish("relay")
+        self.assertEqual(CircuitBreakerState.objects.get(process="relay").state, "open")
+
+    def test_stale_published_state_reports_degraded(self):
+        CircuitBreakerState.objects.create(process="relay", name="slack", state="closed", snapshot={"state": "closed"})
+        CircuitBreakerState.objects.update(updated_at=timezone.now() - timedelta(seconds=circuit.STALE_AFTER + 1))
+        data = self.client.get(reverse("health")).json()
+        self.assertEqual(data["status"], "degraded")
+        self.assertTrue(data["circuit_breakers"]["relay"]["slack"]["stale"])
@@ -0,0 +1,70 @@
+"""Tests for the SQLite connection settings and retry_on_locked."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from django.db import OperationalError, connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from shop.services.db import is_locked_error, retry_on_locked
+
+
+def _flaky(failures, error="database is locked"):
+    """A callable that raises ``failures`` OperationalErrors, then returns 'ok'."""
+    return MagicMock(__qualname__="flaky", side_effect=[OperationalError(error)] * failures + ["ok"])
+
+
+@patch("shop.services.db.time.sleep")
+@override_settings(SQLITE_LOCKED_RETRIES=3)
+class RetryOnLockedTests(SimpleTestCase):
+    def test_locked_write_is_retried_with_growing_backoff(self, sleep):
+        func = _flaky(2)
+        with patch("shop.services.db.random.uniform", return_value=1.0):  # no jitter
+            self.assertEqual(retry_on_locked(func)(), "ok")
+        self.assertEqual(func.call_count, 3)
+        first, second = (call.args[0] for call in sleep.call_args_list)
+        self.assertEqual(second, 2 * first)
+
+    def test_gives_up_after_the_configured_retries(self, sleep):
+        func = _flaky(4)
+        with self.assertRaises(OperationalError):
+            retry_on_locked(func)()
+        self.assertEqual(func.call_count, 4)
+
+    def test_other_operational_errors_are_not_retried(self, sleep):
+        func = _flaky(1, error="no such table: shop_order")
+        with self.assertRaises(OperationalError):
+            retry_on_locked(func)()
+        func.assert_called_once()
+        sleep.assert_not_called()
+
+    def test_is_locked_error(self, sleep):
+        self.assertTrue(is_locked_error(OperationalError("database is locked")))
+        self.assertFalse(is_locked_error(ValueError("database is locked")))
+
+
+class RetryInsideTransactionTests(TestCase):
+    @patch("shop.services.db.time.sleep")
+    def test_not_retried_inside_an_outer_transaction(self, sleep):
+        func = _flaky(1)
+        with transaction.atomic(), self.assertRaises(OperationalError):
+            retry_on_locked(func)()
+        func.assert_called_once()
+        sleep.assert_not_called()
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite connection tuning")
+class SQLiteConnectionTests(TestCase):
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_init_command_pragmas_are_applied(self):
+        self.assertEqual(self._pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self._pragma("temp_store"), 2)  # MEMORY
+        self.assertEqual(self._pragma("cache_size"), -20000)
+        self.assertGreater(self._pragma("busy_timeout"), 0)
+
+    def test_transactions_begin_immediate(self):
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
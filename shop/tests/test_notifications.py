@@ -9,19 +9,19 @@ from unittest.mock import MagicMock, patch
 from django.test import TestCase, override_settings
 
 from shop.models import Order, Product
-from shop.services import notifications
+from shop.services import notifications, outbox
 
 
 class SendSlackTests(TestCase):
     @override_settings(SLACK_WEBHOOK_URL="")
     def test_no_webhook_configured_is_a_safe_noop(self):
-        with patch("shop.services.notifications.requests.post") as post:
+        with patch("shop.services.slack_client.requests.Session.post") as post:
             self.assertFalse(notifications.send_slack("hi"))
             post.assert_not_called()
 
     @override_settings(SLACK_WEBHOOK_URL="https://hooks.slack.test/abc")
     def test_posts_message_to_webhook(self):
-        with patch("shop.services.notifications.requests.post") as post:
+        with patch("shop.services.slack_client.requests.Session.post") as post:
             post.return_value = MagicMock(raise_for_status=lambda: None)
             self.assertTrue(notifications.send_slack("hello"))
             post.assert_called_once()
@@ -30,10 +30,11 @@ class SendSlackTests(TestCase):
 
     @override_settings(SLACK_WEBHOOK_URL="https://hooks.slack.test/abc")
     def test_network_error_is_swallowed(self):
-        with patch("shop.services.notifications.requests.post", side_effect=Exception("boom")):
+        with patch("shop.services.slack_client.requests.Session.post", side_effect=Exception("boom")):
             self.assertFalse(notifications.send_slack("hello"))
 
 
+@override_settings(SLACK_WEBHOOK_URL="https://hooks.slack.test/abc")
 class OrderNotificationTests(TestCase):
     def setUp(self):
         self.product = Product.objects.create(
@@ -53,6 +54,8 @@ class OrderNotificationTests(TestCase):
         order = self._order()
         with patch("shop.services.notifications.send_slack") as slack:
             notifications.notify_new_order(order)
+            slack.assert_not_called()  # queued, not sent inline
+            outbox.deliver_pending()
         slack.assert_called_once()
         msg = slack.call_args.args[0]
         self.assertIn(f"#{order.id}", msg)
@@ -63,4 +66,5 @@ class OrderNotificationTests(TestCase):
         order = self._order(prefer_callback=True)
         with patch("shop.services.notifications.send_slack") as slack:
             notifications.notify_new_order(order)
+            outbox.deliver_pending()
         self.assertIn("CALL BACK REQUESTED", slack.call_args.args[0])
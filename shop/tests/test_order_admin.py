@@ -0,0 +1,94 @@
+"""Tests for the Order admin's invoice/acknowledge actions and view: one
+conditional UPDATE each, however many orders are selected."""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from shop.models import Order, Product
+
+
+class OrderAdminActionTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        self.product = Product.objects.create(
+            name="Wildflower Honey", description="Local raw honey", price="12.00", size="Pint",
+        )
+        self.url = reverse("admin:shop_order_changelist")
+
+    def _create_order(self, status="processing", **fields):
+        return Order.objects.create(
+            first_name="Jamie", last_name="Bee", email="jamie@example.com", phone="8505551111",
+            address="123 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+            product=self.product, quantity=1, status=status, **fields,
+        )
+
+    def _run(self, action, orders):
+        cache.clear()  # changelist counts are cached; measure each run cold
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(self.url, {
+                "action": action, "_selected_action": [str(order.pk) for order in orders],
+            })
+        self.assertEqual(resp.status_code, 302)
+        return [q["sql"] for q in queries]
+
+    def _messages(self):
+        return [str(m) for m in self.client.get(self.url).context["messages"]]
+
+    def test_mark_invoice_sent_leaves_invoiced_orders_alone(self):
+        sent_at = timezone.now() - timedelta(days=3)
+        invoiced = self._create_order(invoice_sent_at=sent_at)
+        fresh = self._create_order()
+        self._run("mark_invoice_sent", [invoiced, fresh])
+        invoiced.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(invoiced.invoice_sent_at, sent_at)
+        self.assertIsNotNone(fresh.invoice_sent_at)
+        self.assertIn("Marked 1 order(s) as invoiced.", self._messages())
+
+    def test_acknowledge_skips_pending_orders(self):
+        pending = self._create_order("pending")
+        processing = self._create_order("processing")
+        self._run("acknowledge_selected_orders", [pending, processing])
+        pending.refresh_from_db()
+        processing.refresh_from_db()
+        self.assertIsNone(pending.acknowledged_at)
+        self.assertIsNotNone(processing.acknowledged_at)
+        self.assertEqual(
+            self._messages(),
+            ["Acknowledged 1 order(s).", "Skipped 1 order(s) still in pending status."],
+        )
+
+    def test_actions_cost_the_same_for_any_selection(self):
+        for action in ("mark_invoice_sent", "acknowledge_selected_orders"):
+            with self.subTest(action=action):
+                Order.objects.all().delete()
+                few = self._run(action, [self._create_order() for _ in range(2)])
+                Order.objects.all().delete()
+                many = self._run(action, [self._create_order() for _ in range(20)])
+                self.assertEqual(len(many), len(few))
+                self.assertEqual(sum(sql.startswith('UPDATE "shop_order"') for sql in many), 1)
+                self.assertFalse(any('"shop_product"' in sql for sql in many))
+
+    def test_acknowledge_view(self):
+        pending = self._create_order("pending")
+        processing = self._create_order("processing")
+        # session + user, the UPDATE, and an existence check since it changed nothing
+        with self.assertNumQueries(4):
+            self.client.get(reverse("admin:shop_order_acknowledge", args=[pending.pk]))
+        pending.refresh_from_db()
+        self.assertIsNone(pending.acknowledged_at)
+
+        self.client.get(reverse("admin:shop_order_acknowledge", args=[processing.pk]))
+        processing.refresh_from_db()
+        self.assertIsNotNone(processing.acknowledged_at)
+        self.assertIn("Order acknowledged.", self._messages())
+
+        self.client.get(reverse("admin:shop_order_acknowledge", args=[processing.pk + 100]))
+        self.assertIn("Order not found.", self._messages())
@@ -0,0 +1,172 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from shop.management.commands.archive_orders import archive_orders
+from shop.models import Order, Product
+from shop.services import slack_interactions, slack_sync
+
+
+class ArchiveFixtures:
+    def setUp(self):
+        self.product = Product.objects.create(
+            name="Wildflower Honey",
+            description="Local raw honey",
+            price="12.00",
+            size="Pint",
+            in_stock=True,
+        )
+
+    def _create_order(self, status="pending", age_days=0):
+        order = Order.objects.create(
+            first_name="Jamie",
+            last_name="Bee",
+            email="jamie@example.com",
+            phone="8505551111",
+            address="123 Honey Ln",
+            city="Tallahassee",
+            state="FL",
+            zip_code="32301",
+            product=self.product,
+            quantity=1,
+            total_price="12.00",
+            status=status,
+        )
+        Order.objects.filter(pk=order.pk).update(updated_at=timezone.now() - timedelta(days=age_days))
+        return order
+
+    def _archive(self):
+        out = StringIO()
+        call_command("archive_orders", stdout=out)
+        return out.getvalue()
+
+
+class ArchiveOrdersCommandTests(ArchiveFixtures, TestCase):
+    def test_archives_only_old_completed_orders(self):
+        old_done = self._create_order("completed", age_days=31)
+        recent_done = self._create_order("completed", age_days=5)
+        old_pending = self._create_order("pending", age_days=60)
+        self.assertIn("Archived 1 order(s)", self._archive())
+        archived = set(Order.objects.filter(archived_at__isnull=False).values_list("pk", flat=True))
+        self.assertEqual(archived, {old_done.pk})
+        self.assertNotIn(recent_done.pk, archived)
+        self.assertNotIn(old_pending.pk, archived)
+
+    def test_is_incremental(self):
+        order = self._create_order("completed", age_days=31)
+        self._archive()
+        first = Order.objects.get(pk=order.pk).archived_at
+        self.assertIn("Archived 0 order(s)", self._archive())
+        self.assertEqual(Order.objects.get(pk=order.pk).archived_at, first)
+
+    def test_reopened_order_is_restored(self):
+        order = self._create_order("completed", age_days=31)
+        self._archive()
+        Order.objects.filter(pk=order.pk).update(status="processing")
+        self.assertIn("restored 1", self._archive())
+        self.assertIsNone(Order.objects.get(pk=order.pk).archived_at)
+
+
+    def test_reopening_in_save_restores_at_once(self):
+        order = self._create_order("completed", age_days=31)
+        self._archive()
+        order = Order.objects.get(pk=order.pk)
+        order.status = "processing"
+        order.save(update_fields=["status"])
+        self.assertIsNone(Order.objects.get(pk=order.pk).archived_at)
+
+    def test_other_saves_keep_the_order_archived(self):
+        order = self._create_order("completed", age_days=31)
+        self._archive()
+        order = Order.objects.get(pk=order.pk)
+        order.notes = "thank-you card sent"
+        order.save()
+        self.assertIsNotNone(Order.objects.get(pk=order.pk).archived_at)
+
+    def test_reopening_in_bulk_restores_at_once(self):
+        old_done = self._create_order("completed", age_days=31)
+        self._archive()
+        slack_sync.bulk_set_status(Order.objects.filter(pk=old_done.pk), "cancelled")
+        self.assertIsNone(Order.objects.get(pk=old_done.pk).archived_at)
+
+
+    @override_settings(SLACK_BOT_TOKEN="xoxb-test", SLACK_CHANNEL="C123", SLACK_STATUS_BUTTONS=True,
+                       SLACK_ALLOWED_REACTORS=[])
+    def test_reopening_from_a_slack_button_restores_at_once(self):
+        order = self._create_order("completed", age_days=31)
+        self._archive()
+        button = next(
+            b for b in slack_interactions.status_buttons(order) if b["action_id"] == "set_status:processing"
+        )
+        payload = {
+            "type": "block_actions", "user": {"id": "U1"}, "channel": {"id": "C123"},
+            "message": {"ts": "1700000000.000100", "text": "New order"},
+            "actions": [{"action_id": button["action_id"], "value": button["value"]}],
+        }
+        with patch("shop.services.slack_client.requests.Session.post"):
+            self.assertEqual(slack_interactions.apply_interaction(payload), 1)
+        self.assertIsNone(Order.objects.get(pk=order.pk).archived_at)
+
+
+class RelayArchivingTests(ArchiveFixtures, TestCase):
+    def _loop(self, passes):
+        class Stop(Exception):
+            pass
+
+        out = StringIO()
+        with patch("shop.services.outbox.deliver_pending", return_value=(0, 0)), \
+             patch("shop.management.commands.relay_notifications.archive_orders",
+                   wraps=archive_orders) as archive, \
+             patch("shop.management.commands.relay_notifications.time.sleep",
+                   side_effect=[None] * (passes - 1) + [Stop]), \
+             self.assertRaises(Stop):
+            call_command("relay_notifications", "--loop", stdout=out)
+        return archive.call_count, out.getvalue()
+
+    def test_relay_loop_archives_when_it_starts(self):
+        self._create_order("completed", age_days=31)
+        calls, out = self._loop(passes=3)
+        self.assertEqual(calls, 1)
+        self.assertIn("Archived 1 order(s)", out)
+
+    def test_relay_loop_archives_again_once_due(self):
+        with patch("shop.management.commands.relay_notifications.ARCHIVE_EVERY", -1):
+            calls, _out = self._loop(passes=3)
+        self.assertEqual(calls, 3)
+
+    def test_single_pass_does_not_archive(self):
+        self._create_order("completed", age_days=31)
+        with patch("shop.services.outbox.deliver_pending", return_value=(0, 0)):
+            call_command("relay_notifications", stdout=StringIO())
+        self.assertFalse(Order.objects.filter(archived_at__isnull=False).exists())
+
+
+class OrderArchiveAdminTests(ArchiveFixtures, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        self.hot = self._create_order("pending")
+        self.cold = self._create_order("completed", age_days=45)
+        self._archive()
+        self.url = reverse("admin:shop_order_changelist")
+
+    def _listed(self, query=""):
+        resp = self.client.get(self.url + query)
+        self.assertEqual(resp.status_code, 200)
+        return {order.pk for order in resp.context["cl"].result_list}
+
+    def test_default_list_is_the_hot_set(self):
+        self.assertEqual(self._listed(), {self.hot.pk})
+        self.assertEqual(self._listed("?archive=active"), {self.hot.pk})
+
+    def test_archived_orders_stay_browsable(self):
+        self.assertEqual(self._listed("?archive=archived"), {self.cold.pk})
+        self.assertEqual(self._listed("?archive=all"), {self.hot.pk, self.cold.pk})
+        resp = self.client.get(reverse("admin:shop_order_change", args=[self.cold.pk]))
+        self.assertEqual(resp.status_code, 200)
@@ -93,3 +93,58 @@ class OrderConfirmationTests(OrderBase):
         resp = self.client.get(reverse("order_success"))
         self.assertEqual(resp.status_code, 200)
         self.assertNotContains(resp, "Order #")
+
+
+class OrderPricingTests(OrderBase):
+    def _order(self, quantity=2):
+        return Order.objects.create(
+            first_name="Jane", last_name="Doe", email="jane@example.com", phone="850-555-1234",
+            address="1 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+            product=self.product, quantity=quantity,
+        )
+
+    def test_price_is_snapshotted_when_placed(self):
+        order = self._order()
+        self.assertEqual((order.unit_price, order.total_price), (Decimal("17.00"), Decimal("34.00")))
+
+    def test_later_saves_neither_load_the_product_nor_reprice(self):
+        self._order()
+        Product.objects.update(price=Decimal("20.00"))
+        order = Order.objects.get()
+        with self.assertNumQueries(1):
+            order.status = "processing"
+            order.save(update_fields=["status", "updated_at"])
+        with self.assertNumQueries(1):
+            order.notes = "leave on porch"
+            order.save()
+        order.refresh_from_db()
+        self.assertEqual(order.total_price, Decimal("34.00"))
+
+    def test_quantity_change_recomputes_at_the_snapshot_price(self):
+        self._order()
+        Product.objects.update(price=Decimal("20.00"))
+        order = Order.objects.get()
+        order.quantity = 3
+        with self.assertNumQueries(1):
+            order.save(update_fields=["quantity"])
+        order.refresh_from_db()
+        self.assertEqual((order.unit_price, order.total_price), (Decimal("17.00"), Decimal("51.00")))
+
+    def test_product_change_takes_the_new_products_price(self):
+        order = self._order()
+        other = Product.objects.create(
+            name="Orange Blossom", description="raw", price=Decimal("22.00"), size="Pint", category="honey",
+        )
+        order.product = other
+        order.save()
+        order.refresh_from_db()
+        self.assertEqual((order.unit_price, order.total_price), (Decimal("22.00"), Decimal("44.00")))
+
+    def test_save_loop_is_one_query_per_order(self):
+        for _ in range(5):
+            self._order()
+        orders = list(Order.objects.all())
+        with self.assertNumQueries(len(orders)):
+            for order in orders:
+                order.reminder_sent_at = order.created_at
+                order.save(update_fields=["reminder_sent_at"])
@@ -1,11 +1,13 @@
 from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch
 
+from django.contrib.contenttypes.models import ContentType
 from django.core.management import call_command
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
-from shop.models import Order, Product
+from shop.models import Order, OutboxMessage, Product
 
 
 class OrderReminderCommandTests(TestCase):
@@ -147,3 +149,17 @@ class OrderReminderCommandTests(TestCase):
         notify_mock.assert_called_once()
         order.refresh_from_db()
         self.assertIsNotNone(order.reminder_sent_at)
+
+    @override_settings(SLACK_WEBHOOK_URL="https://hooks.slack.example/T/B/X")
+    def test_queries_do_not_grow_with_product_lookups(self):
+        stale_time = timezone.now() - timedelta(hours=30)
+        for _ in range(4):
+            self._create_order()
+        self._create_order(acknowledged_at=timezone.now() - timedelta(hours=26))
+        Order.objects.update(created_at=stale_time, updated_at=stale_time)
+        ContentType.objects.get_for_model(Order)  # warm the cache the outbox uses
+
+        # two due-order SELECTs, then per order: queue the Slack message, save reminder_sent_at
+        with self.assertNumQueries(2 + 5 * 2):
+            call_command("send_order_reminders", stdout=StringIO())
+        self.assertEqual(OutboxMessage.objects.count(), 5)
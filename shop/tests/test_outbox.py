@@ -0,0 +1,123 @@
+"""Tests for the notification outbox and its relay.
+
+Form submits should only queue ``OutboxMessage`` rows; the relay
+(``relay_notifications``) delivers them and retries failures with backoff.
+Network calls are mocked; nothing leaves the test run.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from shop.models import Order, OutboxMessage, Product, SlackMessage
+from shop.services import notifications, outbox
+
+SLACK_SETTINGS = dict(
+    SLACK_BOT_TOKEN="xoxb-test",
+    SLACK_CHANNEL="C123",
+    ADMIN_NOTIFICATION_EMAIL="owner@example.com",
+)
+
+
+@override_settings(**SLACK_SETTINGS)
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(
+            name="Wildflower Honey", description="d", price=Decimal("17.00"), size="Pint",
+        )
+
+    def _order(self):
+        return Order.objects.create(
+            first_name="Jane", last_name="Doe", email="jane@example.com", phone="(850) 555-1234",
+            address="1 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+            product=self.product, quantity=2,
+        )
+
+    def test_form_submit_queues_without_calling_slack(self):
+        with patch("shop.services.slack_client.requests.Session.post") as post:
+            resp = self.client.post(reverse("order_honey"), dict(
+                first_name="Jane", last_name="Doe", email="jane@example.com",
+                phone="850-555-1234", address="1 Honey Ln", city="Tallahassee",
+                state="FL", zip_code="32301", product=self.product.pk, quantity=2, notes="",
+            ))
+        self.assertRedirects(resp, reverse("order_success"))
+        post.assert_not_called()
+        order = Order.objects.get()
+        slack, email = OutboxMessage.objects.order_by("id")
+        self.assertEqual(slack.kind, "slack")
+        self.assertEqual(slack.target, order)
+        self.assertIn(f"#{order.id}", slack.payload["text"])
+        self.assertEqual(email.kind, "email")
+
+    def test_relay_posts_and_links_message(self):
+        order = self._order()
+        notifications.notify_new_order(order)
+        with patch("shop.services.notifications.post_message", return_value="1.1") as post, \
+             patch("shop.services.notifications.send_admin_email", return_value=True):
+            self.assertEqual(outbox.deliver_pending(), (2, 0))
+        self.assertEqual(post.call_args.kwargs["link_to"], order)
+        self.assertFalse(OutboxMessage.objects.exclude(status="sent").exists())
+
+    def test_failure_is_retried_with_backoff(self):
+        notifications.queue_slack_message("hi")
+        with patch("shop.services.notifications.post_message", return_value=None):
+            self.assertEqual(outbox.deliver_pending(), (0, 1))
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, "pending")
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt_at, timezone.now() + timedelta(seconds=20))
+
+        # Not due yet → the next pass leaves it alone.
+        with patch("shop.services.notifications.post_message") as post:
+            outbox.deliver_pending()
+        post.assert_not_called()
+
+    def test_gives_up_after_max_attempts(self):
+        notifications.queue_slack_message("hi")
+        OutboxMessage.objects.update(attempts=outbox.MAX_ATTEMPTS - 1)
+        with patch("shop.services.notifications.post_message", side_effect=Exception("boom")):
+            outbox.deliver_pending()
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, "failed")
+        self.assertEqual(message.last_error, "boom")
+
+    @override_settings(SLACK_BOT_TOKEN="", SLACK_CHANNEL="", SLACK_WEBHOOK_URL="", ADMIN_NOTIFICATION_EMAIL="")
+    def test_nothing_queued_when_unconfigured(self):
+        notifications.notify_new_order(self._order())
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_command_delivers_pending(self):
+        order = self._order()
+        notifications.queue_slack_message("hi", link_to=order)
+
+        def fake_post(text, link_to=None):
+            SlackMessage.record(channel="C123", ts="1.1", obj=link_to, text=text)
+            return "1.1"
+
+        out = StringIO()
+        with patch("shop.services.notifications.post_message", side_effect=fake_post):
+            call_command("relay_notifications", stdout=out)
+        self.assertIn("Delivered 1", out.getvalue())
+        self.assertEqual(SlackMessage.objects.get().target, order)
+
+    def test_loop_survives_a_failing_pass(self):
+        class Stop(Exception):
+            pass
+
+        out = StringIO()
+        passes = [OperationalError("database is locked"), (1, 0)]
+        with patch("shop.services.outbox.deliver_pending", side_effect=passes) as deliver, \
+             patch("shop.management.commands.relay_notifications.time.sleep", side_effect=[None, Stop]), \
+             self.assertLogs("shop.management.commands.relay_notifications", "ERROR") as logs, \
+             self.assertRaises(Stop):
+            call_command("relay_notifications", "--loop", stdout=out)
+        self.assertEqual(deliver.call_count, 2)
+        self.assertIn("database is locked", logs.output[0])
+        self.assertIn("Delivered 1", out.getvalue())
@@ -0,0 +1,106 @@
+"""Query-plan checks for the hot lookups: each must be served by an index,
+not a full table scan, so a refactor can't quietly drop one. SQLite only
+(EXPLAIN QUERY PLAN output)."""
+
+import unittest
+
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from shop.management.commands.send_order_reminders import due_reminders
+from shop.models import (
+    BeeRemovalRequest,
+    CallbackRequest,
+    NukeRequest,
+    Order,
+    OutboxMessage,
+    PollinationRequest,
+    SlackMessage,
+)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite-specific")
+class SlackMessageQueryPlanTests(TestCase):
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index}", plan)
+        self.assertNotIn("SCAN shop_slackmessage", plan)
+
+    def test_event_lookup_by_ts_uses_index(self):
+        self.assertUsesIndex(SlackMessage.objects.filter(ts="1700000000.000100"), "slackmessage_ts_idx")
+        self.assertUsesIndex(
+            SlackMessage.objects.filter(ts__in=["1.1", "2.1"]).with_targets(), "slackmessage_ts_idx",
+        )
+
+    def test_object_lookup_uses_index_without_content_type_join(self):
+        queryset = SlackMessage.objects.for_object(Order(pk=1))
+        self.assertUsesIndex(queryset, "slackmessage_target_idx")
+        self.assertNotIn("django_content_type", str(queryset.query))
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite-specific")
+class RecordQueryPlanTests(TestCase):
+    """Admin changelists and the reminder job: every table is reached through
+    an index (an ordered ``SCAN … USING INDEX`` is fine; a bare scan isn't)."""
+
+    def assertNoFullScan(self, queryset, index=None):
+        plan = queryset.explain()
+        for line in plan.splitlines():
+            if " SCAN " in line:
+                self.assertIn("USING", line, plan)
+        if index:
+            self.assertIn(index, plan)
+
+    def _changelist(self, model, query=""):
+        request = RequestFactory().get(f"/{query}")
+        request.user = User(is_superuser=True, is_staff=True, is_active=True)
+        return site._registry[model].get_changelist_instance(request)
+
+    def _changelist_queryset(self, model, query=""):
+        return self._changelist(model, query).queryset
+
+    def test_cursor_pages_read_from_the_cursor(self):
+        # Only ties on created_at are sorted (LAST TERM); a plain "FOR ORDER BY"
+        # would mean sorting every row past the cursor.
+        for model, index in [
+            (Order, "order_hot_idx"), (CallbackRequest, "callback_created_idx"),
+            (SlackMessage, "slackmessage_created_idx"), (OutboxMessage, "outbox_created_idx"),
+        ]:
+            with self.subTest(model=model.__name__):
+                cl = self._changelist(model, "?after=2026-01-01T00:00:00%2B00:00,5")
+                queryset = cl.result_list
+                self.assertNoFullScan(queryset, index)
+                self.assertRegex(queryset.explain(), r"created_at[<>]\?")
+                self.assertNotIn("TEMP B-TREE FOR ORDER BY", queryset.explain())
+
+    def test_slack_and_outbox_changelists_by_date(self):
+        self.assertNoFullScan(self._changelist_queryset(SlackMessage), "slackmessage_created_idx")
+        self.assertNoFullScan(self._changelist_queryset(OutboxMessage), "outbox_created_idx")
+        self.assertNoFullScan(
+            SlackMessage.objects.filter(created_at__gte=timezone.now()).with_targets(), "slackmessage_created_idx",
+        )
+
+    def test_reminder_queries_use_the_pending_index(self):
+        for queryset in due_reminders(timezone.now()):
+            self.assertNoFullScan(queryset, "order_pending_reminder_idx")
+
+    def test_order_changelist_and_archive_job(self):
+        for query in ("", "?archive=archived"):
+            self.assertNoFullScan(self._changelist_queryset(Order, query), "order_hot_idx")
+        self.assertNoFullScan(Order.objects.filter(status="processing"), "order_status_updated_idx")
+        self.assertNoFullScan(
+            Order.objects.filter(status="completed", updated_at__lte=timezone.now(), archived_at__isnull=True),
+            "order_status_updated_idx",
+        )
+
+    def test_request_changelists_by_date_and_status(self):
+        for model, prefix in [
+            (NukeRequest, "nuc"), (PollinationRequest, "pollination"),
+            (BeeRemovalRequest, "beeremoval"), (CallbackRequest, "callback"),
+        ]:
+            with self.subTest(model=model.__name__):
+                self.assertNoFullScan(self._changelist_queryset(model), f"{prefix}_created_idx")
+                self.assertNoFullScan(model.objects.filter(status="pending"), f"{prefix}_status_idx")
@@ -0,0 +1,178 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
+from django.db.models import CharField
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from shop.models import BeeRemovalRequest, CallbackRequest, NukeRequest, Order, PollinationRequest, Product
+from shop.services import search
+
+
+class SearchFixtures:
+    def setUp(self):
+        self.product = Product.objects.create(name="Wildflower Honey", description="d", price="12.00", size="Pint")
+
+    def _order(self, **fields):
+        values = dict(
+            first_name="Jamie", last_name="Bee", email="jamie@example.com", phone="(850) 555-1234",
+            address="123 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+            product=self.product, quantity=1, total_price="12.00",
+        )
+        values.update(fields)
+        return Order.objects.create(**values)
+
+    def _callback(self, **fields):
+        values = dict(name="Pat Keeper", phone="850-555-9999", message="")
+        values.update(fields)
+        return CallbackRequest.objects.create(**values)
+
+
+class MatchExpressionTests(unittest.TestCase):
+    def test_words_become_quoted_prefix_terms(self):
+        self.assertEqual(search.match_expression("jamie bee"), '"jamie"* "bee"*')
+        self.assertEqual(search.match_expression("jane@example.com"), '"jane"* "example"* "com"*')
+
+    def test_phone_numbers_match_as_one_run_of_digits(self):
+        self.assertEqual(search.match_expression("(850) 555-1234"), '"8505551234"*')
+        self.assertEqual(search.match_expression("555-1234"), '"5551234"*')
+        self.assertEqual(search.match_expression("850 555"), '"850"* "555"*')
+        self.assertEqual(search.match_expression("32301"), '"32301"*')
+
+    def test_fts_syntax_is_not_passed_through(self):
+        self.assertEqual(search.match_expression('NEAR(" OR *'), '"NEAR"* "OR"*')
+        self.assertEqual(search.match_expression("-- !"), "")
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "FTS5 index is SQLite-only")
+class SearchIndexTests(SearchFixtures, TestCase):
+    def test_phone_in_any_format(self):
+        order = self._order()
+        bare = self._order(phone="8505551234")
+        for term in ["(850) 555-1234", "850-555-1234", "8505551234", "555-1234", "5551234", "850-555-12"]:
+            with self.subTest(term=term):
+                self.assertCountEqual(search.ranked_ids(Order, term), [order.pk, bare.pk])
+        self.assertEqual(search.ranked_ids(Order, "5559999"), [])
+
+    def test_names_email_and_address_by_prefix(self):
+        order = self._order()
+        for term in ["jamie", "Jam Tall", "jamie@example.com", "honey ln", "32301"]:
+            with self.subTest(term=term):
+                self.assertEqual(search.ranked_ids(Order, term), [order.pk])
+        self.assertEqual(search.ranked_ids(Order, "jamie orlando"), [])
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        callback = self._callback()
+        self.assertEqual(search.ranked_ids(CallbackRequest, "pat"), [callback.pk])
+        CallbackRequest.objects.filter(pk=callback.pk).update(name="Robin Hive")  # no save(), no signals
+        self.assertEqual(search.ranked_ids(CallbackRequest, "pat"), [])
+        self.assertEqual(search.ranked_ids(CallbackRequest, "robin"), [callback.pk])
+        callback.delete()
+        self.assertEqual(search.ranked_ids(CallbackRequest, "robin"), [])
+
+    def test_best_match_first(self):
+        passing = self._callback(message="Interested in honey, maybe nucs next spring, call after five")
+        keen = self._callback(message="Honey honey honey")
+        self.assertEqual(search.ranked_ids(CallbackRequest, "honey"), [keen.pk, passing.pk])
+
+    def test_everything_for_a_phone_number(self):
+        order = self._order(phone="(850) 555-7777")
+        callback = self._callback(phone="8505557777", message="About my order")
+        removal = BeeRemovalRequest.objects.create(
+            first_name="Jamie", last_name="Bee", email="jamie@example.com", phone="850.555.7777",
+            property_address="9 Oak St", city="Quincy", zip_code="32351", bee_location="tree",
+        )
+        nuc = NukeRequest.objects.create(
+            first_name="Jamie", last_name="Bee", email="jamie@example.com", phone="(850) 555-7777",
+            address="123 Honey Ln", city="Tallahassee", state="FL", zip_code="32301", quantity=1,
+        )
+        pollination = PollinationRequest.objects.create(
+            first_name="Jamie", last_name="Bee", email="jamie@example.com", phone="850 555 7777",
+            property_address="Grove Rd", city="Monticello", zip_code="32344", crop_type="blueberry",
+            acreage=Decimal("5"), preferred_start_date=date(2026, 3, 1),
+        )
+        self._order(phone="(850) 555-1234")
+        with self.assertNumQueries(6):  # the match, then one query per model
+            found = search.search("555-7777")
+        self.assertCountEqual(found, [order, callback, removal, nuc, pollination])
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "FTS5 index is SQLite-only")
+class SearchTriggerTests(SearchFixtures, TransactionTestCase):
+    def _alter_name(self, max_length):
+        old = CallbackRequest._meta.get_field("name")
+        name, path, args, kwargs = old.deconstruct()
+        new = CharField(*args, **{**kwargs, "max_length": max_length})
+        new.set_attributes_from_name(name)
+        new.model = CallbackRequest
+        with connection.schema_editor() as editor:
+            editor.alter_field(CallbackRequest, old, new)  # SQLite rebuilds the table
+
+    def _restore_name(self):
+        self._alter_name(CallbackRequest._meta.get_field("name").max_length)
+        search.ensure_triggers()
+
+    def test_rows_stay_searchable_after_a_table_rebuild(self):
+        before = self._callback()
+        self._alter_name(150)
+        self.addCleanup(self._restore_name)
+        missed = self._callback(name="Robin Hive")  # written while the table has no triggers
+        self.assertEqual(search.ranked_ids(CallbackRequest, "robin"), [])
+
+        with self.assertLogs("shop.signals", "WARNING"):
+            emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        added = self._callback(name="Robin Comb")
+        self.assertCountEqual(search.ranked_ids(CallbackRequest, "robin"), [missed.pk, added.pk])
+        self.assertEqual(search.ranked_ids(CallbackRequest, "pat"), [before.pk])
+        CallbackRequest.objects.filter(pk=added.pk).update(name="Jordan Drone")
+        self.assertEqual(search.ranked_ids(CallbackRequest, "robin"), [missed.pk])
+
+    def test_intact_triggers_are_left_alone(self):
+        self.assertEqual(search.ensure_triggers(), [])
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "FTS5 index is SQLite-only")
+class AdminSearchTests(SearchFixtures, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser("admin", "a@example.com", "pw"))
+
+    def test_changelist_search_uses_the_index(self):
+        match = self._order(phone="(850) 555-4242")
+        self._order(phone="(850) 555-1234")
+        url = reverse("admin:shop_order_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(url, {"q": "8505554242"})  # icontains on phone couldn't match this
+        self.assertEqual(list(resp.context["cl"].result_list), [match])
+        self.assertFalse(resp.context["cl"].keyset)
+        self.assertFalse(any("LIKE" in q["sql"] for q in queries.captured_queries))
+
+    def test_changelist_search_is_ranked(self):
+        passing = self._callback(message="Interested in honey, maybe nucs next spring, call after five")
+        keen = self._callback(message="Honey honey honey")
+        resp = self.client.get(reverse("admin:shop_callbackrequest_changelist"), {"q": "honey"})
+        self.assertEqual(list(resp.context["cl"].result_list), [keen, passing])
+
+    def test_search_without_words_falls_back_to_search_fields(self):
+        self._callback()
+        resp = self.client.get(reverse("admin:shop_callbackrequest_changelist"), {"q": "--"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.context["cl"].result_list), 0)
+
+    def test_customer_search_page(self):
+        order = self._order(phone="(850) 555-4242")
+        callback = self._callback(phone="850-555-4242")
+        resp = self.client.get(reverse("customer_search"), {"q": "555 4242"})
+        self.assertContains(resp, reverse("admin:shop_order_change", args=[order.pk]))
+        self.assertContains(resp, reverse("admin:shop_callbackrequest_change", args=[callback.pk]))
+
+    def test_customer_search_needs_staff(self):
+        self.client.logout()
+        resp = self.client.get(reverse("customer_search"), {"q": "555"})
+        self.assertEqual(resp.status_code, 302)
+        self.assertIn(reverse("admin:login"), resp["Location"])
@@ -0,0 +1,53 @@
+"""Tests for the pooled Slack Web API client."""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from shop.services import notifications, slack_client
+
+
+def _resp(data):
+    return MagicMock(raise_for_status=lambda: None, json=lambda: data)
+
+
+@override_settings(SLACK_BOT_TOKEN="xoxb-test", SLACK_CHANNEL="C123")
+class SlackClientTests(SimpleTestCase):
+    def setUp(self):
+        self.client = slack_client.SlackClient(pool_size=7)
+
+    def test_ok_response_is_returned(self):
+        with patch.object(self.client.session, "post", return_value=_resp({"ok": True, "ts": "1.1"})) as post:
+            data = self.client.call("chat.postMessage", {"channel": "C123", "text": "hi"})
+        self.assertEqual(data["ts"], "1.1")
+        self.assertEqual(post.call_args.args[0], "https://slack.com/api/chat.postMessage")
+        self.assertEqual(post.call_args.kwargs["headers"]["Authorization"], "Bearer xoxb-test")
+
+    def test_api_error_returns_none_unless_allowed(self):
+        reply = _resp({"ok": False, "error": "already_reacted"})
+        with patch.object(self.client.session, "post", return_value=reply):
+            self.assertIsNone(self.client.call("reactions.add", {}))
+            self.assertIsNotNone(self.client.call("reactions.add", {}, ok_errors={"already_reacted"}))
+
+    def test_transport_error_returns_none(self):
+        with patch.object(self.client.session, "get", side_effect=Exception("timeout")):
+            self.assertIsNone(self.client.call("reactions.get", {}, http_method="GET"))
+
+    def test_pool_size_is_applied(self):
+        adapter = self.client.session.get_adapter("https://slack.com/api/")
+        self.assertEqual(adapter._pool_maxsize, 7)
+
+    def test_helpers_share_one_session(self):
+        # Every helper must go through the process-wide client so they reuse
+        # its keep-alive connections.
+        shared = slack_client.get_client()
+        ok = _resp({"ok": True, "ts": "1.1", "message": {}})
+        with patch.object(shared.session, "post", return_value=ok) as post, \
+             patch.object(shared.session, "get", return_value=ok) as get:
+            notifications.update_message("C123", "1.1", "x")
+            notifications.add_reaction("C123", "1.1", "package")
+            notifications.remove_reaction("C123", "1.1", "package")
+            notifications.post_thread_reply("C123", "1.1", "x")
+            notifications.get_message_reactions("C123", "1.1")
+        self.assertEqual(post.call_count, 4)
+        self.assertEqual(get.call_count, 1)
@@ -0,0 +1,141 @@
+"""Tests for the rate-limit-aware Slack dispatcher.
+
+A fake clock drives the token buckets and ``sleep`` so nothing actually waits.
+"""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+from django.utils import timezone
+
+from shop.models import OutboxMessage
+from shop.services import outbox
+from shop.services.slack_client import SlackRateLimited
+from shop.services.slack_dispatch import SlackDispatcher, TokenBucket, capture_deferred, queue_deferred
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTests(TestCase):
+    def test_burst_then_paced_at_tier_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(per_minute=60, capacity=2, clock=clock)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)  # 1/sec once the burst is spent
+
+    def test_pause_holds_the_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(per_minute=60, capacity=5, clock=clock)
+        bucket.pause(30)
+        self.assertAlmostEqual(bucket.reserve(), 30)
+
+
+class DispatcherTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.client = MagicMock()
+        self.dispatcher = SlackDispatcher(
+            client=self.client, max_wait=3, max_retries=2, sleep=self.clock.sleep, clock=self.clock,
+        )
+
+    def test_retries_after_short_retry_after(self):
+        self.client.call.side_effect = [SlackRateLimited("chat.update", 1.5), {"ok": True}]
+        data = self.dispatcher.call("chat.update", {"ts": "1.1"})
+        self.assertEqual(data, {"ok": True})
+        self.assertEqual(self.client.call.call_count, 2)
+        self.assertIn(1.5, self.clock.slept)  # honoured Retry-After before retrying
+        stats = self.dispatcher.stats.snapshot()
+        self.assertEqual((stats["rate_limited"], stats["retried"], stats["dropped"]), (1, 1, 0))
+
+    def test_long_retry_after_queues_write_for_relay(self):
+        self.client.call.side_effect = SlackRateLimited("reactions.add", 60)
+        args = {"channel": "C1", "timestamp": "1.1", "name": "package"}
+        self.assertIsNone(self.dispatcher.call("reactions.add", args, ok_errors={"already_reacted"}))
+        queued = OutboxMessage.objects.get()
+        self.assertEqual(queued.kind, "slack_api")
+        self.assertEqual(queued.payload["method"], "reactions.add")
+        self.assertEqual(queued.payload["args"], args)
+        self.assertEqual(self.dispatcher.stats.snapshot()["queued"], 1)
+
+    def test_captured_writes_are_handed_back_not_queued(self):
+        self.client.call.side_effect = SlackRateLimited("chat.update", 60)
+        with capture_deferred() as deferred:
+            self.dispatcher.call("chat.update", {"ts": "1.1"})
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(deferred, [{"method": "chat.update", "args": {"ts": "1.1"}, "ok_errors": []}])
+        queue_deferred(deferred)
+        self.assertEqual(OutboxMessage.objects.get().payload["method"], "chat.update")
+
+    def test_rate_limited_read_is_dropped(self):
+        self.client.call.side_effect = SlackRateLimited("reactions.get", 60)
+        self.assertIsNone(self.dispatcher.call("reactions.get", {}, http_method="GET"))
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(self.dispatcher.stats.snapshot()["dropped"], 1)
+
+    def test_no_defer_opt_out(self):
+        self.client.call.side_effect = SlackRateLimited("chat.postMessage", 60)
+        self.dispatcher.call("chat.postMessage", {}, defer=False)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_bursts_are_paced_not_rejected(self):
+        self.client.call.return_value = {"ok": True}
+        for _ in range(8):  # reactions.remove: Tier 2, burst 3
+            self.dispatcher.call("reactions.remove", {})
+        self.assertEqual(self.client.call.call_count, 8)
+        self.assertEqual(self.dispatcher.stats.snapshot()["throttled"], 5)
+        self.assertTrue(all(0 < s <= 3 for s in self.clock.slept))
+
+    def test_relay_replays_queued_call(self):
+        OutboxMessage.objects.create(
+            kind="slack_api",
+            payload={"method": "chat.update", "args": {"ts": "1.1"}, "ok_errors": []},
+        )
+        replay = MagicMock(return_value={"ok": True})
+        dispatcher = MagicMock(call=replay)
+        with patch("shop.services.outbox.get_dispatcher", return_value=dispatcher):
+            self.assertEqual(outbox.deliver_pending(), (1, 0))
+        self.assertEqual(replay.call_args.args[:2], ("chat.update", {"ts": "1.1"}))
+        self.assertFalse(replay.call_args.kwargs["defer"])
+
+    def test_relay_keeps_writes_to_one_message_in_order(self):
+        def update(ts, text):
+            args = {"channel": "C1", "ts": ts, "text": text}
+            return {"method": "chat.update", "args": args, "ok_errors": []}
+
+        queue_deferred([update("1.1", "v1"), update("2.2", "other"), update("1.1", "v2")])
+        delivered = []
+
+        def replay(method, args, **kwargs):
+            if args["text"] == "v1" and not delivered:
+                return None  # first try at v1 fails
+            delivered.append(args["text"])
+            return {"ok": True}
+
+        dispatcher = MagicMock(call=MagicMock(side_effect=replay))
+        with patch("shop.services.outbox.get_dispatcher", return_value=dispatcher):
+            self.assertEqual(outbox.deliver_pending(), (1, 1))
+            self.assertEqual(delivered, ["other"])
+            v1, v2 = OutboxMessage.objects.filter(payload__args__ts="1.1").order_by("id")
+            self.assertEqual(v2.next_attempt_at, v1.next_attempt_at)
+
+            # A write queued after the failure waits too, even though it's due.
+            queue_deferred([update("1.1", "v3")])
+            self.assertEqual(outbox.deliver_pending(), (0, 0))
+            self.assertEqual(delivered, ["other"])
+
+            OutboxMessage.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+            self.assertEqual(outbox.deliver_pending(), (3, 0))
+        self.assertEqual(delivered, ["other", "v1", "v2", "v3"])
@@ -0,0 +1,180 @@
+"""Tests for Block Kit status buttons (shop.services.slack_interactions).
+
+Covers the buttons ``post_message`` attaches when SLACK_STATUS_BUTTONS is on,
+and the /slack/interactions/ endpoint: signature checks, signed button values,
+STATUS_FLOW-allowed transitions, and the single-update apply path.
+"""
+
+import hashlib
+import hmac
+import json
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlencode
+
+from django.core import signing
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from shop.models import CallbackRequest, Order, OutboxMessage, Product, SlackMessage
+from shop.services import notifications, slack_interactions
+
+BUTTON_SETTINGS = dict(
+    SLACK_BOT_TOKEN="xoxb-test",
+    SLACK_CHANNEL="C123",
+    SLACK_SIGNING_SECRET="shhh",
+    SLACK_ALLOWED_REACTORS=[],
+    SLACK_STATUS_BUTTONS=True,
+)
+
+
+def _slack_ok(ts="1700000000.000100", channel="C123"):
+    return MagicMock(status_code=200, raise_for_status=lambda: None,
+                     json=lambda: {"ok": True, "ts": ts, "channel": channel})
+
+
+@override_settings(**BUTTON_SETTINGS)
+class StatusButtonTests(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(
+            name="Wildflower Honey", description="d", price=Decimal("17.00"), size="Pint",
+        )
+        self.order = Order.objects.create(
+            first_name="Jane", last_name="Doe", email="jane@example.com", phone="(850) 555-1234",
+            address="1 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+            product=self.product, quantity=2,
+        )
+        self.url = reverse("slack_interactions")
+
+    def _signed_post(self, payload, secret="shhh"):
+        body = urlencode({"payload": json.dumps(payload)})
+        timestamp = str(int(time.time()))
+        digest = hmac.new(secret.encode(), f"v0:{timestamp}:{body}".encode(), hashlib.sha256).hexdigest()
+        return self.client.post(
+            self.url,
+            data=body,
+            content_type="application/x-www-form-urlencoded",
+            HTTP_X_SLACK_REQUEST_TIMESTAMP=timestamp,
+            HTTP_X_SLACK_SIGNATURE=f"v0={digest}",
+        )
+
+    def _click(self, button, user="U1", text="New order from Jane"):
+        return {
+            "type": "block_actions",
+            "user": {"id": user},
+            "channel": {"id": "C123"},
+            "message": {"ts": "1700000000.000100", "text": text},
+            "actions": [{"action_id": button["action_id"], "value": button["value"]}],
+        }
+
+    def _button(self, status, obj=None):
+        buttons = slack_interactions.status_buttons(obj or self.order)
+        return next(b for b in buttons if b["action_id"] == f"set_status:{status}")
+
+    # --- outbound buttons ------------------------------------------------------
+
+    def test_post_message_attaches_one_button_per_allowed_status(self):
+        with patch("shop.services.slack_client.requests.Session.post", return_value=_slack_ok()) as post:
+            notifications.post_message("New order from Jane", link_to=self.order)
+        blocks = post.call_args.kwargs["json"]["blocks"]
+        self.assertEqual(blocks[0]["text"]["text"], "New order from Jane")
+        action_ids = [b["action_id"] for b in blocks[1]["elements"]]
+        self.assertEqual(
+            action_ids,
+            ["set_status:pending", "set_status:processing", "set_status:completed", "set_status:cancelled"],
+        )
+        self.assertEqual(blocks[1]["elements"][0]["style"], "primary")  # current status
+
+    @override_settings(SLACK_STATUS_BUTTONS=False)
+    def test_no_buttons_when_disabled(self):
+        with patch("shop.services.slack_client.requests.Session.post", return_value=_slack_ok()) as post:
+            notifications.post_message("hi", link_to=self.order)
+        self.assertNotIn("blocks", post.call_args.kwargs["json"])
+
+    # --- clicks ----------------------------------------------------------------
+
+    def test_click_applies_status_with_a_single_update(self):
+        payload = self._click(self._button("completed"))
+        with self.assertNumQueries(2):  # the UPDATE + queuing the restamp
+            changed = slack_interactions.apply_interaction(payload)
+        self.assertEqual(changed, 1)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "completed")
+
+    def test_click_via_endpoint_queues_restamp_with_buttons(self):
+        with patch("shop.services.slack_client.requests.Session.post") as post, \
+             patch("shop.services.slack_client.requests.Session.get") as get:
+            resp = self._signed_post(self._click(self._button("processing")))
+        self.assertEqual(resp.status_code, 200)
+        post.assert_not_called()  # nothing outbound on the request path
+        get.assert_not_called()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "processing")
+
+        queued = OutboxMessage.objects.get(kind="slack_api")
+        args = queued.payload["args"]
+        self.assertEqual(queued.payload["method"], "chat.update")
+        self.assertEqual((args["channel"], args["ts"]), ("C123", "1700000000.000100"))
+        self.assertEqual(args["text"], "New order from Jane\n\n*Status:* :package: Processing (by <@U1>)")
+        self.assertEqual(args["blocks"][1]["elements"][1]["style"], "primary")
+
+    def test_restamp_replaces_previous_status_line(self):
+        text = "New order from Jane\n\n*Status:* :package: Processing"
+        slack_interactions.apply_interaction(self._click(self._button("completed"), text=text))
+        args = OutboxMessage.objects.get().payload["args"]
+        self.assertEqual(args["text"], "New order from Jane\n\n*Status:* :white_check_mark: Completed (by <@U1>)")
+
+    def test_click_on_current_status_is_a_noop(self):
+        self.assertEqual(slack_interactions.apply_interaction(self._click(self._button("pending"))), 0)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_bad_request_signature_rejected(self):
+        resp = self._signed_post(self._click(self._button("completed")), secret="wrong")
+        self.assertEqual(resp.status_code, 403)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "pending")
+
+    def test_tampered_button_value_is_ignored(self):
+        # Another button's payload under this button's signature.
+        button = self._button("completed")
+        payload = self._button("cancelled")["value"].split(":")[0]
+        forged = dict(button, action_id="set_status:cancelled", value=payload + button["value"][len(payload):])
+        self.assertEqual(slack_interactions.apply_interaction(self._click(forged)), 0)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "pending")
+
+    def test_status_outside_the_flow_is_refused(self):
+        # A validly signed value is still checked against STATUS_FLOW.
+        value = signing.dumps(["shop.order", self.order.pk, "refunded"], salt=slack_interactions.SIGNING_SALT)
+        button = {"action_id": "set_status:refunded", "value": value}
+        self.assertEqual(slack_interactions.apply_interaction(self._click(button)), 0)
+
+    def test_action_id_must_match_signed_status(self):
+        button = dict(self._button("completed"), action_id="set_status:cancelled")
+        self.assertEqual(slack_interactions.apply_interaction(self._click(button)), 0)
+
+    @override_settings(SLACK_ALLOWED_REACTORS=["U_ADMIN"])
+    def test_click_from_unlisted_user_is_ignored(self):
+        self.assertEqual(slack_interactions.apply_interaction(self._click(self._button("completed"))), 0)
+        self.assertEqual(
+            slack_interactions.apply_interaction(self._click(self._button("completed"), user="U_ADMIN")), 1,
+        )
+
+    def test_buttons_for_other_models_follow_their_flow(self):
+        callback = CallbackRequest.objects.create(name="Pat", phone="(850) 555-2222")
+        slack_interactions.apply_interaction(self._click(self._button("contacted", obj=callback)))
+        callback.refresh_from_db()
+        self.assertEqual(callback.status, "contacted")
+
+    def test_admin_sync_keeps_buttons_on_the_message(self):
+        SlackMessage.record(channel="C123", ts="1700000000.000100", obj=self.order, text="New order")
+        with patch("shop.services.slack_sync.update_message") as update, \
+             patch("shop.services.slack_sync.add_reaction"), \
+             patch("shop.services.slack_sync.remove_reaction"), \
+             patch("shop.services.slack_sync.post_thread_reply"), \
+             self.captureOnCommitCallbacks(execute=True):
+            self.order.status = "completed"
+            self.order.save()
+        blocks = update.call_args.kwargs["blocks"]
+        self.assertEqual(blocks[1]["type"], "actions")
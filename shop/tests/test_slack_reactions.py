@@ -4,10 +4,13 @@ Covers:
   * post_message — chat.postMessage on the bot path (records the ts mapping)
     and webhook fallback when no bot token is configured.
   * get_message_reactions — parsing the live reaction set.
+  * the local reaction projection — deltas from events, rebasing from
+    reactions.get when stale, and bulk reconciliation from the channel history.
   * resolve_status — the derive-from-set status rule (progression, most-advanced
     wins, ❌ terminal override, empty → pending).
   * the inbound /slack/events/ endpoint — signature verification, the URL
-    verification handshake, and reaction-driven status changes end to end.
+    verification handshake, and reaction-driven status changes end to end
+    (endpoint stores the event, the background worker applies it).
 
 All network calls are mocked; nothing leaves the test run.
 """
@@ -15,16 +18,33 @@ All network calls are mocked; nothing leaves the test run.
 import hashlib
 import hmac
 import json
+import threading
 import time
 from contextlib import contextmanager
+from datetime import timedelta
 from decimal import Decimal
+from io import StringIO
 from unittest.mock import MagicMock, patch
 
+from django.core.management import call_command
+from django.db import OperationalError, transaction
+from django.db.models.signals import post_init
 from django.test import TestCase, override_settings
 from django.urls import reverse
-
-from shop.models import CallbackRequest, NukeRequest, Order, PollinationRequest, Product, SlackMessage
+from django.utils import timezone
+
+from shop.models import (
+    CallbackRequest,
+    NukeRequest,
+    Order,
+    OutboxMessage,
+    PollinationRequest,
+    Product,
+    SlackEvent,
+    SlackMessage,
+)
 from shop.services import notifications, slack_events, slack_sync
+from shop.services.slack_dispatch import get_dispatcher
 
 BOT_SETTINGS = dict(
     SLACK_BOT_TOKEN="xoxb-test",
@@ -34,6 +54,11 @@ BOT_SETTINGS = dict(
 )
 
 
+def _live(names, user="U1"):
+    """A reactions.get-style {name: [users]} set."""
+    return {name: [user] for name in names}
+
+
 def _slack_ok(ts="1700000000.000100", channel="C123"):
     return MagicMock(raise_for_status=lambda: None,
                      json=lambda: {"ok": True, "ts": ts, "channel": channel})
@@ -55,7 +80,7 @@ class PostMessageTests(TestCase):
     @override_settings(**BOT_SETTINGS)
     def test_bot_path_posts_and_records_mapping(self):
         order = self._order()
-        with patch("shop.services.notifications.requests.post", return_value=_slack_ok()) as post:
+        with patch("shop.services.slack_client.requests.Session.post", return_value=_slack_ok()) as post:
             ts = notifications.post_message("hi", link_to=order)
 
         self.assertEqual(ts, "1700000000.000100")
@@ -67,11 +92,13 @@ class PostMessageTests(TestCase):
 
         link = SlackMessage.objects.get(ts="1700000000.000100")
         self.assertEqual(link.target, order)
+        self.assertEqual(link.reactions, {})
+        self.assertIsNotNone(link.reactions_synced_at)  # a new post's reaction set is known
 
     @override_settings(SLACK_BOT_TOKEN="", SLACK_CHANNEL="", SLACK_WEBHOOK_URL="https://hooks.slack.test/x")
     def test_falls_back_to_webhook_without_bot_token(self):
         order = self._order()
-        with patch("shop.services.notifications.requests.post",
+        with patch("shop.services.slack_client.requests.Session.post",
                    return_value=MagicMock(raise_for_status=lambda: None)) as post:
             result = notifications.post_message("hi", link_to=order)
 
@@ -83,7 +110,7 @@ class PostMessageTests(TestCase):
     def test_api_error_response_returns_none_and_records_nothing(self):
         order = self._order()
         bad = MagicMock(raise_for_status=lambda: None, json=lambda: {"ok": False, "error": "channel_not_found"})
-        with patch("shop.services.notifications.requests.post", return_value=bad):
+        with patch("shop.services.slack_client.requests.Session.post", return_value=bad):
             self.assertIsNone(notifications.post_message("hi", link_to=order))
         self.assertFalse(SlackMessage.objects.exists())
 
@@ -98,21 +125,51 @@ class GetMessageReactionsTests(TestCase):
                 {"name": "white_check_mark", "count": 2},
             ]},
         })
-        with patch("shop.services.notifications.requests.get", return_value=resp) as get:
+        with patch("shop.services.slack_client.requests.Session.get", return_value=resp) as get:
             names = notifications.get_message_reactions("C123", "1.1")
         self.assertEqual(names, ["package", "white_check_mark"])
         self.assertEqual(get.call_args.kwargs["params"], {"channel": "C123", "timestamp": "1.1"})
 
     def test_no_reactions_key_returns_empty(self):
         resp = MagicMock(raise_for_status=lambda: None, json=lambda: {"ok": True, "message": {}})
-        with patch("shop.services.notifications.requests.get", return_value=resp):
+        with patch("shop.services.slack_client.requests.Session.get", return_value=resp):
             self.assertEqual(notifications.get_message_reactions("C123", "1.1"), [])
 
     def test_api_error_returns_empty(self):
         resp = MagicMock(raise_for_status=lambda: None, json=lambda: {"ok": False, "error": "message_not_found"})
-        with patch("shop.services.notifications.requests.get", return_value=resp):
+        with patch("shop.services.slack_client.requests.Session.get", return_value=resp):
             self.assertEqual(notifications.get_message_reactions("C123", "1.1"), [])
 
+    def test_reaction_users_parses_full_set(self):
+        resp = MagicMock(raise_for_status=lambda: None, json=lambda: {
+            "ok": True,
+            "message": {"reactions": [{"name": "package", "count": 2, "users": ["U2", "U1"]}]},
+        })
+        with patch("shop.services.slack_client.requests.Session.get", return_value=resp) as get:
+            users = notifications.get_message_reaction_users("C123", "1.1")
+        self.assertEqual(users, {"package": ["U1", "U2"]})
+        self.assertEqual(get.call_args.kwargs["params"]["full"], "true")
+
+    def test_channel_history_pages_with_reactions_inline(self):
+        resp = MagicMock(raise_for_status=lambda: None, json=lambda: {
+            "ok": True,
+            "messages": [
+                {"ts": "2.2", "reactions": [{"name": "x", "users": ["U1"], "count": 1}]},
+                {"ts": "1.1"},
+            ],
+            "response_metadata": {"next_cursor": "abc"},
+        })
+        with patch("shop.services.slack_client.requests.Session.get", return_value=resp) as get:
+            page = notifications.get_channel_history("C123", "1.1", cursor="prev")
+        self.assertEqual(page, ({"2.2": {"x": ["U1"]}, "1.1": {}}, "abc"))
+        params = get.call_args.kwargs["params"]
+        self.assertEqual((params["oldest"], params["inclusive"], params["cursor"]), ("1.1", "true", "prev"))
+
+    def test_reaction_users_error_is_none_not_empty(self):
+        resp = MagicMock(raise_for_status=lambda: None, json=lambda: {"ok": False, "error": "message_not_found"})
+        with patch("shop.services.slack_client.requests.Session.get", return_value=resp):
+            self.assertIsNone(notifications.get_message_reaction_users("C123", "1.1"))
+
 
 class ResolveStatusTests(TestCase):
     """Unit tests for the resolution rule, independent of Slack plumbing."""
@@ -153,6 +210,7 @@ class ResolveStatusTests(TestCase):
 @override_settings(**BOT_SETTINGS)
 class SlackEventsEndpointTests(TestCase):
     def setUp(self):
+        slack_events.recent_events.reset()
         self.url = reverse("slack_events")
         self.product = Product.objects.create(
             name="Wildflower Honey", description="d", price=Decimal("17.00"), size="Pint",
@@ -163,7 +221,7 @@ class SlackEventsEndpointTests(TestCase):
             product=self.product, quantity=2,
         )
 
-    def _signed_post(self, payload, secret="shhh", timestamp=None):
+    def _signed_post(self, payload, secret="shhh", timestamp=None, **headers):
         body = json.dumps(payload)
         timestamp = timestamp or str(int(time.time()))
         basestring = f"v0:{timestamp}:{body}".encode()
@@ -174,8 +232,16 @@ class SlackEventsEndpointTests(TestCase):
             content_type="application/json",
             HTTP_X_SLACK_REQUEST_TIMESTAMP=timestamp,
             HTTP_X_SLACK_SIGNATURE=f"v0={digest}",
+            **headers,
         )
 
+    def _send_event(self, payload):
+        """Deliver an event and run the background worker over it, as the
+        endpoint only stores + acks."""
+        resp = self._signed_post(payload)
+        slack_events.process_pending_events(debounce=0)
+        return resp
+
     def _event(self, reaction, ts, kind="reaction_added", user="U1", channel="C123"):
         return {
             "type": "event_callback",
@@ -192,9 +258,11 @@ class SlackEventsEndpointTests(TestCase):
 
     @contextmanager
     def _reactions(self, names):
-        """Patch the live reaction set, the inbound confirmation reply, and the
-        outbound sync calls the post_save signal makes (chat.update / cue)."""
-        with patch("shop.services.slack_events.get_message_reactions", return_value=names) as fetch, \
+        """Patch the live reaction set (what a rebase of the projection reads),
+        the inbound confirmation reply, and the outbound sync calls the
+        post_save signal makes (chat.update / cue)."""
+        with patch("shop.services.slack_events.get_message_reaction_users",
+                   return_value=_live(names)) as fetch, \
              patch("shop.services.slack_events.post_thread_reply") as reply, \
              patch("shop.services.slack_sync.update_message"), \
              patch("shop.services.slack_sync.add_reaction"), \
@@ -227,7 +295,7 @@ class SlackEventsEndpointTests(TestCase):
     def test_added_reaction_advances_status_and_replies(self):
         self._map_order()
         with self._reactions(["package"]) as (_fetch, reply):
-            resp = self._signed_post(self._event("package", "1700000000.000100"))
+            resp = self._send_event(self._event("package", "1700000000.000100"))
         self.assertEqual(resp.status_code, 200)
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "processing")
@@ -236,14 +304,14 @@ class SlackEventsEndpointTests(TestCase):
     def test_most_advanced_of_multiple_emojis_wins(self):
         self._map_order()
         with self._reactions(["package", "white_check_mark"]):
-            self._signed_post(self._event("white_check_mark", "1700000000.000100"))
+            self._send_event(self._event("white_check_mark", "1700000000.000100"))
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "completed")
 
     def test_cancel_emoji_overrides_progress(self):
         self._map_order()
         with self._reactions(["package", "white_check_mark", "x"]):
-            self._signed_post(self._event("x", "1700000000.000100"))
+            self._send_event(self._event("x", "1700000000.000100"))
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "cancelled")
 
@@ -253,7 +321,7 @@ class SlackEventsEndpointTests(TestCase):
         self._map_order()
         # ✅ removed; 📦 remains → back to processing.
         with self._reactions(["package"]) as (_fetch, reply):
-            self._signed_post(self._event("white_check_mark", "1700000000.000100", kind="reaction_removed"))
+            self._send_event(self._event("white_check_mark", "1700000000.000100", kind="reaction_removed"))
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "processing")
         reply.assert_called_once()
@@ -263,7 +331,7 @@ class SlackEventsEndpointTests(TestCase):
         self.order.save()
         self._map_order()
         with self._reactions([]):
-            self._signed_post(self._event("package", "1700000000.000100", kind="reaction_removed"))
+            self._send_event(self._event("package", "1700000000.000100", kind="reaction_removed"))
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "pending")
 
@@ -272,7 +340,7 @@ class SlackEventsEndpointTests(TestCase):
         self.order.save()
         self._map_order()
         with self._reactions(["white_check_mark", "telephone_receiver"]) as (_fetch, reply):
-            self._signed_post(self._event("telephone_receiver", "1700000000.000100"))
+            self._send_event(self._event("telephone_receiver", "1700000000.000100"))
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "completed")
         reply.assert_not_called()  # no change → no confirmation
@@ -280,7 +348,7 @@ class SlackEventsEndpointTests(TestCase):
     def test_unknown_emoji_skips_api_call(self):
         self._map_order()
         with self._reactions(["package"]) as (fetch, reply):
-            resp = self._signed_post(self._event("eyes", "1700000000.000100"))
+            resp = self._send_event(self._event("eyes", "1700000000.000100"))
         self.assertEqual(resp.status_code, 200)
         fetch.assert_not_called()  # not in vocabulary → no round-trip
         reply.assert_not_called()
@@ -289,7 +357,7 @@ class SlackEventsEndpointTests(TestCase):
 
     def test_unknown_ts_is_a_safe_noop(self):
         with self._reactions(["package"]) as (fetch, reply):
-            resp = self._signed_post(self._event("package", "9999.0001"))
+            resp = self._send_event(self._event("package", "9999.0001"))
         self.assertEqual(resp.status_code, 200)
         fetch.assert_not_called()
         reply.assert_not_called()
@@ -300,7 +368,7 @@ class SlackEventsEndpointTests(TestCase):
     def test_reaction_from_unlisted_user_is_ignored(self):
         self._map_order()
         with self._reactions(["package"]):
-            self._signed_post(self._event("package", "1700000000.000100", user="U_STRANGER"))
+            self._send_event(self._event("package", "1700000000.000100", user="U_STRANGER"))
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "pending")
 
@@ -309,21 +377,294 @@ class SlackEventsEndpointTests(TestCase):
         # The bot's own cue reaction must not echo back through the resolver.
         self._map_order()
         with self._reactions(["package"]) as (fetch, _reply):
-            self._signed_post(self._event("package", "1700000000.000100", user="UBOT"))
+            self._send_event(self._event("package", "1700000000.000100", user="UBOT"))
         fetch.assert_not_called()
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "pending")
 
+    @override_settings(SLACK_BOT_USER_ID="UBOT")
+    def test_bot_reaction_still_updates_projection(self):
+        link = self._map_order()
+        with self._reactions([]):
+            self._send_event(self._event("package", "1700000000.000100", user="UBOT"))
+        link.refresh_from_db()
+        self.assertEqual(link.reactions, {"package": ["UBOT"]})
+
+    # --- local reaction projection ---------------------------------------------
+
+    def test_synced_projection_resolves_without_reactions_get(self):
+        link = self._map_order()
+        link.reactions = {"package": ["U2"]}
+        link.reactions_synced_at = timezone.now()
+        link.save()
+        with self._reactions([]) as (fetch, _reply):
+            self._send_event(self._event("white_check_mark", "1700000000.000100"))
+        fetch.assert_not_called()
+        link.refresh_from_db()
+        self.assertEqual(link.reactions, {"package": ["U2"], "white_check_mark": ["U1"]})
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "completed")
+
+    def test_removal_only_drops_that_users_reaction(self):
+        self.order.status = "completed"
+        self.order.save()
+        link = self._map_order()
+        link.reactions = {"white_check_mark": ["U1", "U2"]}
+        link.reactions_synced_at = timezone.now()
+        link.save()
+        with self._reactions([]):
+            self._send_event(self._event("white_check_mark", "1700000000.000100", kind="reaction_removed"))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "completed")  # U2's ✅ still stands
+
+    def test_stale_projection_is_rebased_from_slack(self):
+        link = self._map_order()  # never synced
+        with self._reactions(["package", "white_check_mark"]) as (fetch, _reply):
+            self._send_event(self._event("package", "1700000000.000100"))
+        fetch.assert_called_once_with("C123", "1700000000.000100")
+        link.refresh_from_db()
+        self.assertEqual(set(link.reactions), {"package", "white_check_mark"})
+        self.assertIsNotNone(link.reactions_synced_at)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "completed")
+
+    # --- bulk reconciliation ---------------------------------------------------
+
+    def _reconcile(self, *pages, **options):
+        out = StringIO()
+        with self._reactions([]) as (fetch, reply), \
+             patch("shop.services.slack_events.get_channel_history", side_effect=list(pages)) as history:
+            call_command("reconcile_slack_reactions", stdout=out, **options)
+        fetch.assert_not_called()  # no per-message reactions.get
+        return history, reply, out.getvalue()
+
+    def test_reconcile_heals_missed_events_from_channel_history(self):
+        orders = [self.order] + [
+            Order.objects.create(
+                first_name="Jo", last_name=str(i), email="j@example.com", phone="(850) 555-0000",
+                address="1 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+                product=self.product, quantity=1,
+            ) for i in range(3)
+        ]
+        links = [SlackMessage.record(channel="C123", ts=f"17000000{i}0.000100", obj=o) for i, o in enumerate(orders)]
+        history, reply, out = self._reconcile(
+            ({links[0].ts: {"package": ["U1"]}, links[1].ts: {}, "1.0": {"x": ["U1"]}}, "next"),
+            ({links[2].ts: {"white_check_mark": ["U1", "U2"]}, links[3].ts: {"x": ["U3"]}}, None),
+        )
+        self.assertEqual(history.call_count, 2)
+        self.assertEqual(history.call_args_list[0].args, ("C123", links[0].ts, None))
+        self.assertEqual(history.call_args_list[1].args[2], "next")
+        statuses = [o.status for o in Order.objects.filter(pk__in=[o.pk for o in orders]).order_by("pk")]
+        self.assertEqual(statuses, ["processing", "pending", "completed", "cancelled"])
+        self.assertEqual(reply.call_count, 3)
+        self.assertIn("Reconciled 4 message(s) in 2 API call(s); 3 status change(s)", out)
+        links[2].refresh_from_db()
+        self.assertEqual(links[2].reactions, {"white_check_mark": ["U1", "U2"]})
+
+    def test_reconcile_skips_closed_records_unless_asked(self):
+        self.order.status = "completed"
+        self.order.save()
+        link = self._map_order()
+        history, _reply, _out = self._reconcile()
+        history.assert_not_called()  # nothing open → no API calls at all
+
+        self._reconcile(({link.ts: {}}, None), include_closed=True)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "pending")  # ✅ was removed while we weren't listening
+
+    def test_reconcile_stops_cleanly_when_slack_is_unavailable(self):
+        link = self._map_order()
+        history, _reply, out = self._reconcile(None)
+        history.assert_called_once()
+        link.refresh_from_db()
+        self.assertIsNone(link.reactions_synced_at)
+        self.assertIn("Reconciled 0 message(s)", out)
+
     def test_idempotent_replay(self):
         self._map_order()
         with self._reactions(["white_check_mark"]):
             for _ in range(2):
-                self._signed_post(self._event("white_check_mark", "1700000000.000100"))
+                self._send_event(self._event("white_check_mark", "1700000000.000100"))
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "completed")
 
+    # --- ack now, process in the background ------------------------------------
+
+    def test_endpoint_acks_without_processing(self):
+        self._map_order()
+        with self._reactions(["package"]) as (fetch, reply):
+            resp = self._signed_post(self._event("package", "1700000000.000100"))
+        self.assertEqual(resp.status_code, 200)
+        fetch.assert_not_called()
+        reply.assert_not_called()
+        stored = SlackEvent.objects.get()
+        self.assertEqual((stored.status, stored.ts), ("pending", "1700000000.000100"))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "pending")
+
+    def test_worker_applies_events_in_order_per_message(self):
+        self._map_order()
+        self._signed_post(self._event("package", "1700000000.000100"))
+        self._signed_post(self._event("x", "1700000000.000100"))
+        with self._reactions([]) as (fetch, reply):
+            fetch.return_value = _live(["package"])
+            self.assertEqual(slack_events.process_pending_events(debounce=0), (2, 0))
+        fetch.assert_called_once()  # first event rebases; the second is a local delta
+        reply.assert_called_once()  # one burst → one resolution, straight to cancelled
+        self.assertIn("Cancelled", reply.call_args.args[2])
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "cancelled")
+        self.assertFalse(SlackEvent.objects.filter(status="pending").exists())
+
+    # --- burst coalescing --------------------------------------------------------
+
+    def _burst(self, *events):
+        for reaction, kind in events:
+            self._signed_post(self._event(reaction, "1700000000.000100", kind=kind))
+
+    def test_burst_is_held_until_the_message_goes_quiet(self):
+        link = self._map_order()
+        link.reactions_synced_at = timezone.now()
+        link.save()
+        self._burst(("x", "reaction_added"), ("x", "reaction_removed"), ("white_check_mark", "reaction_added"))
+        with self._reactions([]) as (_fetch, reply):
+            self.assertEqual(slack_events.process_pending_events(debounce=60), (0, 0))
+            self.assertEqual(SlackEvent.objects.filter(status="pending").count(), 3)
+
+            SlackEvent.objects.update(received_at=timezone.now() - timedelta(seconds=61))
+            with patch.object(Order, "save", autospec=True, side_effect=Order.save) as save:
+                self.assertEqual(slack_events.process_pending_events(debounce=60), (3, 0))
+        save.assert_called_once()
+        reply.assert_called_once()  # ❌ then un-❌ then ✅ → a single "Completed"
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "completed")
+
+    def test_busy_message_is_resolved_after_max_hold(self):
+        self._map_order()
+        self._burst(("package", "reaction_added"))
+        first = SlackEvent.objects.get()
+        first.received_at = timezone.now() - timedelta(seconds=10 * slack_events.MAX_HOLD_WINDOWS)
+        first.save()
+        self._burst(("white_check_mark", "reaction_added"))  # still arriving…
+        with self._reactions(["package", "white_check_mark"]):
+            self.assertEqual(slack_events.process_pending_events(debounce=10), (2, 0))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "completed")
+
+    def test_bursts_on_other_messages_are_not_held(self):
+        self._map_order()
+        callback = CallbackRequest.objects.create(name="Pat", phone="(850) 555-2222")
+        SlackMessage.record(channel="C123", ts="300.0001", obj=callback)
+        self._signed_post(self._event("package", "1700000000.000100"))
+        SlackEvent.objects.update(received_at=timezone.now() - timedelta(seconds=5))
+        self._signed_post(self._event("telephone_receiver", "300.0001"))  # just arrived
+        with self._reactions(["package"]):
+            self.assertEqual(slack_events.process_pending_events(debounce=2), (1, 0))
+        self.order.refresh_from_db()
+        callback.refresh_from_db()
+        self.assertEqual((self.order.status, callback.status), ("processing", "pending"))
+
+    def test_targets_are_fetched_once_per_content_type(self):
+        self._map_order()
+        callback = CallbackRequest.objects.create(name="Pat", phone="(850) 555-2222")
+        SlackMessage.record(channel="C123", ts="300.0001", obj=callback)
+        SlackMessage.record(channel="C123", ts="300.0002", obj=self.order)
+        SlackMessage.record(channel="C123", ts="300.0003", obj=Order.objects.create(
+            first_name="Sam", last_name="Roe", email="sam@example.com", phone="(850) 555-3333",
+            address="2 Honey Ln", city="Tallahassee", state="FL", zip_code="32301",
+            product=self.product, quantity=1,
+        ))
+        with self.assertNumQueries(3):  # links + orders + callbacks
+            targets = {link.ts: link.target for link in SlackMessage.objects.with_targets()}
+        self.assertEqual(targets["300.0001"], callback)
+        self.assertEqual(targets["1700000000.000100"], self.order)
+
+        with self.assertNumQueries(3):
+            loaded = slack_events._load_links(["300.0001", "300.0002", "300.0003", "404.0001"])
+        self.assertEqual(sorted(loaded), ["300.0001", "300.0002", "300.0003"])
+
+    def test_worker_loads_every_bursts_link_in_one_pass(self):
+        self._map_order()
+        callback = CallbackRequest.objects.create(name="Pat", phone="(850) 555-2222")
+        SlackMessage.record(channel="C123", ts="300.0001", obj=callback)
+        self._signed_post(self._event("package", "1700000000.000100"))
+        self._signed_post(self._event("telephone_receiver", "300.0001"))
+        with self._reactions(["package"]), \
+             patch("shop.services.slack_events._load_links", wraps=slack_events._load_links) as load:
+            self.assertEqual(slack_events.process_pending_events(debounce=0), (2, 0))
+        load.assert_called_once()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "processing")
+
+    def test_failed_event_blocks_later_events_for_same_message(self):
+        self._map_order()
+        self._signed_post(self._event("package", "1700000000.000100"))
+        self._signed_post(self._event("x", "1700000000.000100"))
+        with self._reactions(["x"]) as (fetch, _reply):
+            fetch.side_effect = Exception("db hiccup")
+            self.assertEqual(slack_events.process_pending_events(debounce=0), (0, 1))
+        first, second = SlackEvent.objects.order_by("id")
+        self.assertEqual((first.status, first.attempts), ("pending", 1))
+        self.assertEqual((second.status, second.attempts), ("pending", 0))  # waited its turn
+
+        with self._reactions(["x"]):
+            self.assertEqual(slack_events.process_pending_events(debounce=0), (2, 0))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "cancelled")
+
+    # --- redelivery dedup -------------------------------------------------------
+
+    def test_redelivered_event_id_is_dropped_before_any_work(self):
+        self._map_order()
+        payload = dict(self._event("package", "1700000000.000100"), event_id="Ev1")
+        self._signed_post(payload)
+        with self.assertNumQueries(0):
+            resp = self._signed_post(payload, HTTP_X_SLACK_RETRY_NUM="1")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(SlackEvent.objects.count(), 1)
+        self.assertEqual(slack_events.recent_events.snapshot(), {"lru_hits": 1, "db_hits": 0, "misses": 1})
+
+    def test_redelivery_caught_by_db_when_lru_is_cold(self):
+        # e.g. the retry lands on a different gunicorn worker.
+        payload = dict(self._event("package", "1700000000.000100"), event_id="Ev2")
+        self._signed_post(payload)
+        slack_events.recent_events.reset()
+        self._signed_post(payload, HTTP_X_SLACK_RETRY_NUM="2")
+        self.assertEqual(SlackEvent.objects.count(), 1)
+        self.assertEqual(slack_events.recent_events.snapshot()["db_hits"], 1)
+
+    def test_retry_num_is_recorded(self):
+        self._signed_post(dict(self._event("package", "1.1"), event_id="Ev3"), HTTP_X_SLACK_RETRY_NUM="1")
+        self.assertEqual(SlackEvent.objects.get().retry_num, 1)
+
+    def test_purge_drops_only_old_settled_events(self):
+        for event_id in ("old", "old-pending", "new"):
+            self._signed_post(dict(self._event("eyes", "1.1"), event_id=event_id))
+        SlackEvent.objects.exclude(event_id="old-pending").update(status="processed")
+        SlackEvent.objects.exclude(event_id="new").update(received_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(slack_events.purge_old_events(), 1)
+        self.assertEqual(
+            set(SlackEvent.objects.values_list("event_id", flat=True)), {"old-pending", "new"},
+        )
+
     # --- per-model vocabularies ------------------------------------------------
 
+    def test_loop_survives_a_failing_pass(self):
+        class Stop(Exception):
+            pass
+
+        out = StringIO()
+        passes = [OperationalError("database is locked"), (1, 0)]
+        with patch("shop.services.slack_events.purge_old_events", return_value=0), \
+             patch("shop.services.slack_events.process_pending_events", side_effect=passes) as process, \
+             patch("shop.management.commands.process_slack_events.time.sleep", side_effect=[None, Stop]), \
+             self.assertLogs("shop.management.commands.process_slack_events", "ERROR") as logs, \
+             self.assertRaises(Stop):
+            call_command("process_slack_events", "--loop", stdout=out)
+        self.assertEqual(process.call_count, 2)
+        self.assertIn("database is locked", logs.output[0])
+        self.assertIn("Processed 1", out.getvalue())
+
     def test_nuc_decline(self):
         nuc = NukeRequest.objects.create(
             first_name="Sam", last_name="Bee", email="s@b.com", phone="(850) 555-0000",
@@ -331,7 +672,7 @@ class SlackEventsEndpointTests(TestCase):
         )
         SlackMessage.record(channel="C123", ts="200.0001", obj=nuc)
         with self._reactions(["x"]):
-            self._signed_post(self._event("x", "200.0001"))
+            self._send_event(self._event("x", "200.0001"))
         nuc.refresh_from_db()
         self.assertEqual(nuc.status, "declined")
 
@@ -339,7 +680,7 @@ class SlackEventsEndpointTests(TestCase):
         callback = CallbackRequest.objects.create(name="Pat", phone="(850) 555-2222")
         SlackMessage.record(channel="C123", ts="300.0001", obj=callback)
         with self._reactions(["telephone_receiver"]):
-            self._signed_post(self._event("telephone_receiver", "300.0001"))
+            self._send_event(self._event("telephone_receiver", "300.0001"))
         callback.refresh_from_db()
         self.assertEqual(callback.status, "contacted")
 
@@ -411,6 +752,91 @@ class OutboundSyncTests(TestCase):
         self.link.refresh_from_db()
         self.assertEqual(self.link.bot_reaction, "")
 
+    def test_identical_render_skips_update_and_reply(self):
+        self.order.status = "processing"
+        with self._slack() as (upd, add, _rem, reply):
+            first = slack_sync.sync_status_to_slack(self.order, source=None)
+            second = slack_sync.sync_status_to_slack(self.order, source=None)
+        self.assertEqual(first, {"calls": 3, "skipped": 0})  # update, cue, reply
+        self.assertEqual(second, {"calls": 0, "skipped": 2})
+        upd.assert_called_once()
+        add.assert_called_once()
+        reply.assert_called_once()
+
+    def test_failed_update_is_retried_next_sync(self):
+        self.order.status = "processing"
+        with self._slack() as (upd, _add, _rem, _reply):
+            upd.return_value = False
+            slack_sync.sync_status_to_slack(self.order, source="slack")
+            upd.return_value = True
+            slack_sync.sync_status_to_slack(self.order, source="slack")
+        self.assertEqual(upd.call_count, 2)
+        self.link.refresh_from_db()
+        self.assertEqual(self.link.rendered_hash, slack_sync.render_hash(upd.call_args.args[2]))
+
+    def test_status_change_after_skip_is_stamped_again(self):
+        self.order.status = "processing"
+        with self._slack() as (upd, _add, _rem, reply):
+            slack_sync.sync_status_to_slack(self.order, source=None)
+            self.order.status = "completed"
+            result = slack_sync.sync_status_to_slack(self.order, source=None)
+        self.assertEqual(upd.call_count, 2)
+        self.assertEqual(reply.call_count, 2)
+        self.assertEqual(result, {"calls": 4, "skipped": 0})  # update, cue remove + add, reply
+
+    def test_linked_messages_are_synced_concurrently(self):
+        SlackMessage.record(channel="C123", ts="2.2", obj=self.order, text="reminder")
+        self.order.status = "processing"
+        both_in_flight = threading.Barrier(2, timeout=5)
+
+        def update(channel, ts, text, blocks=None):
+            both_in_flight.wait()  # would time out if the updates ran one after another
+            return True
+
+        with self._slack() as (upd, _add, _rem, _reply):
+            upd.side_effect = update
+            slack_sync.sync_status_to_slack(self.order, source=None)
+        self.assertEqual(upd.call_count, 2)
+        self.assertFalse(both_in_flight.broken)
+        self.assertEqual(SlackMessage.objects.exclude(rendered_hash="").count(), 2)
+
+    def test_cue_is_removed_before_it_is_added(self):
+        self.link.bot_reaction = "package"
+        self.link.save()
+        self.order.status = "completed"
+        calls = []
+        with self._slack() as (_upd, add, rem, _reply):
+            rem.side_effect = lambda *args: calls.append(("remove", args[2]))
+            add.side_effect = lambda *args: calls.append(("add", args[2]))
+            slack_sync.sync_status_to_slack(self.order, source=None)
+        self.assertEqual(calls, [("remove", "package"), ("add", "white_check_mark")])
+
+    def test_deferred_writes_from_sync_threads_are_queued_by_the_caller(self):
+        self.order.status = "processing"
+
+        threads = []
+
+        def rate_limited(channel, ts, name):
+            threads.append(threading.current_thread())
+            get_dispatcher()._give_up("reactions.add", {"name": name}, "POST", frozenset(), True)
+
+        with self._slack() as (_upd, add, _rem, _reply):
+            add.side_effect = rate_limited
+            slack_sync.sync_status_to_slack(self.order, source=None)
+        self.assertIsNot(threads[0], threading.current_thread())
+        queued = OutboxMessage.objects.get()
+        self.assertEqual(queued.payload["args"], {"name": "package"})
+
+    @override_settings(SLACK_SYNC_CONCURRENCY=1)
+    def test_concurrency_of_one_runs_inline(self):
+        self.order.status = "processing"
+        threads = set()
+        with self._slack() as (upd, _add, _rem, reply):
+            upd.side_effect = lambda *a, **k: threads.add(threading.current_thread())
+            reply.side_effect = lambda *a: threads.add(threading.current_thread())
+            slack_sync.sync_status_to_slack(self.order, source=None)
+        self.assertEqual(threads, {threading.current_thread()})
+
     def test_no_linked_message_is_a_noop(self):
         other = Order.objects.create(
             first_name="No", last_name="Link", email="n@l.com", phone="x",
@@ -447,8 +873,9 @@ class StatusChangeSignalTests(TestCase):
 
     def test_status_change_fires_sync(self):
         order = self._order()
-        order = Order.objects.get(pk=order.pk)  # fresh load → post_init snapshots
-        with patch("shop.services.slack_sync.sync_status_to_slack") as sync:
+        order = Order.objects.get(pk=order.pk)  # fresh load → from_db remembers status
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True):
             order.status = "processing"
             order.save()
         sync.assert_called_once()
@@ -457,7 +884,163 @@ class StatusChangeSignalTests(TestCase):
     def test_non_status_save_does_not_sync(self):
         order = self._order()
         order = Order.objects.get(pk=order.pk)
-        with patch("shop.services.slack_sync.sync_status_to_slack") as sync:
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True):
+            order.notes = "called customer"
+            order.save()
+        sync.assert_not_called()
+
+    def test_deferred_status_is_remembered_when_first_read(self):
+        order = self._order()
+        order = Order.objects.only("id", "notes").get(pk=order.pk)
+        self.assertIsNone(order.loaded_value("status"))
+        self.assertEqual(order.status, "pending")  # lazy load → remembered
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True):
+            order.notes = "called customer"
+            order.save()
+        sync.assert_not_called()
+
+    def test_deferred_status_assigned_unread_counts_as_changed(self):
+        order = self._order()
+        order = Order.objects.defer("status").get(pk=order.pk)
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True):
+            order.status = "processing"
+            order.save()
+        sync.assert_called_once()
+
+    def test_deferred_status_left_alone_is_unchanged(self):
+        order = self._order()
+        order = Order.objects.only("id", "notes").get(pk=order.pk)
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True), \
+             self.assertNumQueries(1):  # the UPDATE; status isn't loaded to compare
+            self.assertFalse(order.field_changed("status"))
             order.notes = "called customer"
+            order.save(update_fields=["notes"])
+        sync.assert_not_called()
+
+    def test_instances_built_in_code_are_not_tracked_until_saved(self):
+        self.assertFalse(post_init.has_listeners(Order))
+        order = Order(status="processing")
+        self.assertIsNone(order.loaded_value("status"))
+        self.assertTrue(order.field_changed("status"))
+        order._state.adding = False  # e.g. unpickled, or built with a known pk
+        self.assertFalse(order.field_changed("status"))
+
+    # --- buffered until commit ---------------------------------------------------
+
+    def test_sync_waits_for_commit(self):
+        order = self._order()
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks() as callbacks:
+            order.status = "processing"
             order.save()
+            sync.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+
+    def test_rolled_back_save_never_syncs(self):
+        order = self._order()
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    order.status = "cancelled"
+                    order.save()
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        sync.assert_not_called()
+
+    def test_several_saves_sync_once_with_final_status(self):
+        order = self._order()
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for status in ("processing", "completed"):
+                    order.status = status
+                    order.save()
+        sync.assert_called_once()
+        self.assertEqual(sync.call_args.args[0].status, "completed")
+
+    def test_change_and_change_back_is_not_synced(self):
+        order = self._order()
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for status in ("processing", "pending"):
+                    order.status = status
+                    order.save()
         sync.assert_not_called()
+
+    def test_savepoint_rollback_syncs_the_committed_status(self):
+        order = self._order()
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                order.status = "processing"
+                order.save()
+                try:
+                    with transaction.atomic():
+                        order.status = "cancelled"
+                        order.save()
+                        raise RuntimeError("boom")
+                except RuntimeError:
+                    pass
+        sync.assert_called_once()
+        self.assertEqual(sync.call_args.args[0].status, "processing")
+
+    def test_save_after_a_rolled_back_savepoint_still_syncs(self):
+        order = self._order()
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync, \
+             self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        order.status = "cancelled"
+                        order.save()
+                        raise RuntimeError("boom")
+                except RuntimeError:
+                    pass
+                order.status = "processing"
+                order.save()
+        sync.assert_called_once()
+        self.assertEqual(sync.call_args.args[0].status, "processing")
+
+    def test_rolled_back_save_is_not_synced_by_a_later_commit(self):
+        rolled_back, other = self._order(), self._order()
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        rolled_back.status = "cancelled"
+                        rolled_back.save()
+                        raise RuntimeError("boom")
+                except RuntimeError:
+                    pass
+            with self.captureOnCommitCallbacks(execute=True):
+                other.status = "processing"
+                other.save()
+        sync.assert_called_once()
+        self.assertEqual(sync.call_args.args[0].pk, other.pk)
+
+    def test_rolled_back_buffer_is_not_reused(self):
+        order = self._order()
+        with patch("shop.services.slack_sync.sync_status_to_slack") as sync:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        order.status = "processing"
+                        order.save()
+                        raise RuntimeError("boom")
+                except RuntimeError:
+                    pass
+            Order.objects.filter(pk=order.pk).update(status="completed")  # elsewhere
+            order = Order.objects.get(pk=order.pk)
+            with self.captureOnCommitCallbacks(execute=True):
+                order.status = "pending"
+                order.save()
+        sync.assert_called_once()
+        self.assertEqual(sync.call_args.args[0].status, "pending")
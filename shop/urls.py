@@ -28,6 +28,10 @@ urlpatterns = [
 
     # Slack inbound events (reaction-driven status updates)
     path('slack/events/', views.slack_events_endpoint, name='slack_events'),
+    path('slack/interactions/', views.slack_interactions_endpoint, name='slack_interactions'),
+
+    # Uptime / integration health (circuit breakers, outbox backlog)
+    path('health/', views.health, name='health'),
 
     # Legal pages
     path('privacy/', views.privacy_policy, name='privacy_policy'),
@@ -3,6 +3,7 @@ import logging
 
 from django.conf import settings
 from django.contrib import messages
+from django.db import transaction
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -21,9 +22,11 @@ from .forms import (
 from .models import (
     CallbackRequest,
     Order,
+    OutboxMessage,
     Product,
 )
-from .services import slack_events
+from .services import circuit, slack_events, slack_interactions
+from .services.db import retry_on_locked
 from .services.notifications import (
     notify_new_bee_removal,
     notify_new_callback_request,
@@ -31,6 +34,7 @@ from .services.notifications import (
     notify_new_order,
     notify_new_pollination_request,
 )
+from .services.slack_dispatch import get_dispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -39,8 +43,10 @@ logger = logging.getLogger(__name__)
 @require_POST
 def slack_events_endpoint(request):
     """Inbound Slack Events API endpoint. Verifies the request signature, then
-    handles the URL-verification handshake and ``reaction_added`` events that
-    drive order/request status changes."""
+    handles the URL-verification handshake and stores event callbacks (the
+    ``reaction_added``/``reaction_removed`` events that drive order/request
+    status changes) for the background worker. Acks right away: Slack retries
+    anything not answered within 3 seconds."""
     if not slack_events.verify_signature(request):
         return HttpResponse(status=403)
 
@@ -53,11 +59,61 @@ def slack_events_endpoint(request):
         return JsonResponse({'challenge': payload.get('challenge', '')})
 
     if payload.get('type') == 'event_callback':
-        slack_events.handle_event(payload)
+        try:
+            retry_num = int(request.headers.get('X-Slack-Retry-Num', 0))
+        except ValueError:
+            retry_num = 0
+        slack_events.accept_event(payload, retry_num=retry_num)
 
     return HttpResponse(status=200)
 
 
+@csrf_exempt
+@require_POST
+def slack_interactions_endpoint(request):
+    """Inbound Slack interactivity endpoint: status button clicks on
+    notifications (see ``slack_interactions``). Verifies the request signature
+    and applies the click with a single update, so it answers well within
+    Slack's 3 seconds."""
+    if not slack_events.verify_signature(request):
+        return HttpResponse(status=403)
+
+    try:
+        payload = json.loads(request.POST.get('payload', ''))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return HttpResponse(status=400)
+
+    slack_interactions.apply_interaction(payload)
+    return HttpResponse(status=200)
+
+
+def health(request):
+    """Liveness + integration health for uptime checks. Always 200 while the
+    site itself is serving; ``status`` is "degraded" when a circuit breaker is
+    open (Slack/SMTP down), a background process stopped reporting, or
+    notifications are piling up. ``circuit_breakers`` holds the answering web
+    worker's breakers under ``web`` and each background process's published
+    ones (the relay's, mostly) under its name; dispatch counters are for the
+    answering worker only."""
+    breakers = {'web': {name: b.snapshot() for name, b in circuit.all_breakers().items()}}
+    breakers.update(circuit.published())
+    outbox = {
+        'pending': OutboxMessage.objects.filter(status='pending').count(),
+        'failed': OutboxMessage.objects.filter(status='failed').count(),
+    }
+    degraded = outbox['failed'] or any(
+        b['state'] != circuit.CLOSED or b.get('stale')
+        for process in breakers.values() for b in process.values()
+    )
+    return JsonResponse({
+        'status': 'degraded' if degraded else 'ok',
+        'circuit_breakers': breakers,
+        'slack_dispatch': get_dispatcher().stats.snapshot(),
+        'slack_event_dedup': slack_events.recent_events.snapshot(),
+        'outbox': outbox,
+    })
+
+
 def home(request):
     """Home page view.
 
@@ -100,6 +156,16 @@ def product_detail(request, pk):
     })
 
 
+@retry_on_locked
+def _save_and_notify(form, notify):
+    """Save a public form and queue its business notification in the same
+    transaction (the relay delivers it out of band)."""
+    with transaction.atomic():
+        obj = form.save()
+        notify(obj)
+    return obj
+
+
 def _lookup_product(product_id):
     """Return the in-stock Product for an id from the querystring/POST, or None."""
     if not product_id:
@@ -120,10 +186,10 @@ def order_honey(request):
     if request.method == 'POST':
         form = OrderForm(request.POST)
         if form.is_valid():
-            # Single step: the submitted form is the order. Save it, notify the
-            # business (Slack -> manual QuickBooks invoice), and confirm.
-            order = form.save()
-            notify_new_order(order)
+            # Single step: the submitted form is the order. Save it, queue the
+            # business notification (Slack -> manual QuickBooks invoice) in the
+            # same transaction, and confirm. The relay delivers it out of band.
+            order = _save_and_notify(form, notify_new_order)
             request.session['completed_order_id'] = order.id
             return redirect('order_success')
         selected_product = _lookup_product(request.POST.get('product'))
@@ -170,8 +236,7 @@ def nuke_request(request):
     if request.method == 'POST':
         form = NukeRequestForm(request.POST)
         if form.is_valid():
-            nuke_req = form.save()
-            notify_new_nuc_request(nuke_req)
+            nuke_req = _save_and_notify(form, notify_new_nuc_request)
             messages.success(
                 request,
                 f'Thank you for your interest! We will contact you at {nuke_req.email} to discuss your nuc purchase.'
@@ -199,8 +264,7 @@ def pollination_services(request):
     if request.method == 'POST':
         form = PollinationRequestForm(request.POST)
         if form.is_valid():
-            pollination_req = form.save()
-            notify_new_pollination_request(pollination_req)
+            pollination_req = _save_and_notify(form, notify_new_pollination_request)
             messages.success(
                 request,
                 f'Thank you for your pollination inquiry! We will contact you at {pollination_req.email} to discuss your needs.'
@@ -228,8 +292,7 @@ def bee_removal(request):
     if request.method == 'POST':
         form = BeeRemovalRequestForm(request.POST)
         if form.is_valid():
-            removal_req = form.save()
-            notify_new_bee_removal(removal_req)
+            removal_req = _save_and_notify(form, notify_new_bee_removal)
             messages.success(
                 request,
                 f'Thank you for contacting us! We will reach out to {removal_req.email} as soon as possible.'
@@ -267,8 +330,7 @@ def callback_request(request):
     if request.method == 'POST':
         form = CallbackRequestForm(request.POST)
         if form.is_valid():
-            callback = form.save()
-            notify_new_callback_request(callback)
+            callback = _save_and_notify(form, notify_new_callback_request)
             messages.success(
                 request,
                 f'Thanks {callback.name}! We\'ll call you at {callback.phone} soon.'
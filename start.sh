@@ -10,5 +10,14 @@ mkdir -p /opt/render/project/src/data
 # Run database migrations
 python manage.py migrate
 
+# Deliver queued Slack/email notifications in the background (form submits only
+# write to the outbox; see shop/services/outbox.py). The loop also moves
+# completed orders 30+ days old out of the admin's default list, at start and
+# daily after that.
+python manage.py relay_notifications --loop &
+
+# Apply inbound Slack reaction events (the endpoint only stores + acks them)
+python manage.py process_slack_events --loop &
+
 # Start the web server
 exec gunicorn bearcreek.wsgi:application